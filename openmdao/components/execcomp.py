@@ -1,16 +1,16 @@
 """ Class definition for ExecComp, a component that evaluates an expression."""
 
+import ast
 import math
 import cmath
 
 import numpy
-from numpy import ndarray, complex, imag
+from numpy import ndarray
 
 from six import string_types
 
 from openmdao.core.component import Component
 from openmdao.util.strutil import parse_for_vars
-from openmdao.util.arrayutil import array_idx_iter
 
 
 class ExecComp(Component):
@@ -20,7 +20,11 @@ class ExecComp(Component):
     appearing on the left-hand side of the assignments are outputs,
     and the rest are inputs.  Each variable is assumed to be of
     type float unless the initial value for that variable is supplied
-    in \*\*kwargs.  Derivatives are calculated using complex step.
+    in \*\*kwargs.  The statements are compiled into a single function
+    that is called with the values of the variables.  Derivatives of
+    scalar outputs are calculated from symbolically differentiated
+    expressions when possible, and the rest are calculated using complex
+    step.
 
     Args
     ----
@@ -42,8 +46,6 @@ class ExecComp(Component):
         if isinstance(exprs, string_types):
             exprs = [exprs]
 
-        self._codes = [compile(expr, expr, 'exec') for expr in exprs]
-
         outs = set()
         allvars = set()
 
@@ -53,15 +55,103 @@ class ExecComp(Component):
             outs.update(parse_for_vars(lhs))
             allvars.update(parse_for_vars(expr, kwargs.keys()))
 
+        shapes = {}
         for var in sorted(allvars):
             # if user supplied an initial value, use it, otherwise set to 0.0
             val = kwargs.get(var, 0.0)
+            shapes[var] = numpy.shape(val)
 
             if var in outs:
                 self.add_output(var, val)
             else:
                 self.add_param(var, val)
 
+        # names of all function args, with a flag indicating outputs
+        self._args = [(var, var in outs) for var in sorted(allvars)]
+        self._param_names = [var for var in sorted(allvars) if var not in outs]
+        self._out_names = sorted(outs)
+        self._sizes = dict((var, int(numpy.prod(shape))) for var, shape in shapes.items())
+
+        self._func = _compile_func('_exec_comp_func', self._args,
+                                   exprs, self._out_names)
+
+        self._setup_derivs(exprs, shapes)
+
+    def _setup_derivs(self, exprs, shapes):
+        """
+        Differentiates as many of our outputs as possible symbolically and
+        compiles the derivatives into a single function.  The outputs that
+        can't be differentiated are handled by complex step.
+
+        Args
+        ----
+        exprs : list of str
+            Our assignment statements.
+
+        shapes : dict
+            Shape of each variable, keyed by name.
+        """
+        trees = [ast.parse(expr.strip(), mode='exec').body[0] for expr in exprs]
+
+        # Count how many times each output gets assigned.
+        assigned = dict((out, 0) for out in self._out_names)
+        for tree in trees:
+            for target in tree.targets:
+                for out in parse_for_vars(_unparse_target(target)):
+                    assigned[out] += 1
+
+        # Names used by the derivative expressions must not be hidden
+        # by variables.
+        symbolic_ok = not _DERIV_NAMES.intersection(shapes)
+
+        entries = []  # tuples of (out, param, column, derivative source)
+        rhs = {}
+        for tree in trees:
+            target = tree.targets[0]
+            if not (symbolic_ok and len(tree.targets) == 1 and
+                    isinstance(target, ast.Name) and
+                    assigned[target.id] == 1 and self._sizes[target.id] == 1):
+                continue
+
+            out = target.id
+            diff = _ExprDifferentiator(shapes, self._out_names, rhs)
+            try:
+                out_entries = []
+                for param in self._param_names:
+                    for j in range(self._sizes[param]):
+                        deriv = diff.deriv(tree.value, (param, j))
+                        if deriv is not None:
+                            out_entries.append((out, param, j, deriv))
+            except _NotDifferentiable:
+                continue
+
+            entries.extend(out_entries)
+            rhs[out] = tree.value
+
+        self._symbolic_outs = set(rhs)
+        self._cs_outs = [out for out in self._out_names if out not in rhs]
+        self._jac_entries = [(out, param, j) for out, param, j, _ in entries]
+
+        if entries:
+            self._jac_func = _compile_func('_exec_comp_jac', self._args, (),
+                                           [deriv for _, _, _, deriv in entries])
+        else:
+            self._jac_func = None
+
+        # If every statement is elementwise and all of the array variables
+        # have the same shape, each array output depends only on the same
+        # entry of each array param, so an array param can be complex
+        # stepped all at once.
+        array_shapes = set(shape for shape in shapes.values()
+                           if int(numpy.prod(shape)) > 1)
+        self._elementwise = len(array_shapes) < 2 and \
+            all(_is_elementwise(tree) for tree in trees)
+
+    def _get_args(self, params, unknowns):
+        """ Returns the list of args for our compiled functions."""
+        return [unknowns[name] if isout else params[name]
+                for name, isout in self._args]
+
     def solve_nonlinear(self, params, unknowns, resids):
         """
         Executes this component's assignment statemens.
@@ -77,12 +167,14 @@ class ExecComp(Component):
         resids : `VecWrapper`, optional
             `VecWrapper` containing residuals. (r)
         """
-        for expr in self._codes:
-            exec(expr, _expr_dict, _UPDict(unknowns, params))
+        results = self._func(*self._get_args(params, unknowns))
+        for name, val in zip(self._out_names, results):
+            unknowns[name] = val
 
     def jacobian(self, params, unknowns, resids):
         """
-        Uses complex step method to calculate a Jacobian dict.
+        Calculates a Jacobian dict, using the symbolic derivatives where
+        available and complex step for everything else.
 
         Args
         ----
@@ -101,131 +193,429 @@ class ExecComp(Component):
             Dictionary whose keys are tuples of the form ('unknown', 'param')
             and whose values are ndarrays.
         """
-
-        # our complex step
-        step = self.complex_stepsize * 1j
+        sizes = self._sizes
+        args = self._get_args(params, unknowns)
 
         J = {}
+        for u in self._out_names:
+            for param in self._param_names:
+                J[(u, param)] = numpy.zeros((sizes[u], sizes[param]))
+
+        if self._jac_func is not None:
+            vals = self._jac_func(*args)
+            for (u, param, j), val in zip(self._jac_entries, vals):
+                J[(u, param)][0, j] = val
 
-        for param in params:
+        if self._cs_outs:
+            self._complex_step(args, J)
 
-            pwrap = TmpDict(params)
+        return J
+
+    def _complex_step(self, args, J):
+        """
+        Fills in the entries of the Jacobian for the outputs that have no
+        symbolic derivatives using complex step.
 
-            pval = params[param]
-            if isinstance(pval, ndarray):
-                # replace the param array with a complex copy
-                pwrap[param] = numpy.asarray(params[param], complex)
-                idx_iter = array_idx_iter(pwrap[param].shape)
-                psize = pval.size
+        Args
+        ----
+        args : list
+            Args for our compiled functions.
+
+        J : dict
+            Jacobian dict to be filled in.
+        """
+        stepsize = self.complex_stepsize
+        step = stepsize * 1j
+        sizes = self._sizes
+
+        # Complex copies of all of the args, so that nothing we were
+        # given gets modified.
+        cargs = [numpy.array(arg, dtype=complex) if isinstance(arg, ndarray)
+                 else complex(arg) for arg in args]
+        outidxs = [i for i, name in enumerate(self._out_names)
+                   if name in self._cs_outs]
+
+        for i, (param, isout) in enumerate(self._args):
+            if isout:
+                continue
+
+            psize = sizes[param]
+
+            # Stepping all entries at once only works if every output is
+            # the same size as the param, not broadcast from it.
+            if psize == 1:
+                steps = [None]
+            elif self._elementwise and \
+                    all(sizes[self._out_names[k]] == psize for k in outidxs):
+                steps = [Ellipsis]
             else:
-                pwrap[param] = complex(params[param])
-                idx_iter = (None,)
-                psize = 1
+                steps = range(psize)
 
-            for i, idx in enumerate(idx_iter):
+            for idx in steps:
                 # set a complex param value
                 if idx is None:
-                    pwrap[param] += step
+                    cargs[i] += step
+                elif idx is Ellipsis:
+                    cargs[i] += step
                 else:
-                    pwrap[param][idx] += step
+                    cargs[i].flat[idx] += step
 
-                uwrap = TmpDict(unknowns, complex=True)
+                results = self._func(*cargs)
 
-                # solve with complex param value
-                self.solve_nonlinear(pwrap, uwrap, resids)
+                for k in outidxs:
+                    u = self._out_names[k]
+                    jval = numpy.imag(numpy.asarray(results[k]) / stepsize).flatten()
 
-                for u in unknowns:
-                    jval = imag(uwrap[u] / self.complex_stepsize)
-                    if (u, param) not in J: # create the dict entry
-                        J[(u, param)] = numpy.zeros((jval.size, psize))
-
-                    # set the column in the Jacobian entry
-                    J[(u, param)][:, i] = jval.flat
+                    if idx is Ellipsis:
+                        J[(u, param)][:, :] = numpy.diag(jval)
+                    else:
+                        # set the column in the Jacobian entry
+                        J[(u, param)][:, idx or 0] = jval
 
                 # restore old param value
                 if idx is None:
-                    pwrap[param] -= step
+                    cargs[i] -= step
+                elif idx is Ellipsis:
+                    cargs[i] -= step
                 else:
-                    pwrap[param][idx] -= step
+                    cargs[i].flat[idx] -= step
 
-        return J
+
+class _NotDifferentiable(Exception):
+    """ Raised when an expression can't be differentiated symbolically."""
+    pass
 
 
-class TmpDict(object):
+# Derivatives of single argument functions, given the source of the argument.
+_DERIV_FUNCS = {
+    'sin': 'cos(%s)',
+    'cos': '-sin(%s)',
+    'tan': '1.0/cos(%s)**2',
+    'exp': 'exp(%s)',
+    'expm1': 'exp(%s)',
+    'log': '1.0/%s',
+    'log10': '1.0/(%s*log(10.0))',
+    'log1p': '1.0/(1.0 + %s)',
+    'sqrt': '0.5/sqrt(%s)',
+    'sinh': 'cosh(%s)',
+    'cosh': 'sinh(%s)',
+    'tanh': '1.0/cosh(%s)**2',
+    'asin': '1.0/sqrt(1.0 - %s**2)',
+    'arcsin': '1.0/sqrt(1.0 - %s**2)',
+    'acos': '-1.0/sqrt(1.0 - %s**2)',
+    'arccos': '-1.0/sqrt(1.0 - %s**2)',
+    'atan': '1.0/(1.0 + %s**2)',
+    'arctan': '1.0/(1.0 + %s**2)',
+}
+
+# Functions used in the derivative expressions.
+_DERIV_NAMES = set(['cos', 'sin', 'exp', 'log', 'sqrt', 'cosh', 'sinh', '_xlogy'])
+
+# Functions that operate on arrays elementwise.
+_ELEMENTWISE_FUNCS = set(_DERIV_FUNCS).union(['pow', 'power', 'atan2', 'arctan2',
+                                              'hypot', 'fabs', 'copysign'])
+
+_ELEMENTWISE_NODES = (ast.Assign, ast.Expr, ast.Name, ast.BinOp, ast.UnaryOp,
+                      ast.Call, ast.expr_context, ast.operator, ast.unaryop,
+                      ast.Num)
+if hasattr(ast, 'Constant'):
+    _ELEMENTWISE_NODES += (ast.Constant,)
+
+
+def _is_elementwise(tree):
     """
-    A wrapper for a dictionary that will allow getting of values
-    from its inner dict unless those values get modified via
-    __setitem__.  After values have been modified they are managed
-    thereafter by the wrapper.  This protects the inner dict from
-    modification.
+    Returns True if the given statement only contains operations that
+    work elementwise on arrays.
+    """
+    for node in ast.walk(tree):
+        if not isinstance(node, _ELEMENTWISE_NODES):
+            return False
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or \
+               node.func.id not in _ELEMENTWISE_FUNCS or node.keywords:
+                return False
+        if isinstance(node, ast.Assign):
+            if not all(isinstance(t, ast.Name) for t in node.targets):
+                return False
+    return True
+
+
+def _number(node):
+    """ Returns the value of a numeric constant node, or None."""
+    if isinstance(node, ast.Num):
+        return node.n
+    if hasattr(ast, 'Constant') and isinstance(node, ast.Constant) and \
+       isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return node.value
+    return None
+
+
+def _unparse_target(node):
+    """ Returns source for the name (and index) on the lhs of an assignment."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name):
+        return node.value.id
+    return ''
+
+
+class _ExprDifferentiator(object):
+    """
+    Symbolically differentiates a python expression with respect to a single
+    entry of a variable, producing python source.  Only a subset of python is
+    supported:  numbers, names of scalar variables, constant indexing of
+    array variables, arithmetic operators and some single argument functions.
+    Anything else raises `_NotDifferentiable`.
 
     Args
     ----
-    inner : dict-like
-        The dictionary to be wrapped.
+    shapes : dict
+        Shape of each variable, keyed by name.
+
+    outs : iter of str
+        Names of the output variables.
 
-    complex : bool, optional
-        If True, return a complex version of values from __getitem__
+    rhs : dict
+        Expression nodes for outputs that have been computed from earlier
+        statements, keyed by name.  These are substituted when referenced.
+        Any other output can't be referenced.
     """
-    def __init__(self, inner, complex=False):
-        self._inner = inner
-        self._changed = {}
-        self._complex = complex
-
-    def __getitem__(self, name):
-        if name in self._changed:
-            return self._changed[name]
-        elif self._complex:
-            val = self._inner[name]
-            if isinstance(val, ndarray):
-                self._changed[name] = numpy.asarray(val, dtype=complex)
-            else:
-                self._changed[name] = complex(val)
-            return self._changed[name]
-        else:
-            return self._inner[name]
 
-    def __setitem__(self, name, value):
-        self._changed[name] = value
+    def __init__(self, shapes, outs, rhs):
+        self._shapes = shapes
+        self._outs = set(outs)
+        self._rhs = rhs
+
+    def _index(self, node):
+        """ Returns the name and flat index of a constant Subscript node."""
+        if not isinstance(node.value, ast.Name) or \
+           node.value.id not in self._shapes or node.value.id in self._outs:
+            raise _NotDifferentiable()
+
+        name = node.value.id
+        shape = self._shapes[name]
+
+        idx = node.slice
+        if hasattr(ast, 'Index') and isinstance(idx, ast.Index):
+            idx = idx.value
+        try:
+            idx = ast.literal_eval(idx)
+        except ValueError:
+            raise _NotDifferentiable()
+
+        if not isinstance(idx, tuple):
+            idx = (idx,)
+        if len(idx) != len(shape) or \
+           not all(isinstance(i, int) and not isinstance(i, bool) for i in idx):
+            raise _NotDifferentiable()
 
-    def __contains__(self, name):
-        return name in self._inner or name in self._changed
+        idx = tuple(i % n for i, n in zip(idx, shape))
+        return name, idx, int(numpy.ravel_multi_index(idx, shape))
+
+    def source(self, node):
+        """
+        Returns python source for the given expression node.
+
+        Args
+        ----
+        node : ast node
+            Expression node.
+
+        Returns
+        -------
+        str
+        """
+        num = _number(node)
+        if num is not None:
+            return '(%r)' % num
+
+        if isinstance(node, ast.Name):
+            if node.id in self._rhs:
+                return self.source(self._rhs[node.id])
+            if node.id in self._outs:
+                raise _NotDifferentiable()
+            if node.id in self._shapes and int(numpy.prod(self._shapes[node.id])) > 1:
+                # arrays are only supported when indexed down to a scalar
+                raise _NotDifferentiable()
+            return node.id
+
+        if isinstance(node, ast.Subscript):
+            name, idx, _ = self._index(node)
+            return '%s[%s]' % (name, ', '.join(str(i) for i in idx))
+
+        if isinstance(node, ast.BinOp):
+            op = _BINOPS.get(type(node.op))
+            if op is None:
+                raise _NotDifferentiable()
+            return '(%s %s %s)' % (self.source(node.left), op,
+                                   self.source(node.right))
+
+        if isinstance(node, ast.UnaryOp):
+            if isinstance(node.op, ast.USub):
+                return '(-%s)' % self.source(node.operand)
+            if isinstance(node.op, ast.UAdd):
+                return self.source(node.operand)
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and \
+           node.func.id in _DERIV_FUNCS and len(node.args) == 1 and \
+           not node.keywords:
+            return '%s(%s)' % (node.func.id, self.source(node.args[0]))
+
+        raise _NotDifferentiable()
+
+    def deriv(self, node, wrt):
+        """
+        Returns python source for the derivative of the given expression
+        node, or None if the derivative is zero.
 
-    def __getattr__(self, name):
-        return getattr(self._inner, name)
+        Args
+        ----
+        node : ast node
+            Expression node.
 
+        wrt : tuple of (str, int)
+            Name and flat index of the variable entry that we're
+            differentiating with respect to.
 
-class _UPDict(object):
+        Returns
+        -------
+        str or None
+        """
+        if _number(node) is not None:
+            return None
+
+        if isinstance(node, ast.Name):
+            if node.id in self._rhs:
+                return self.deriv(self._rhs[node.id], wrt)
+            self.source(node)  # make sure it's a scalar
+            if node.id == wrt[0]:
+                return '1.0'
+            return None
+
+        if isinstance(node, ast.Subscript):
+            name, _, flat = self._index(node)
+            if (name, flat) == wrt:
+                return '1.0'
+            return None
+
+        if isinstance(node, ast.UnaryOp):
+            du = self.deriv(node.operand, wrt)
+            self.source(node)
+            if isinstance(node.op, ast.USub) and du is not None:
+                return '(-%s)' % du
+            return du
+
+        if isinstance(node, ast.BinOp):
+            u = self.source(node.left)
+            v = self.source(node.right)
+            du = self.deriv(node.left, wrt)
+            dv = self.deriv(node.right, wrt)
+
+            if isinstance(node.op, ast.Add):
+                return _add(du, dv)
+
+            if isinstance(node.op, ast.Sub):
+                if dv is None:
+                    return du
+                return '(%s - %s)' % (du or '0.0', dv)
+
+            if isinstance(node.op, ast.Mult):
+                return _add(_mul(du, v), _mul(u, dv))
+
+            if isinstance(node.op, ast.Div):
+                if dv is None:
+                    return None if du is None else '(%s/%s)' % (du, v)
+                term = '(%s*%s/%s**2)' % (u, dv, v)
+                if du is None:
+                    return '(-%s)' % term
+                return '(%s/%s - %s)' % (du, v, term)
+
+            if isinstance(node.op, ast.Pow):
+                # written so that both terms are finite at u = 0
+                return _add(_mul('(%s*%s**(%s - 1.0))' % (v, u, v), du),
+                            _mul(dv, '_xlogy(%s**%s, %s)' % (u, v, u)))
+
+            raise _NotDifferentiable()
+
+        if isinstance(node, ast.Call):
+            self.source(node)  # make sure the function is supported
+            arg = self.source(node.args[0])
+            return _mul(_DERIV_FUNCS[node.func.id] % arg,
+                        self.deriv(node.args[0], wrt))
+
+        raise _NotDifferentiable()
+
+
+_BINOPS = {
+    ast.Add: '+',
+    ast.Sub: '-',
+    ast.Mult: '*',
+    ast.Div: '/',
+    ast.Pow: '**',
+}
+
+
+def _add(a, b):
+    """ Returns source for the sum of two derivatives, either of which may
+    be None (zero)."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return '(%s + %s)' % (a, b)
+
+
+def _mul(a, b):
+    """ Returns source for the product of two terms, either of which may be
+    None (zero)."""
+    if a is None or b is None:
+        return None
+    if a == '1.0':
+        return b
+    if b == '1.0':
+        return a
+    return '(%s*%s)' % (a, b)
+
+
+def _xlogy(x, y):
+    """ Returns x*log(y), or zero if x is zero, which is the limit of the
+    derivative of y**v wrt v at y = 0."""
+    if x == 0.0:
+        return 0.0
+    return x*numpy.log(y)
+
+
+def _compile_func(fname, args, stmts, returns):
     """
-    A dict-like wrapper for the unknowns and params
-    objects.  Items are first looked for in the unknowns
-    and then the params.
+    Compiles a function that takes the given args, executes the given
+    statements and returns a tuple of the given expressions.  The function
+    is evaluated in the scope of `_expr_dict`.
 
     Args
     ----
-    unknowns : dict-like
-        The unknowns object to be wrapped.
+    fname : str
+        Name of the function.
+
+    args : list of (str, bool)
+        Names of the args.
+
+    stmts : iter of str
+        Statements making up the body of the function.
+
+    returns : iter of str
+        Expressions that will be returned.
 
-    params : dict-like
-        The params object to be wrapped.
+    Returns
+    -------
+    function
     """
-    def __init__(self, unknowns, params):
-        self._unknowns = unknowns
-        self._params = params
+    lines = ['def %s(%s):' % (fname, ', '.join(name for name, _ in args))]
+    lines.extend('    %s' % stmt.strip() for stmt in stmts)
+    lines.append('    return (%s)' % ''.join('%s, ' % ret for ret in returns))
 
-    def __getitem__(self, name):
-        try:
-            return self._unknowns[name]
-        except KeyError:
-            return self._params[name]
-
-    def __setitem__(self, name, value):
-        if name in self._unknowns:
-            self._unknowns[name] = value
-        elif name in self._params:
-            self._params[name] = value
-        else:
-            self._unknowns[name] # will raise KeyError
+    scope = {}
+    exec(compile('\n'.join(lines), fname, 'exec'), _expr_dict, scope)
+    return scope[fname]
 
 
 def _import_functs(mod, dct, names=None):
@@ -279,6 +669,8 @@ _expr_dict['cmath'] = cmath
 
 _expr_dict['numpy'] = numpy
 
+_expr_dict['_xlogy'] = _xlogy
+
 
 # if scipy is available, add some functions
 try:
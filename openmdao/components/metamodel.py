@@ -3,6 +3,9 @@
 import sys
 from copy import deepcopy
 
+import numpy as np
+from scipy import sparse
+
 from openmdao.core.component import Component, _NotSet
 
 
@@ -13,11 +16,21 @@ class MetaModel(Component):
     'train:' prepended to the corresponding parameter/output name.
 
     For a Float variable, the training data is an array of length m.
+
+    Args
+    ----
+    vec_size : int, optional
+        Number of points that are evaluated at once. When greater than 1,
+        each param and output gets a leading dimension of this size and
+        all of the points are passed to the surrogates in a single call.
+        The training data still has one entry per training point.
     """
 
-    def __init__(self):
+    def __init__(self, vec_size=1):
         super(MetaModel, self).__init__()
 
+        self.vec_size = vec_size
+
         # This surrogate will be used for all outputs that don't have
         # a specific surrogate assigned to them
         self.default_surrogate = None
@@ -28,7 +41,7 @@ class MetaModel(Component):
 
         # training will occur on first execution
         self.train = True
-        self._training_input = []
+        self._training_input = np.empty((0, 0))
         self._training_output = {}
 
         # When set to False (default), the metamodel retrains with the new
@@ -37,9 +50,17 @@ class MetaModel(Component):
         # is used to train.
         self.warm_restart = False
 
+        # When set to True along with warm_restart, surrogates that have an
+        # `update` method are only given the new data, instead of being
+        # retrained on all of it.
+        self.incremental_update = False
+
         # keeps track of which sur_<name> slots are full
         self._surrogate_overrides = set()
 
+        # number of training points each output's surrogate was trained on
+        self._num_trained = {}
+
     def add_param(self, name, val=_NotSet, **kwargs):
         """ Add a `param` input to this component and a corresponding
         training parameter.
@@ -52,6 +73,8 @@ class MetaModel(Component):
         val : float or ndarray or object
             Initial value for the input.
         """
+        if self.vec_size > 1 and val is not _NotSet:
+            val = self._vectorize(val)
         super(MetaModel, self).add_param(name, val, **kwargs)
         super(MetaModel, self).add_param('train:'+name, val=list(), pass_by_obj=True)
         self._surrogate_param_names.append(name)
@@ -69,10 +92,12 @@ class MetaModel(Component):
             Initial value for the output. While the value is overwritten during
             execution, it is useful for infering size.
         """
+        if self.vec_size > 1 and val is not _NotSet:
+            val = self._vectorize(val)
         super(MetaModel, self).add_output(name, val, **kwargs)
         super(MetaModel, self).add_output('train:'+name, val=list(), pass_by_obj=True)
         self._surrogate_output_names.append(name)
-        self._training_output[name] = []
+        self._training_output[name] = np.empty(0)
 
         if self._unknowns_dict[name].get('surrogate'):
             self._unknowns_dict[name]['default_surrogate'] = False
@@ -96,6 +121,7 @@ class MetaModel(Component):
 
         # training will occur on first execution after setup
         self.train = True
+        self._num_trained = {}
 
         return super(MetaModel, self)._setup_variables()
 
@@ -144,36 +170,51 @@ class MetaModel(Component):
             if self.warm_restart:
                 base = len(self._training_input)
             else:
-                self._training_input = []
                 base = 0
 
-            # add training data for each input
-            for name in self._surrogate_param_names:
-                val = self.params['train:'+name]
-                num_sample = len(val)
-
-                for j in range(base, base + num_sample):
-                    if j > len(self._training_input) - 1:
-                        self._training_input.append([])
-                    self._training_input[j].append(val[j-base])
+            # add training data for each input, one row per training point
+            # and one column per entry of each param
+            vals = [np.asarray(self.params['train:'+name], dtype=float)
+                    for name in self._surrogate_param_names]
+            num_sample = len(vals[0]) if vals else 0
+            vals = [val.reshape(num_sample, np.size(self.params[name]) // self.vec_size)
+                    for name, val in zip(self._surrogate_param_names, vals)]
+
+            inputs = np.empty((base + num_sample, sum(val.shape[1] for val in vals)))
+            if base > 0:
+                inputs[:base] = self._training_input
+            col = 0
+            for val in vals:
+                inputs[base:, col:col+val.shape[1]] = val
+                col += val.shape[1]
+            self._training_input = inputs
 
             # add training data for each output
             for name in self._surrogate_output_names:
-                if not self.warm_restart:
-                    self._training_output[name] = []
+                val = np.asarray(self.unknowns['train:'+name], dtype=float)
+                if base > 0:
+                    val = np.concatenate((self._training_output[name], val))
+                self._training_output[name] = val
 
-                self._training_output[name].extend(self.unknowns['train:'+name])
                 surrogate = self._unknowns_dict[name].get('surrogate')
                 if surrogate is not None:
-                    surrogate.train(self._training_input, self._training_output[name])
+                    # Surrogates that can be updated incrementally only get
+                    # the new points when asked to.
+                    update = getattr(surrogate, 'update', None)
+                    if update is not None and self.incremental_update and \
+                       base > 0 and self._num_trained.get(name) == base:
+                        update(self._training_input[base:],
+                               self._training_output[name][base:])
+                    else:
+                        surrogate.train(self._training_input, self._training_output[name])
+                    self._num_trained[name] = len(self._training_input)
 
             self.train = False
 
         # Now Predict for current inputs
-        inputs = []
-        for name in self._surrogate_param_names:
-            val = params[name]
-            inputs.append(val)
+        inputs = self._params_to_inputs(params)
+        if self.vec_size == 1:
+            inputs = inputs[0]
 
         for name in self._surrogate_output_names:
             surrogate = self._unknowns_dict[name].get('surrogate')
@@ -182,3 +223,74 @@ class MetaModel(Component):
             else:
                 raise RuntimeError("Metamodel '%s': No surrogate specified for output '%s'"
                                    % (self.pathname, name))
+
+    def _vectorize(self, val):
+        """ Returns an array containing vec_size copies of the given value."""
+        return np.ones((self.vec_size,) + np.shape(val))*val
+
+    def _params_to_inputs(self, params):
+        """ Returns the current values of the surrogate params as a 2D
+        array with one row per point."""
+        inputs = [np.reshape(params[name], (self.vec_size, -1))
+                  for name in self._surrogate_param_names]
+        return np.hstack(inputs)
+
+    def jacobian(self, params, unknowns, resids):
+        """
+        Returns the Jacobian of the outputs with respect to the params. It
+        comes from the surrogates for outputs whose surrogate provides a
+        `linearize` method, and from finite difference for the rest.
+
+        Args
+        ----
+        params : `VecWrapper`
+            `VecWrapper` containing parameters. (p)
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+
+        resids : `VecWrapper`
+            `VecWrapper` containing residuals. (r)
+
+        Returns
+        -------
+        dict
+            Dictionary whose keys are tuples of the form ('unknown', 'param')
+            and whose values are ndarrays, or `scipy.sparse.csr_matrix` when
+            `vec_size` is greater than one.
+        """
+        inputs = self._params_to_inputs(params)
+        vec_size = self.vec_size
+
+        J = {}
+        fd_outputs = []
+        for uname in self._surrogate_output_names:
+            surrogate = self._unknowns_dict[uname].get('surrogate')
+            linearize = getattr(surrogate, 'linearize', None)
+            if linearize is None:
+                fd_outputs.append(uname)
+                continue
+
+            # Each point only depends on its own inputs, so each block of
+            # the Jacobian is block diagonal, and stored sparse when there's
+            # more than one point.
+            sjac = linearize(inputs)
+            idx = 0
+            for pname in self._surrogate_param_names:
+                size = np.size(params[pname]) // vec_size
+                if vec_size == 1:
+                    J[uname, pname] = sjac[:, idx:idx+size].copy()
+                else:
+                    J[uname, pname] = sparse.csr_matrix(
+                        (sjac[:, idx:idx+size].ravel(), np.arange(vec_size*size),
+                         np.arange(0, vec_size*size + 1, size)),
+                        shape=(vec_size, vec_size*size))
+                idx += size
+
+        if fd_outputs:
+            Jfd = self.fd_jacobian(params, unknowns, resids)
+            for key, val in Jfd.items():
+                if key[0] in fd_outputs:
+                    J[key] = val
+
+        return J
@@ -138,5 +138,119 @@ class TestExecComp(unittest.TestCase):
         assert_rel_error(self, J['comp.y']['p1.x'], np.array([6.0]), 0.00001)
 
 
+    def _check_jacobian(self, comp, params, unknowns):
+        # compare the analytic derivatives against complex step
+        J = comp.jacobian(params, unknowns, {})
+
+        comp._jac_func = None
+        comp._cs_outs = comp._out_names
+        comp._elementwise = False
+        Jcs = comp.jacobian(params, unknowns, {})
+
+        self.assertEqual(set(J), set(Jcs))
+        for key in J:
+            assert_rel_error(self, J[key], Jcs[key], 1e-8)
+
+    def test_symbolic_derivs(self):
+        comp = ExecComp(['y1 = 3.0*x**2 + sin(z)*exp(-x) - log(z)/x',
+                         'y2 = y1*sqrt(z) + x**z - tanh(x)',
+                         'y3 = a[1]*a[2]**2 - cos(a[0])/z'],
+                        a=np.array([0.5, 1.5, 2.5]))
+
+        self.assertEqual(comp._symbolic_outs, set(['y1', 'y2', 'y3']))
+        self.assertEqual(comp._cs_outs, [])
+
+        params = {'x': 1.3, 'z': 2.7, 'a': np.array([0.5, 1.5, 2.5])}
+        unknowns = {'y1': 0.0, 'y2': 0.0, 'y3': 0.0}
+        comp.solve_nonlinear(params, unknowns, {})
+
+        J = comp.jacobian(params, unknowns, {})
+        assert_rel_error(self, J[('y3', 'a')],
+                         np.array([[math.sin(.5)/2.7, 2.5**2, 2.*1.5*2.5]]), 1e-10)
+        assert_rel_error(self, J[('y1', 'z')],
+                         np.array([[math.cos(2.7)*math.exp(-1.3) - 1./(2.7*1.3)]]),
+                         1e-10)
+
+        self._check_jacobian(comp, params, unknowns)
+
+    def test_elementwise_complex_step(self):
+        comp = ExecComp(['y = 2.0*x*z + exp(x)', 'w = b*b'],
+                        x=np.array([1., 2., 3.]), z=np.array([4., 5., 6.]),
+                        y=np.zeros(3))
+
+        self.assertEqual(comp._cs_outs, ['y'])
+        self.assertTrue(comp._elementwise)
+
+        params = {'x': np.array([1., 2., 3.]), 'z': np.array([4., 5., 6.]),
+                  'b': 3.0}
+        unknowns = {'y': np.zeros(3), 'w': 0.0}
+        comp.solve_nonlinear(params, unknowns, {})
+
+        J = comp.jacobian(params, unknowns, {})
+        assert_rel_error(self, J[('y', 'x')],
+                         np.diag([8. + math.exp(1.), 10. + math.exp(2.),
+                                  12. + math.exp(3.)]), 1e-10)
+        assert_rel_error(self, J[('w', 'b')], np.array([[6.0]]), 1e-10)
+
+        self._check_jacobian(comp, params, unknowns)
+
+    def test_broadcast_complex_step(self):
+        # a size 1 array param broadcast to an array output
+        prob = Problem(root=Group())
+        prob.root.add('p1', ParamComp('a', np.array([2.])))
+        prob.root.add('p2', ParamComp('x', np.array([1., 2., 3.])))
+        comp = prob.root.add('comp', ExecComp('z = a*x', a=np.array([2.]),
+                                              x=np.zeros(3), z=np.zeros(3)))
+        prob.root.connect('p1.a', 'comp.a')
+        prob.root.connect('p2.x', 'comp.x')
+
+        self.assertTrue(comp._elementwise)
+
+        prob.setup(check=False)
+        prob.run()
+
+        J = prob.calc_gradient(['p1.a', 'p2.x'], ['comp.z'], mode='fwd',
+                               return_format='dict')
+        assert_rel_error(self, J['comp.z']['p1.a'], np.array([[1.], [2.], [3.]]), 1e-10)
+        assert_rel_error(self, J['comp.z']['p2.x'], 2.0*np.eye(3), 1e-10)
+
+    def test_symbolic_pow_zero(self):
+        # the symbolic derivative of x**z wrt z has log(x) in it
+        prob = Problem(root=Group())
+        prob.root.add('p1', ParamComp('x', 0.0))
+        prob.root.add('p2', ParamComp('z', 2.0))
+        comp = prob.root.add('comp', ExecComp('y = x**z'))
+        prob.root.connect('p1.x', 'comp.x')
+        prob.root.connect('p2.z', 'comp.z')
+
+        self.assertEqual(comp._symbolic_outs, set(['y']))
+
+        prob.setup(check=False)
+        prob.run()
+
+        J = prob.calc_gradient(['p1.x', 'p2.z'], ['comp.y'], mode='fwd',
+                               return_format='dict')
+        assert_rel_error(self, J['comp.y']['p1.x'], np.array([[0.]]), 1e-10)
+        assert_rel_error(self, J['comp.y']['p2.z'], np.array([[0.]]), 1e-10)
+
+    def test_matrix_complex_step(self):
+        mat = np.array([[1., 2.], [3., 4.]])
+        comp = ExecComp(['y = mat.dot(x)', 'z = y[0]*y[1]'], mat=mat,
+                        x=np.array([1., 1.]), y=np.zeros(2))
+
+        self.assertFalse(comp._elementwise)
+        self.assertEqual(comp._cs_outs, ['y', 'z'])
+
+        params = {'x': np.array([1., 2.]), 'mat': mat}
+        unknowns = {'y': np.zeros(2), 'z': 0.0}
+        comp.solve_nonlinear(params, unknowns, {})
+        assert_rel_error(self, unknowns['z'], 55.0, 1e-10)
+
+        J = comp.jacobian(params, unknowns, {})
+        assert_rel_error(self, J[('y', 'x')], mat, 1e-10)
+        assert_rel_error(self, J[('z', 'x')], np.array([[11.*1. + 5.*3., 11.*2. + 5.*4.]]),
+                         1e-10)
+        self.assertEqual(J[('y', 'mat')].shape, (2, 4))
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,9 +5,11 @@ from six import iteritems
 from six.moves import cStringIO
 
 import numpy as np
+from scipy import sparse
 from math import sin
 
 from openmdao.core.component import Component
+from openmdao.components.paramcomp import ParamComp
 from openmdao.core.group import Group
 from openmdao.core.problem import Problem
 from openmdao.components.metamodel import MetaModel
@@ -174,6 +176,189 @@ class TestMetaModel(unittest.TestCase):
         assert_rel_error(self, prob['meta.y1'], 2.0, .00001)
         assert_rel_error(self, prob['meta.y2'], 4.0, .00001)
 
+    def test_warm_start_array_output(self):
+        class MeanSurrogate(object):
+            def train(self, X, Y):
+                self.mean = np.mean(Y, axis=0)
+
+            def predict(self, x):
+                return self.mean
+
+        meta = MetaModel()
+        meta.add_param('x', 0.)
+        meta.add_output('y', np.zeros(2), surrogate=MeanSurrogate())
+        meta.warm_restart = True
+
+        prob = Problem(Group())
+        prob.root.add('meta', meta)
+        prob.setup(check=False)
+
+        prob['meta.train:x'] = [1.0, 2.0]
+        prob['meta.train:y'] = [np.array([1.0, 2.0]), np.array([3.0, 4.0])]
+        prob.run()
+        assert_rel_error(self, prob['meta.y'], np.array([2.0, 3.0]), 1e-10)
+
+        prob['meta.train:x'] = [3.0, 4.0]
+        prob['meta.train:y'] = [np.array([5.0, 6.0]), np.array([5.0, 6.0])]
+        meta.train = True
+        prob.run()
+        assert_rel_error(self, prob['meta.y'], np.array([3.5, 4.5]), 1e-10)
+
+    def test_incremental_update(self):
+        def build(incremental):
+            meta = MetaModel()
+            meta.add_param('x1', 0.)
+            meta.add_param('x2', 0.)
+            meta.add_output('y1', 0., surrogate=ResponseSurface())
+            meta.warm_restart = True
+            meta.incremental_update = incremental
+
+            prob = Problem(Group())
+            prob.root.add('meta', meta)
+            prob.setup(check=False)
+            return prob
+
+        x = np.random.RandomState(0).rand(30, 2)
+        x[:, 0] = 3000. + 250.*x[:, 0]
+        y = 2.*x[:, 0] + 1e-3*x[:, 0]**2 - 5.*x[:, 0]*x[:, 1]
+
+        updates = []
+        for incremental in (False, True):
+            prob = build(incremental)
+            surrogate = prob.root.meta._unknowns_dict['y1']['surrogate']
+
+            calls = []
+            surrogate_update = surrogate.update
+            def update(X, Y):
+                calls.append(len(X))
+                surrogate_update(X, Y)
+            surrogate.update = update
+
+            for rows in (slice(0, 20), slice(20, 30)):
+                prob['meta.train:x1'] = list(x[rows, 0])
+                prob['meta.train:x2'] = list(x[rows, 1])
+                prob['meta.train:y1'] = list(y[rows])
+                prob.root.meta.train = True
+                prob['meta.x1'] = 3125.
+                prob['meta.x2'] = 0.7
+                prob.run()
+
+            updates.append((calls, prob['meta.y1']))
+
+        # the surrogate is only updated when asked to, and then with just
+        # the new points, giving the same fit
+        self.assertEqual(updates[0][0], [])
+        self.assertEqual(updates[1][0], [10])
+        assert_rel_error(self, updates[1][1], updates[0][1], 1e-10)
+
+    def test_jacobian(self):
+        meta = MetaModel()
+        meta.add_param('x1', 0.)
+        meta.add_param('x2', 0.)
+        meta.add_output('y1', 0., surrogate=FloatKrigingSurrogate())
+        meta.add_output('y2', 0., surrogate=ResponseSurface())
+
+        prob = Problem(Group())
+        prob.root.add('meta', meta)
+        prob.root.add('p1', ParamComp('x1', 2.2))
+        prob.root.add('p2', ParamComp('x2', 2.7))
+        prob.root.connect('p1.x1', 'meta.x1')
+        prob.root.connect('p2.x2', 'meta.x2')
+        prob.setup(check=False)
+
+        prob['meta.train:x1'] = [1.0, 2.0, 3.0, 1.5, 2.5, 0.5]
+        prob['meta.train:x2'] = [1.0, 3.0, 4.0, 2.0, 1.5, 3.5]
+        prob['meta.train:y1'] = [3.0, 2.0, 1.0, 2.5, 1.0, 4.0]
+        prob['meta.train:y2'] = [1.0, 4.0, 7.0, 2.0, 3.0, 5.0]
+
+        prob.run()
+
+        # Both surrogates provide linearize, so both outputs use the
+        # surrogate derivatives and nothing gets finite differenced.
+        Jfd = meta.fd_jacobian(meta.params, meta.unknowns, meta.resids)
+
+        fd_calls = []
+        def fd_jacobian(*args, **kwargs):
+            fd_calls.append(args)
+            return Jfd
+        meta.fd_jacobian = fd_jacobian
+
+        J = meta.jacobian(meta.params, meta.unknowns, meta.resids)
+        for uname in ('y1', 'y2'):
+            for pname in ('x1', 'x2'):
+                assert_rel_error(self, J[uname, pname], Jfd[uname, pname], 1e-4)
+
+        for mode in ('fwd', 'rev'):
+            J = prob.calc_gradient(['p1.x1', 'p2.x2'], ['meta.y1', 'meta.y2'],
+                                   mode=mode, return_format='dict')
+            for uname in ('y1', 'y2'):
+                for pname in ('x1', 'x2'):
+                    assert_rel_error(self, J['meta.'+uname]['p%s.%s' % (pname[1], pname)],
+                                     Jfd[uname, pname], 1e-4)
+
+        self.assertEqual(fd_calls, [])
+
+    def test_vectorized(self):
+        def build(vec_size):
+            meta = MetaModel(vec_size=vec_size)
+            meta.add_param('x1', 0.)
+            meta.add_param('x2', 0.)
+            meta.add_output('y1', 0., surrogate=FloatKrigingSurrogate())
+            meta.add_output('y2', 0., surrogate=ResponseSurface())
+
+            prob = Problem(Group())
+            prob.root.add('meta', meta)
+            val = np.zeros(vec_size) if vec_size > 1 else 0.
+            prob.root.add('p', ParamComp([('x1', val), ('x2', val)]))
+            prob.root.connect('p.x1', 'meta.x1')
+            prob.root.connect('p.x2', 'meta.x2')
+            prob.setup(check=False)
+
+            prob['meta.train:x1'] = [1.0, 2.0, 3.0, 1.5, 2.5, 0.5]
+            prob['meta.train:x2'] = [1.0, 3.0, 4.0, 2.0, 1.5, 3.5]
+            prob['meta.train:y1'] = [3.0, 2.0, 1.0, 2.5, 1.0, 4.0]
+            prob['meta.train:y2'] = [1.0, 4.0, 7.0, 2.0, 3.0, 5.0]
+            return prob
+
+        x1 = np.array([2.2, 1.1, 0.7, 2.9])
+        x2 = np.array([2.7, 3.1, 1.2, 3.9])
+
+        prob = build(4)
+        prob['p.x1'] = x1
+        prob['p.x2'] = x2
+        prob.run()
+
+        meta = prob.root.meta
+        self.assertEqual(meta._training_input.shape, (6, 2))
+        self.assertEqual(meta.unknowns['y1'].shape, (4,))
+
+        # the blocks of the Jacobian are block diagonal, so they're sparse
+        Jmeta = meta.jacobian(meta.params, meta.unknowns, meta.resids)
+        self.assertTrue(sparse.issparse(Jmeta['y1', 'x1']))
+        self.assertEqual(Jmeta['y1', 'x1'].shape, (4, 4))
+        self.assertEqual(Jmeta['y1', 'x1'].nnz, 4)
+
+        J = prob.calc_gradient(['p.x1', 'p.x2'], ['meta.y1', 'meta.y2'],
+                               mode='fwd', return_format='dict')
+
+        # compare to evaluating the points one at a time
+        single = build(1)
+        for i in range(4):
+            single['p.x1'] = x1[i]
+            single['p.x2'] = x2[i]
+            single.run()
+
+            assert_rel_error(self, prob['meta.y1'][i], single['meta.y1'], 1e-8)
+            assert_rel_error(self, prob['meta.y2'][i], single['meta.y2'], 1e-8)
+
+            Js = single.calc_gradient(['p.x1', 'p.x2'], ['meta.y1', 'meta.y2'],
+                                      mode='fwd', return_format='dict')
+            for uname in ('meta.y1', 'meta.y2'):
+                for pname in ('p.x1', 'p.x2'):
+                    expected = np.zeros(4)
+                    expected[i] = Js[uname][pname][0, 0]
+                    assert_rel_error(self, J[uname][pname][i], expected, 1e-4)
+
     #def test_array_inputs(self):
         #raise unittest.SkipTest('MetaModel does not currently support array params')
 
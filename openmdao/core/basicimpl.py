@@ -41,7 +41,8 @@ class BasicImpl(object):
 
     @staticmethod
     def create_data_xfer(src_vec, tgt_vec,
-                         src_idxs, tgt_idxs, vec_conns, byobj_conns):
+                         src_idxs, tgt_idxs, vec_conns, byobj_conns,
+                         unit_convs=()):
         """
         Create an object for performing data transfer between source
         and target vectors.
@@ -70,9 +71,13 @@ class BasicImpl(object):
             Mapping of 'pass by object' variables to the source variables that
             they are connected to.
 
+        unit_convs : list of tuple, optional
+            Unit conversions of the target variables, given as (indices in
+            the local target vector, scale, offset) tuples.
+
         Returns
         -------
         `DataXfer`
             A `DataXfer` object.
         """
-        return DataXfer(src_idxs, tgt_idxs, vec_conns, byobj_conns)
+        return DataXfer(src_idxs, tgt_idxs, vec_conns, byobj_conns, unit_convs)
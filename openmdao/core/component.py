@@ -215,6 +215,8 @@ class Component(System):
             meta['pathname'] = pathname
             meta['promoted_name'] = name
 
+        self._setup_prom_map(_new_params, _new_unknowns)
+
         self._post_setup = True
 
         return _new_params, _new_unknowns
@@ -2,6 +2,10 @@
 
 import numpy as np
 
+# Contiguous runs shorter than this are cheaper to copy as part of a single
+# fancy indexed copy than as a separate slice copy.
+_MIN_RUN = 64
+
 
 class DataXfer(object):
     """
@@ -23,19 +27,48 @@ class DataXfer(object):
     byobj_conns : dict
         Mapping of 'pass by object' variables to the source variables that
         they are connected to.
-    """
-
-    def __init__(self, src_idxs, tgt_idxs, vec_conns, byobj_conns):
 
-        # TODO: change to_slice to to_slices. (should never return an index array)
-        #self.src_idxs = to_slice(src_idxs)
-        #self.tgt_idxs = to_slice(tgt_idxs)
+    unit_convs : list of tuple, optional
+        Unit conversions of the target variables, given as (indices in the
+        local target vector, scale, offset) tuples.
+    """
 
+    def __init__(self, src_idxs, tgt_idxs, vec_conns, byobj_conns,
+                 unit_convs=()):
         self.src_idxs = src_idxs
         self.tgt_idxs = tgt_idxs
         self.vec_conns = vec_conns
         self.byobj_conns = byobj_conns
 
+        # Per index scale and offset of the targets that need a unit
+        # conversion. Targets are converted in place right after they are
+        # copied, so the target vector always holds values in target units.
+        unit_convs = [conv for conv in unit_convs if len(conv[0])]
+        if unit_convs:
+            self._conv_idxs = np.concatenate([idxs for idxs, _, _ in unit_convs])
+            self._conv_scale = np.concatenate([np.full(len(idxs), scale, dtype=float)
+                                               for idxs, scale, _ in unit_convs])
+            self._conv_offset = np.concatenate([np.full(len(idxs), offset, dtype=float)
+                                                for idxs, _, offset in unit_convs])
+        else:
+            self._conv_idxs = self._conv_scale = self._conv_offset = None
+
+        # Forward transfer plan: slice copies for the long contiguous runs
+        # and a fancy indexed copy for whatever is left.
+        self._fwd_slices, self._fwd_src_idxs, self._fwd_tgt_idxs = \
+            _transfer_plan(src_idxs, tgt_idxs)
+
+        # Reverse transfers accumulate into the sources. If no source
+        # appears more than once, the forward plan can just add instead of
+        # copy. Otherwise, all of the targets are summed per unique source
+        # with a bincount.
+        src_idxs = np.asarray(src_idxs, dtype=int)
+        self._rev_uniq_srcs, inverse = np.unique(src_idxs, return_inverse=True)
+        if len(self._rev_uniq_srcs) == len(src_idxs):
+            self._rev_uniq_srcs = self._rev_inverse = None
+        else:
+            self._rev_inverse = inverse
+
     def transfer(self, srcvec, tgtvec, mode='fwd', deriv=False):
         """
         Performs data transfer between a source vector and a target vector.
@@ -62,16 +95,111 @@ class DataXfer(object):
 
         deriv : bool, optional
             If True, this is a derivative scatter, so byobjs should not be
-            transferred.
+            transferred and unit conversions only apply their scale.
         """
         if mode == 'rev':
             # in reverse mode, srcvec and tgtvec are switched. Note, we only
             # run in reverse for derivatives, and derivatives accumulate from
             # all targets. byobjs are never scattered in reverse
-            np.add.at(srcvec.vec, self.src_idxs, tgtvec.vec[self.tgt_idxs])
+            src, tgt = srcvec.vec, tgtvec.vec
+            conv_idxs = self._conv_idxs
+            if conv_idxs is not None:
+                # scale the targets while they're accumulated, then put
+                # them back.
+                saved = tgt[conv_idxs]
+                tgt[conv_idxs] = saved*self._conv_scale
+
+            if self._rev_inverse is None:
+                for src_slice, tgt_slice in self._fwd_slices:
+                    src[src_slice] += tgt[tgt_slice]
+                if self._fwd_src_idxs is not None:
+                    src[self._fwd_src_idxs] += tgt[self._fwd_tgt_idxs]
+            else:
+                src[self._rev_uniq_srcs] += np.bincount(self._rev_inverse,
+                                                        weights=tgt[self.tgt_idxs],
+                                                        minlength=len(self._rev_uniq_srcs))
+
+            if conv_idxs is not None:
+                tgt[conv_idxs] = saved
         else:
             # forward, include byobjs if not a deriv scatter
-            tgtvec.vec[self.tgt_idxs] = srcvec.vec[self.src_idxs]
+            src, tgt = srcvec.vec, tgtvec.vec
+            for src_slice, tgt_slice in self._fwd_slices:
+                tgt[tgt_slice] = src[src_slice]
+            if self._fwd_src_idxs is not None:
+                tgt[self._fwd_tgt_idxs] = src[self._fwd_src_idxs]
+            self._convert_units(tgt, deriv)
             if not deriv:
                 for tgt, src in self.byobj_conns:
                     tgtvec[tgt] = srcvec[src]
+
+    def _convert_units(self, tgt, deriv):
+        """
+        Converts the freshly transferred targets that have units different
+        from their sources.
+
+        Args
+        ----
+        tgt : ndarray
+            The target array.
+
+        deriv : bool
+            If True, the values are derivatives, so only the scale applies.
+        """
+        conv_idxs = self._conv_idxs
+        if conv_idxs is not None:
+            if deriv:
+                tgt[conv_idxs] *= self._conv_scale
+            else:
+                tgt[conv_idxs] = self._conv_scale*(tgt[conv_idxs] + self._conv_offset)
+
+
+def _transfer_plan(src_idxs, tgt_idxs, min_run=_MIN_RUN):
+    """
+    Breaks a transfer up into runs of indices that are contiguous in both
+    the source and the target.
+
+    Args
+    ----
+    src_idxs : array
+        Indices of the source variables in the source vector.
+
+    tgt_idxs : array
+        Indices of the target variables in the target vector.
+
+    min_run : int, optional
+        Minimum length of a run to be copied as a slice. A transfer that is
+        a single run is always copied as a slice.
+
+    Returns
+    -------
+    tuple
+        A list of (src slice, tgt slice) tuples, followed by the source and
+        target index arrays of the leftover entries (both None if there
+        aren't any).
+    """
+    src_idxs = np.asarray(src_idxs, dtype=int)
+    tgt_idxs = np.asarray(tgt_idxs, dtype=int)
+
+    n = len(src_idxs)
+    if n == 0:
+        return [], None, None
+
+    # a run ends wherever either index doesn't increase by one
+    breaks = np.nonzero((np.diff(src_idxs) != 1) | (np.diff(tgt_idxs) != 1))[0] + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [n]))
+
+    is_slice = ends - starts >= min_run
+    if len(starts) == 1:
+        is_slice[0] = True
+
+    slices = [(slice(src_idxs[start], src_idxs[start] + end - start),
+               slice(tgt_idxs[start], tgt_idxs[start] + end - start))
+              for start, end in zip(starts[is_slice], ends[is_slice])]
+
+    leftover = np.logical_not(np.repeat(is_slice, ends - starts))
+    if not leftover.any():
+        return slices, None, None
+
+    return slices, src_idxs[leftover], tgt_idxs[leftover]
@@ -9,6 +9,7 @@ from itertools import chain
 
 import numpy as np
 import networkx as nx
+from scipy import sparse
 
 from openmdao.components.paramcomp import ParamComp
 from openmdao.core.basicimpl import BasicImpl
@@ -35,8 +36,17 @@ class Group(System):
         self._src_idxs = {}
         self._data_xfer = {}
 
+        # index arrays etc. used to create our DataXfers, keyed by
+        # var_of_interest. These can be filled in from a setup cache.
+        self._xfer_plans = {}
+
         self._local_unknown_sizes = None
         self._local_param_sizes = None
+        self._global_offsets = {}
+
+        # Incremented every time we are linearized, so linear solvers can
+        # tell when anything they computed from our Jacobian is stale.
+        self._jacobian_count = 0
 
         # These solvers are the default
         self.ln_solver = ScipyGMRES()
@@ -211,6 +221,7 @@ class Group(System):
         self._params_dict = OrderedDict()
         self._unknowns_dict = OrderedDict()
         self._data_xfer = {}
+        self._xfer_plans = {}
 
         for sub in self.subsystems():
             subparams, subunknowns = sub._setup_variables()
@@ -229,6 +240,8 @@ class Group(System):
             # check for any promotes that didn't match a variable
             sub._check_promotes()
 
+        self._setup_prom_map(self._params_dict, self._unknowns_dict)
+
         return self._params_dict, self._unknowns_dict
 
     def _promoted_name(self, name, subsystem):
@@ -289,13 +302,15 @@ class Group(System):
         self._local_unknown_sizes = None
         self._local_param_sizes = None
         self._owning_ranks = None
+        self._global_offsets = {}
 
         if not self.is_active():
             return
 
         self._impl_factory = impl
 
-        my_params = param_owners.get(self.pathname, [])
+        # a set, since it's checked for every param of every vector
+        my_params = set(param_owners.get(self.pathname, ()))
         if parent is None:
             self._create_vecs(my_params, var_of_interest=None, impl=impl)
             top_unknowns = self.unknowns
@@ -306,6 +321,7 @@ class Group(System):
         self._local_unknown_sizes = self.unknowns._get_flattened_sizes()
         self._local_param_sizes = self.params._get_flattened_sizes()
         self._owning_ranks = self._get_owning_ranks()
+        self._global_offsets = {}
 
         self._setup_data_transfer(my_params, None)
 
@@ -406,19 +422,19 @@ class Group(System):
         for tgt, srcs in self._src.items():
             for src in srcs:
                 try:
-                    src_pathnames = get_absvarpathnames(src, self._unknowns_dict, 'unknowns')
+                    src_pathnames = get_absvarpathnames(src, self._to_abs_unames, 'unknowns')
                 except KeyError as error:
                     try:
-                        src_pathnames = get_absvarpathnames(src, self._params_dict, 'params')
+                        src_pathnames = get_absvarpathnames(src, self._to_abs_pnames, 'params')
                     except KeyError as error:
                         raise ConnectError.nonexistent_src_error(src, tgt)
 
                 try:
-                    for tgt_pathname in get_absvarpathnames(tgt, self._params_dict, 'params'):
+                    for tgt_pathname in get_absvarpathnames(tgt, self._to_abs_pnames, 'params'):
                         connections.setdefault(tgt_pathname, []).extend(src_pathnames)
                 except KeyError as error:
                     try:
-                        get_absvarpathnames(tgt, self._unknowns_dict, 'unknowns')
+                        get_absvarpathnames(tgt, self._to_abs_unames, 'unknowns')
                     except KeyError as error:
                         raise ConnectError.nonexistent_target_error(src, tgt)
                     else:
@@ -541,14 +557,22 @@ class Group(System):
 
             # The user might submit a scalar Jacobian as a float.
             # It is really inconvenient if we don't allow it.
+            # Sparse Jacobians are kept sparse, but converted to a format
+            # that supports fast matrix-vector products.
             if jacobian_cache is not None:
                 for key, J in iteritems(jacobian_cache):
                     if isinstance(J, real_types):
                         jacobian_cache[key] = np.array([[J]])
+                    elif sparse.issparse(J):
+                        if J.format not in ('csr', 'csc'):
+                            jacobian_cache[key] = J.tocsr()
+                        continue
                     shape = jacobian_cache[key].shape
                     if len(shape) < 2:
                         jacobian_cache[key] = jacobian_cache[key].reshape((shape[0], 1))
 
+        self._jacobian_count += 1
+
     def apply_linear(self, mode, ls_inputs=None, vois=[None]):
         """Calls apply_linear on our children. If our child is a `Component`,
         then we need to also take care of the additional 1.0 on the diagonal
@@ -677,6 +701,112 @@ class Group(System):
                     if not meta.get('state'):
                         dunknowns[var] += dresids[var]
 
+    def assemble_jacobian(self, var_of_interest=None):
+        """
+        Assembles the linear operator that `apply_linear` applies in forward
+        mode (du |-> df) into a single sparse matrix. The matrix is built from
+        the cached Jacobians of all of the `Components` (and finite
+        differenced `Groups`) below us, mapped through the indices of our
+        data transfers. Its transpose is the operator applied in reverse mode.
+        `jacobian` must be called before this.
+
+        Components that implement a matrix-free `apply_linear` instead of
+        returning a Jacobian are linearized by applying them to unit vectors.
+
+        Args
+        ----
+        var_of_interest : str or None, optional
+            Name of the variable of interest that selects the relevant
+            vectors. Default is None, which uses all variables.
+
+        Returns
+        -------
+        `scipy.sparse.csc_matrix`
+            Matrix of size n x n where n is the length of our dumat vector
+            for the given variable of interest.
+        """
+        voi = var_of_interest
+        dumat = self.dumat[voi]
+        n = len(dumat.vec)
+
+        # map the absolute name of each of our vars to its location in the
+        # flattened vector
+        offsets = {}
+        for name, meta in dumat.get_vecvars():
+            offsets[meta['pathname']] = dumat._slices[name]
+
+        rows, cols, data = [], [], []
+
+        subs = list(self.subsystems(local=True))
+        while subs:
+            sub = subs.pop()
+            paramcomp = isinstance(sub, ParamComp)
+
+            if not (paramcomp or isinstance(sub, Component) or
+                    sub.fd_options['force_fd'] == True):
+                subs.extend(sub.subsystems(local=True))
+                continue
+
+            sub_du = sub.dumat[voi]
+            sub_dp = sub.dpmat[voi]
+
+            # 1.0 on the diagonal for explicit outputs. ParamComps just pass
+            # their values through.
+            for name, meta in sub_du.get_vecvars():
+                if paramcomp or not meta.get('state'):
+                    start, end = offsets[meta['pathname']]
+                    idxs = np.arange(start, end)
+                    rows.append(idxs)
+                    cols.append(idxs)
+                    data.append(np.ones(end - start))
+
+            if paramcomp:
+                continue
+
+            jac = sub._jacobian_cache
+            if not jac and sub.fd_options['force_fd'] != True:
+                jac = _probe_apply_linear(sub, voi)
+
+            for (unknown, param), J in iteritems(jac):
+                if unknown not in sub_du:
+                    continue
+                start, end = offsets[sub_du.metadata(unknown)['pathname']]
+                row_idxs = np.arange(start, end)
+
+                # States are never in dparams.
+                fact = -1.0
+                if param in sub_dp:
+                    meta = sub_dp.metadata(param)
+                    src = self.connections.get(meta['pathname'])
+                    if meta.get('pass_by_obj') or src not in offsets:
+                        # connected outside of this group
+                        continue
+                    start, end = offsets[src]
+                    if 'src_indices' in meta:
+                        col_idxs = start + np.asarray(meta['src_indices'])
+                    else:
+                        col_idxs = np.arange(start, end)
+                    if 'unit_conv' in meta:
+                        fact *= meta['unit_conv'][0]
+                elif param in sub_du:
+                    start, end = offsets[sub_du.metadata(param)['pathname']]
+                    col_idxs = np.arange(start, end)
+                else:
+                    continue
+
+                block = sparse.coo_matrix(J)
+                rows.append(row_idxs[block.row])
+                cols.append(col_idxs[block.col])
+                data.append(fact*block.data)
+
+        if rows:
+            rows = np.concatenate(rows)
+            cols = np.concatenate(cols)
+            data = np.concatenate(data)
+
+        # duplicate entries are summed during the conversion
+        return sparse.coo_matrix((data, (rows, cols)), shape=(n, n)).tocsc()
+
     def solve_linear(self, dumat, drmat, vois, mode=None):
         """
         Single linear solution applied to whatever input is sitting in
@@ -1022,24 +1152,23 @@ class Group(System):
             The offset into the distributed vector for the named variable
             in the specified rank (process).
         """
-        offset = 0
-        rank = 0
-
-        # first get the offset of the distributed storage for var_rank
-        while rank < var_rank:
-            for vname, size in sizes_table[rank].items():
-                if self._relevance.is_relevant(var_of_interest, vname):
-                    offset += size
-            rank += 1
-
-        # now, get the offset into the var_rank storage for the variable
-        for vname, size in sizes_table[var_rank].items():
-            if vname == name:
-                break
-            if self._relevance.is_relevant(var_of_interest, vname):
-                offset += size
-
-        return offset
+        # The offsets of all of the variables in all ranks are computed
+        # once per sizes table and variable of interest.
+        key = (id(sizes_table), var_of_interest)
+        offsets = self._global_offsets.get(key)
+        if offsets is None:
+            offsets = self._global_offsets[key] = []
+            offset = 0
+            for rank_sizes in sizes_table:
+                rank_offsets = {}
+                for vname, size in rank_sizes.items():
+                    rank_offsets[vname] = offset
+                    if self._relevance.is_relevant(var_of_interest, vname):
+                        offset += size
+                offsets.append((rank_offsets, offset))
+
+        rank_offsets, end = offsets[var_rank]
+        return rank_offsets.get(name, end)
 
     def _get_global_idxs(self, uname, pname, var_of_interest, mode):
         """
@@ -1124,6 +1253,42 @@ class Group(System):
             The name of a variable of interest.
 
         """
+        plans = self._xfer_plans.get(var_of_interest)
+        if plans is None:
+            plans = self._get_xfer_plans(my_params, var_of_interest)
+            self._xfer_plans[var_of_interest] = plans
+
+        for (tgt_sys, mode), (src_idxs, tgt_idxs, vec_conns, byobj_conns,
+                              unit_convs) in plans:
+            self._data_xfer[(tgt_sys, mode, var_of_interest)] = \
+                self._impl_factory.create_data_xfer(self.dumat[var_of_interest],
+                                                    self.dpmat[var_of_interest],
+                                                    src_idxs, tgt_idxs,
+                                                    vec_conns, byobj_conns,
+                                                    unit_convs)
+
+    def _get_xfer_plans(self, my_params, var_of_interest):
+        """
+        Computes the source and target indices, connections and unit
+        conversions of every `DataXfer` needed for the given variable of
+        interest.
+
+        Args
+        ----
+
+        my_params : list
+            List of pathnames for parameters that the `Group` is
+            responsible for propagating.
+
+        var_of_interest : str or None
+            The name of a variable of interest.
+
+        Returns
+        -------
+        list
+            A list of ((tgt_sys, mode), (src_idxs, tgt_idxs, vec_conns,
+            byobj_conns, unit_convs)), one entry per `DataXfer`.
+        """
         relevance = self._relevance
         xfer_dict = {}
         for param, unknown in self.connections.items():
@@ -1138,14 +1303,15 @@ class Group(System):
                 tgt_sys = name_relative_to(self.pathname, param)
                 src_sys = name_relative_to(self.pathname, unknown)
 
-                for mode, sname in (('fwd', tgt_sys), ('rev', src_sys)):
-                    src_idx_list, dest_idx_list, vec_conns, byobj_conns = \
-                        xfer_dict.setdefault((sname, mode), ([], [], [], []))
+                urelname = self.unknowns.get_promoted_varname(unknown)
+                prelname = self.params.get_promoted_varname(param)
+                byobj = self.unknowns.metadata(urelname).get('pass_by_obj')
 
-                    urelname = self.unknowns.get_promoted_varname(unknown)
-                    prelname = self.params.get_promoted_varname(param)
+                for mode, sname in (('fwd', tgt_sys), ('rev', src_sys)):
+                    src_idx_list, dest_idx_list, vec_conns, byobj_conns, unit_convs = \
+                        xfer_dict.setdefault((sname, mode), ([], [], [], [], []))
 
-                    if self.unknowns.metadata(urelname).get('pass_by_obj'):
+                    if byobj:
                         # rev is for derivs only, so no by_obj passing needed
                         if mode == 'fwd':
                             byobj_conns.append((prelname, urelname))
@@ -1156,14 +1322,21 @@ class Group(System):
                         src_idx_list.append(sidxs)
                         dest_idx_list.append(didxs)
 
-        for (tgt_sys, mode), (srcs, tgts, vec_conns, byobj_conns) in xfer_dict.items():
+                        # unit conversion happens during the transfer
+                        dparams = self.dpmat[var_of_interest]
+                        pmeta = dparams.metadata(prelname)
+                        unitconv = pmeta.get('unit_conv')
+                        if unitconv and len(didxs) and not pmeta.get('remote'):
+                            start, end = dparams._slices[prelname]
+                            unit_convs.append((np.arange(start, end),) + tuple(unitconv))
+
+        plans = []
+        for (tgt_sys, mode), (srcs, tgts, vec_conns, byobj_conns, unit_convs) in \
+                xfer_dict.items():
             src_idxs, tgt_idxs = self.unknowns.merge_idxs(srcs, tgts)
             if vec_conns or byobj_conns:
-                self._data_xfer[(tgt_sys, mode, var_of_interest)] = \
-                    self._impl_factory.create_data_xfer(self.dumat[var_of_interest],
-                                                        self.dpmat[var_of_interest],
-                                                        src_idxs, tgt_idxs,
-                                                        vec_conns, byobj_conns)
+                plans.append(((tgt_sys, mode), (src_idxs, tgt_idxs, vec_conns,
+                                                byobj_conns, unit_convs)))
 
         # create a DataXfer object that combines all of the
         # individual subsystem src_idxs, tgt_idxs, and byobj_conns, so that a 'full'
@@ -1175,19 +1348,21 @@ class Group(System):
             full_tgts = []
             full_flats = []
             full_byobjs = []
-            for (tgt_sys, direction), (srcs, tgts, flats, byobjs) in xfer_dict.items():
+            full_convs = []
+            for (tgt_sys, direction), (srcs, tgts, flats, byobjs, convs) in \
+                    xfer_dict.items():
                 if mode == direction:
                     full_srcs.extend(srcs)
                     full_tgts.extend(tgts)
                     full_flats.extend(flats)
                     full_byobjs.extend(byobjs)
+                    full_convs.extend(convs)
 
             src_idxs, tgt_idxs = self.unknowns.merge_idxs(full_srcs, full_tgts)
-            self._data_xfer[('', mode, var_of_interest)] = \
-                self._impl_factory.create_data_xfer(self.dumat[var_of_interest],
-                                                    self.dpmat[var_of_interest],
-                                                    src_idxs, tgt_idxs,
-                                                    full_flats, full_byobjs)
+            plans.append((('', mode), (src_idxs, tgt_idxs, full_flats,
+                                       full_byobjs, full_convs)))
+
+        return plans
 
     def _transfer_data(self, target_sys='', mode='fwd', deriv=False,
                        var_of_interest=None):
@@ -1243,18 +1418,78 @@ class Group(System):
 
         return ranks
 
-def get_absvarpathnames(var_name, var_dict, dict_name):
+def _probe_apply_linear(comp, voi):
+    """
+    Builds a Jacobian dict for a `Component` that only provides a
+    matrix-free `apply_linear` by applying it in forward mode to each unit
+    vector in its inputs. The derivative vectors of the `Component` are
+    restored afterwards.
+
+    Args
+    ----
+    comp : `Component`
+        The `Component` to linearize.
+
+    voi : str or None
+        Name of the variable of interest that selects the vectors.
+
+    Returns
+    -------
+    dict
+        Dictionary whose keys are tuples of the form ('unknown', 'param')
+        and whose values are ndarrays.
+    """
+    dparams = comp.dpmat[voi]
+    dunknowns = comp.dumat[voi]
+    dresids = comp.drmat[voi]
+
+    vecs = (dparams, dunknowns, dresids)
+    vecvars = [list(vec.get_vecvars()) for vec in vecs]
+    saved = [[vec.flat[name].copy() for name, meta in vvars]
+             for vec, vvars in zip(vecs, vecvars)]
+
+    inputs = [(dparams, name, meta) for name, meta in vecvars[0]]
+    inputs.extend((dunknowns, name, meta) for name, meta in vecvars[1]
+                  if meta.get('state'))
+
+    jac = {}
+    try:
+        for vec, param, meta in inputs:
+            for i in range(meta['size']):
+                for v, vvars in zip(vecs, vecvars):
+                    for name, _ in vvars:
+                        v.flat[name][:] = 0.0
+                vec.flat[param][i] = 1.0
+
+                comp.apply_linear(comp.params, comp.unknowns, dparams,
+                                  dunknowns, dresids, 'fwd')
+
+                for unknown, umeta in vecvars[2]:
+                    J = jac.get((unknown, param))
+                    if J is None:
+                        J = jac[(unknown, param)] = np.zeros((umeta['size'],
+                                                             meta['size']))
+                    J[:, i] = dresids.flat[unknown]
+    finally:
+        for v, vvars, vals in zip(vecs, vecvars, saved):
+            for (name, _), val in zip(vvars, vals):
+                v.flat[name][:] = val
+
+    return jac
+
+
+def get_absvarpathnames(var_name, name_map, dict_name):
     """
     Args
     ----
     var_name : str
         Promoted name of a variable.
 
-    var_dict : dict
-        Dictionary of variable metadata, keyed on absolute name.
+    name_map : dict
+        Mapping of promoted name to a list of absolute names.
 
     dict_name : str
-        Name of var_dict (used for error reporting).
+        Name of the variable dictionary (used for error reporting).
 
     Returns
     -------
@@ -1263,9 +1498,8 @@ def get_absvarpathnames(var_name, var_dict, dict_name):
         variable dictionary that map to the given promoted name.
     """
 
-    pnames = [n for n, m in var_dict.items()
-                   if m['promoted_name'] == var_name]
+    pnames = name_map.get(var_name)
     if not pnames:
         raise KeyError("'%s' not found in %s" % (var_name, dict_name))
 
-    return pnames
+    return list(pnames)
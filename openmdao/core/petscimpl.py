@@ -44,7 +44,8 @@ class PetscImpl(object):
 
     @staticmethod
     def create_data_xfer(src_vec, tgt_vec,
-                         src_idxs, tgt_idxs, vec_conns, byobj_conns):
+                         src_idxs, tgt_idxs, vec_conns, byobj_conns,
+                         unit_convs=()):
         """
         Create an object for performing data transfer between source
         and target vectors.
@@ -73,12 +74,17 @@ class PetscImpl(object):
             Mapping of 'pass by object' variables to the source variables that
             they are connected to.
 
+        unit_convs : list of tuple, optional
+            Unit conversions of the target variables, given as (indices in
+            the local target vector, scale, offset) tuples.
+
         Returns
         -------
         `PetscDataXfer`
             A `PetscDataXfer` object.
         """
-        return PetscDataXfer(src_vec, tgt_vec, src_idxs, tgt_idxs, vec_conns, byobj_conns)
+        return PetscDataXfer(src_vec, tgt_vec, src_idxs, tgt_idxs, vec_conns,
+                             byobj_conns, unit_convs)
 
 
 class PetscSrcVecWrapper(SrcVecWrapper):
@@ -243,11 +249,15 @@ class PetscDataXfer(DataXfer):
     byobj_conns : dict
         mapping of 'pass by object' variables to the source variables that
         they are connected to.
+
+    unit_convs : list of tuple, optional
+        unit conversions of the target variables, given as (indices in the
+        local target vector, scale, offset) tuples.
     """
     def __init__(self, src_vec, tgt_vec,
-                 src_idxs, tgt_idxs, vec_conns, byobj_conns):
+                 src_idxs, tgt_idxs, vec_conns, byobj_conns, unit_convs=()):
         super(PetscDataXfer, self).__init__(src_idxs, tgt_idxs,
-                                            vec_conns, byobj_conns)
+                                            vec_conns, byobj_conns, unit_convs)
 
         self.comm = comm = src_vec.comm
 
@@ -309,7 +319,13 @@ class PetscDataXfer(DataXfer):
                 debug("%s: srcvec = %s\ntgtvec = %s" % (srcvec.pathname,
                                                         srcvec.petsc_vec.array,
                                                         tgtvec.petsc_vec.array))
+            conv_idxs = self._conv_idxs
+            if conv_idxs is not None:
+                saved = tgtvec.vec[conv_idxs]
+                tgtvec.vec[conv_idxs] = saved*self._conv_scale
             self.scatter.scatter(tgtvec.petsc_vec, srcvec.petsc_vec, True, True)
+            if conv_idxs is not None:
+                tgtvec.vec[conv_idxs] = saved
         else:
             # forward mode, source to target including pass_by_object
             if trace:
@@ -321,6 +337,7 @@ class PetscDataXfer(DataXfer):
                                                             srcvec.pathname,
                                                             tgtvec.petsc_vec.array))
             self.scatter.scatter(srcvec.petsc_vec, tgtvec.petsc_vec, False, False)
+            self._convert_units(tgtvec.vec, deriv)
             if trace:
                 debug("scatter done")
 
@@ -21,6 +21,7 @@ from openmdao.core.checks import check_connections
 from openmdao.core.driver import Driver
 from openmdao.core.mpiwrap import MPI, FakeComm, under_mpirun
 from openmdao.core.relevance import Relevance
+from openmdao.core.setupcache import SetupCache, structure_hash
 from openmdao.solvers.run_once import RunOnce
 from openmdao.units.units import get_conversion_tuple
 from openmdao.util.strutil import get_common_ancestor, name_relative_to
@@ -161,7 +162,7 @@ class Problem(System):
 
         return connections
 
-    def setup(self, check=True, out_stream=sys.stdout):
+    def setup(self, check=True, out_stream=sys.stdout, cache_dir=None):
         """Performs all setup of vector storage, data transfer, etc.,
         necessary to perform calculations.
 
@@ -173,6 +174,13 @@ class Problem(System):
 
         out_stream : a file-like object, optional
             Stream where report will be written if check is performed.
+
+        cache_dir : str, optional
+            If given, the connections, unit conversions, relevance,
+            execution orders and data transfer indices are saved to a cache
+            in this directory, keyed by a hash of the structure of the
+            model, and reused by later setups of a model with the same
+            structure. Not used under MPI.
         """
         # if we modify the system tree, we'll need to call _setup_variables
         # and _setup_connections again
@@ -199,11 +207,24 @@ class Problem(System):
         #  }
         params_dict, unknowns_dict = self.root._setup_variables()
 
+        # look for the rest of our setup in the cache, if we have one
+        cache = cached = None
+        if cache_dir is not None and not MPI:
+            key = structure_hash(self, params_dict, unknowns_dict,
+                                 self.driver.params_of_interest(),
+                                 self.driver.outputs_of_interest())
+            cache = SetupCache(cache_dir, key)
+            cached = cache.load()
+
         # collect all connections, both implicit and explicit from
         # anywhere in the tree, and put them in a dict where each key
         # is an absolute param name that maps to the absolute name of
         # a single source.
-        connections = self._setup_connections(params_dict, unknowns_dict)
+        if cached is None:
+            connections = self._setup_connections(params_dict, unknowns_dict)
+        else:
+            connections = cached['connections']
+            self._dangling = cached['dangling']
 
         # TODO: handle any automatic grouping of systems here...
 
@@ -230,7 +251,12 @@ class Problem(System):
             params_dict, unknowns_dict = self.root._setup_variables()
 
         # calculate unit conversions and store in param metadata
-        self._setup_units(connections, params_dict, unknowns_dict)
+        if cached is None:
+            self._setup_units(connections, params_dict, unknowns_dict)
+        else:
+            self._unit_diffs = cached['unit_diffs']
+            for target, unit_conv in cached['unit_convs'].items():
+                params_dict[target]['unit_conv'] = unit_conv
 
         # propagate top level promoted names, unit conversions,
         # and connections down to all subsystems
@@ -276,20 +302,43 @@ class Problem(System):
         mode = self._check_for_matrix_matrix(pois, oois)
 
         relevance = Relevance(self.root, params_dict, unknowns_dict, connections,
-                              pois, oois, mode)
+                              pois, oois, mode,
+                              cache_data=cached and cached['relevance'])
 
         # pass relevance object down to all systems and perform
         # auto ordering
+        auto_orders = {}
         for s in self.root.subsystems(recurse=True, include_self=True):
             s._relevance = relevance
             if isinstance(s, Group):
                 # set auto order if order not already set
                 if not s._order_set:
-                    s.set_order(s.list_auto_order())
+                    order = cached and cached['orders'].get(s.pathname)
+                    if order is None:
+                        order = s.list_auto_order()
+                    auto_orders[s.pathname] = order
+                    s.set_order(order)
+
+        if cached is not None:
+            for group in self.root.subgroups(recurse=True, include_self=True):
+                group._xfer_plans.update(cached['xfer_plans'].get(group.pathname, ()))
 
         # create VecWrappers for all systems in the tree.
         self.root._setup_vectors(param_owners, impl=self._impl)
 
+        if cache is not None and cached is None:
+            cache.save({
+                'connections': connections,
+                'dangling': self._dangling,
+                'unit_diffs': self._unit_diffs,
+                'unit_convs': dict((p, m['unit_conv']) for p, m in params_dict.items()
+                                   if 'unit_conv' in m),
+                'relevance': relevance._get_cache_data(),
+                'orders': auto_orders,
+                'xfer_plans': dict((g.pathname, g._xfer_plans) for g in
+                                   self.root.subgroups(recurse=True, include_self=True)),
+            })
+
         # Prep for case recording
         self._start_recorders()
 
@@ -625,6 +674,11 @@ class Problem(System):
 
         Jfd = root.fd_jacobian(params, unknowns, root.resids, total_derivs=True)
 
+        # map each source to the first of its targets
+        src_to_tgt = {}
+        for tgt, src in iteritems(root.connections):
+            src_to_tgt.setdefault(src, tgt)
+
         def get_fd_ikey(ikey):
             # FD Input keys are a little funny....
             if isinstance(ikey, tuple):
@@ -636,19 +690,14 @@ class Problem(System):
                 # The user sometimes specifies the parameter output
                 # name instead of its target because it is more
                 # convenient
-                for key, val in iteritems(root.connections):
-                    if val == ikey:
-                        fd_ikey = key
-                        break
+                fd_ikey = src_to_tgt.get(ikey, ikey)
 
                 # We need the absolute name, but the fd Jacobian
                 # holds relative promoted inputs
                 if fd_ikey not in params:
-                    for key in params:
-                        meta = params.metadata(key)
-                        if meta['promoted_name'] == fd_ikey:
-                            fd_ikey = meta['pathname']
-                            break
+                    pathnames = root._to_abs_pnames.get(fd_ikey)
+                    if pathnames:
+                        fd_ikey = pathnames[0]
 
             return fd_ikey
 
@@ -795,70 +844,64 @@ class Problem(System):
 
         # If Forward mode, solve linear system for each param
         # If Adjoint mode, solve linear system for each unknown
+        # All of the entries of a voi are solved together as a block of
+        # right-hand sides, so solvers that support it can share work
+        # (e.g., a factorization) between them.
         j = 0
         for params in voi_sets:
             rhs = {}
             voi_idxs = {}
 
-            # Allocate all of our Right Hand Sides for this parallel set.
             for voi in params:
                 vkey = voi if len(params) > 1 else None
 
                 duvec = self.root.dumat[vkey]
-                rhs[vkey] = np.zeros((len(duvec.vec), ))
-
                 voi_srcs[vkey] = voi
                 _, in_idxs = duvec.get_local_idxs(voi, poi_indices)
                 voi_idxs[vkey] = in_idxs
 
             # TODO: check that all vois are the same size!!!
+            ncols = len(in_idxs)
 
-            jbase = j
+            # Allocate all of our Right Hand Sides for this parallel set.
+            for vkey, idxs in voi_idxs.items():
+                rhs[vkey] = np.zeros((len(self.root.dumat[vkey].vec), ncols))
 
-            for i in range(len(in_idxs)):
-                for voi in params:
-                    vkey = voi if len(params) > 1 else None
-                    # only set a 1.0 in the entry if that var is 'owned' by this rank
-                    if self.root._owning_ranks[voi_srcs[vkey]] == iproc:
-                        #print("setting %s to 1.0 in rank %d" % (voi, iproc))
-                        rhs[vkey][voi_idxs[vkey][i]] = 1.0
+                # only set a 1.0 in the entry if that var is 'owned' by this rank
+                if self.root._owning_ranks[voi_srcs[vkey]] == iproc:
+                    rhs[vkey][idxs[:ncols], np.arange(ncols)] = 1.0
 
-                # Solve the linear system
-                dx_mat = root.ln_solver.solve(rhs, root, mode)
+            # Solve the linear system
+            dx_mat = root.ln_solver.solve_multi(rhs, root, mode)
+
+            for param, dx in dx_mat.items():
+                if len(params) == 1:
+                    vkey = None
+                    param = params[0] # if voi is None, params has only one serial entry
+                else:
+                    vkey = param
 
-                for voi in rhs:
-                    rhs[voi][voi_idxs[voi][i]] = 0.0
+                i = 0
+                for item in output_list:
 
-                for param, dx in dx_mat.items():
-                    if len(params) == 1:
-                        vkey = None
-                        param = params[0] # if voi is None, params has only one serial entry
+                    _, out_idxs = self.root.dumat[vkey].get_local_idxs(item,
+                                                                       qoi_indices)
+                    nk = len(out_idxs)
+                    dx_block = dx[out_idxs, :]
+
+                    if return_format == 'dict':
+                        if mode == 'fwd':
+                            J[item][param] = dx_block
+                        else:
+                            J[param][item] = dx_block.T
                     else:
-                        vkey = param
-
-                    i = 0
-                    for item in output_list:
-
-                        _, out_idxs = self.root.dumat[vkey].get_local_idxs(item,
-                                                                           qoi_indices)
-                        nk = len(out_idxs)
-
-                        if return_format == 'dict':
-                            if mode == 'fwd':
-                                if J[item][param] is None:
-                                    J[item][param] = np.zeros((nk, len(in_idxs)))
-                                J[item][param][:, j-jbase] = dx[out_idxs]
-                            else:
-                                if J[param][item] is None:
-                                    J[param][item] = np.zeros((len(in_idxs), nk))
-                                J[param][item][j-jbase, :] = dx[out_idxs]
+                        if mode == 'fwd':
+                            J[i:i+nk, j:j+ncols] = dx_block
                         else:
-                            if mode == 'fwd':
-                                J[i:i+nk, j] = dx[out_idxs]
-                            else:
-                                J[j, i:i+nk] = dx[out_idxs]
-                            i += nk
-                j += 1
+                            J[j:j+ncols, i:i+nk] = dx_block.T
+                        i += nk
+
+            j += ncols
 
         return J
 
@@ -1358,8 +1401,6 @@ def _get_implicit_connections(params_dict, unknowns_dict):
             raise RuntimeError("Promoted name '%s' matches multiple unknowns: %s" %
                                (name, lst))
 
-    prom_unknowns = [m['promoted_name'] for m in unknowns_dict.values()]
-
     connections = {}
     dangling = {}
 
@@ -1368,7 +1409,7 @@ def _get_implicit_connections(params_dict, unknowns_dict):
         if uabs:  # param has a src in unknowns
             for pabs in pabs_list:
                 connections[pabs] = uabs
-        elif prom_name not in prom_unknowns:
+        elif prom_name not in abs_unknowns:
             dangling.setdefault(prom_name, set()).update(pabs_list)
 
     return connections, dangling
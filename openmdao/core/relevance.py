@@ -2,18 +2,51 @@
 
 from __future__ import print_function
 
+from binascii import unhexlify
 from collections import OrderedDict
 import json
 from six import string_types
 
+import numpy as np
 import networkx as nx
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
 
 
 class Relevance(object):
-    """ Object that manages the data connectivity graph for systems."""
+    """ Object that manages the data connectivity graph for systems.
+
+    Args
+    ----
+    group : `Group`
+        The root of the model.
+
+    params_dict : dict
+        Metadata for all params in the model.
+
+    unknowns_dict : dict
+        Metadata for all unknowns in the model.
+
+    connections : dict
+        Maps absolute param names to the absolute name of their source.
+
+    inputs : list
+        Params of interest.
+
+    outputs : list
+        Outputs of interest.
+
+    mode : str
+        Derivative mode, 'fwd' or 'rev'.
+
+    cache_data : dict, optional
+        Graphs and relevance from `_get_cache_data` of an earlier
+        `Relevance` for the same model. If given, they are used instead of
+        being computed again.
+    """
 
     def __init__(self, group, params_dict, unknowns_dict, connections,
-                 inputs, outputs, mode):
+                 inputs, outputs, mode, cache_data=None):
 
         self.params_dict = params_dict
         self.unknowns_dict = unknowns_dict
@@ -48,8 +81,13 @@ class Relevance(object):
 
             self.outputs.append(out)
 
-        self._vgraph, self._sgraph = self._setup_graphs(group, connections)
-        self.relevant = self._get_relevant_vars(self._vgraph)
+        self._vgraph_cache = None
+        if cache_data is None:
+            self._sgraph = self._setup_graphs(group, connections)
+            self._all_vars = set(self._varnames)
+            self.relevant = self._get_relevant_vars()
+        else:
+            self._set_cache_data(cache_data)
 
         if mode == 'fwd':
             self.groups = param_groups
@@ -59,9 +97,21 @@ class Relevance(object):
     def __getitem__(self, name):
         # if name is None, everything is relevant
         if name is None:
-            return set(self._vgraph.nodes())
+            return self._all_vars
         return self.relevant.get(name, [])
 
+    @property
+    def _vgraph(self):
+        """ The variable graph as a networkx DiGraph, built on first use."""
+        if self._vgraph_cache is None:
+            names = self._varnames
+            vgraph = nx.DiGraph()
+            vgraph.add_nodes_from(names)
+            vgraph.add_edges_from((names[u], names[v])
+                                  for u, v in zip(*self._edges))
+            self._vgraph_cache = vgraph
+        return self._vgraph_cache
+
     def is_relevant(self, var_of_interest, varname):
         """ Returns True if a variable is relevant to a particular variable
         of interest.
@@ -108,16 +158,18 @@ class Relevance(object):
         """
         Set up dependency graphs for variables and components in the Problem.
 
+        The variable graph is stored as a list of variable names, a mapping
+        of those names to their indices, and a pair of index arrays holding
+        the source and target of each edge.
+
         Returns
         -------
-        tuple of (nx.DiGraph, nx.DiGraph)
-            The variable graph and the component graph.
-
+        nx.DiGraph
+            The component graph.
         """
         params_dict = self.params_dict
         unknowns_dict = self.unknowns_dict
 
-        vgraph = nx.DiGraph()  # var graph
         sgraph = nx.DiGraph()  # subsystem graph
 
         compins = {}  # maps input vars to components
@@ -142,33 +194,53 @@ class Relevance(object):
             if meta['promoted_name'] != unknown:
                 promote_map[unknown] = meta['promoted_name']
 
+        edges = []
         for target, source in connections.items():
-            vgraph.add_edge(source, target)
+            edges.append((source, target))
             sgraph.add_edge(source.rsplit('.', 1)[0], target.rsplit('.', 1)[0])
 
         # connect inputs to outputs on same component in order to fully
         # connect the variable graph.
         for comp, inputs in compins.items():
+            outs = compouts.get(comp, ())
             for inp in inputs:
-                for out in compouts.get(comp, ()):
-                    vgraph.add_edge(inp, out)
-
-        # now collapse any var nodes with implicit connections
-        nx.relabel_nodes(vgraph, promote_map, copy=False)
-
-        # remove any self edges created by the relabeling
-        for u, v in vgraph.edges():
-            if u == v:
-                vgraph.remove_edge(u, v)
-
-        return vgraph, sgraph
-
-    def _get_relevant_vars(self, g):
+                for out in outs:
+                    edges.append((inp, out))
+
+        # collapse any var nodes with implicit connections, dropping the
+        # self edges that creates
+        names = []
+        idxs = {}
+        srcs = []
+        tgts = []
+        for u, v in edges:
+            u = promote_map.get(u, u)
+            v = promote_map.get(v, v)
+            for name in (u, v):
+                if name not in idxs:
+                    idxs[name] = len(names)
+                    names.append(name)
+            if u != v:
+                srcs.append(idxs[u])
+                tgts.append(idxs[v])
+
+        self._varnames = names
+        self._var_idxs = idxs
+        self._edges = (np.array(srcs, dtype=int), np.array(tgts, dtype=int))
+
+        return sgraph
+
+    def _get_relevant_vars(self):
         """
-        Args
-        ----
-        g : nx.DiGraph
-            A graph of variable dependencies.
+        Computes the relevance of every variable to every variable of
+        interest in one pass over the variable graph.
+
+        Reachability is propagated as bitsets, with one bit per input and
+        per output, over the graph with its strongly connected components
+        collapsed, in topological order.  A variable is relevant to an
+        output if it depends on some input and the output depends on it, and
+        relevant to an input if it depends on the input and some output
+        depends on it.
 
         Returns
         -------
@@ -176,27 +248,112 @@ class Relevance(object):
             Dictionary that maps a variable name to all other variables in the
             graph that are relevant to it.
         """
-        succs = {}
-        for nodes in self.inputs:
-            for node in nodes:
-                succs[node] = set([v for u, v in nx.dfs_edges(g, node)])
-                succs[node].add(node)
+        inputs = [name for names in self.inputs for name in names]
+        outputs = [name for names in self.outputs for name in names]
+        ninputs = len(inputs)
 
         relevant = {}
-        grev = g.reverse()
-        for nodes in self.outputs:
-            for node in nodes:
-                relevant[node] = set()
-                preds = set([v for u, v in nx.dfs_edges(grev, node)])
-                preds.add(node)
-                for inps in self.inputs:
-                    for inp in inps:
-                        common = preds.intersection(succs[inp])
-                        relevant[node].update(common)
-                        relevant.setdefault(inp, set()).update(common)
+        if outputs:
+            for name in inputs:
+                relevant[name] = set()
+        for name in outputs:
+            relevant[name] = set()
+
+        # nothing is relevant unless there are both inputs and outputs
+        nvars = len(self._varnames)
+        if nvars == 0 or not (inputs and outputs):
+            return relevant
+
+        srcs, tgts = self._edges
+        graph = csr_matrix((np.ones(len(srcs)), (srcs, tgts)), shape=(nvars, nvars))
+        ncomps, labels = connected_components(graph, directed=True,
+                                              connection='strong')
+        order, succs = _condensed_order(ncomps, labels[srcs], labels[tgts])
+
+        var_idxs = self._var_idxs
+        fwd = [0]*ncomps
+        for i, name in enumerate(inputs):
+            if name in var_idxs:
+                fwd[labels[var_idxs[name]]] |= 1 << i
+        for c in order:
+            bits = fwd[c]
+            if bits:
+                for d in succs[c]:
+                    fwd[d] |= bits
+
+        rev = [0]*ncomps
+        for i, name in enumerate(outputs):
+            if name in var_idxs:
+                rev[labels[var_idxs[name]]] |= 1 << i
+        for c in reversed(order):
+            bits = rev[c]
+            for d in succs[c]:
+                bits |= rev[d]
+            rev[c] = bits
+
+        # A component is relevant to the outputs it reaches if some input
+        # reaches it, and to the inputs that reach it if it reaches some
+        # output. Pack those bitsets into a byte matrix, one row per
+        # component, most significant byte first.
+        nbytes = (ninputs + len(outputs) + 7) // 8
+        masks = ['%0*x' % (2*nbytes, f | (r << ninputs) if f and r else 0)
+                 for f, r in zip(fwd, rev)]
+        bits = np.frombuffer(unhexlify(''.join(masks).encode('ascii')),
+                             dtype=np.uint8).reshape(ncomps, nbytes)
+
+        names = np.empty(nvars, dtype=object)
+        names[:] = self._varnames
+        for i, name in enumerate(inputs + outputs):
+            comp_bits = (bits[:, nbytes - 1 - i // 8] >> (i % 8)) & 1
+            relevant[name].update(names[comp_bits[labels].astype(bool)])
 
         return relevant
 
+    def _get_cache_data(self):
+        """
+        Returns
+        -------
+        dict
+            The graphs and relevance of this `Relevance`, with the
+            relevant variables stored as arrays of indices into the list of
+            variable names.
+        """
+        idxs = self._var_idxs
+        relevant = {}
+        for name, names in self.relevant.items():
+            relevant[name] = np.array(sorted(idxs[n] for n in names), dtype=int)
+
+        return {
+            'varnames': self._varnames,
+            'edges': self._edges,
+            'relevant': relevant,
+            'sys_nodes': self._sgraph.nodes(),
+            'sys_edges': self._sgraph.edges(),
+        }
+
+    def _set_cache_data(self, data):
+        """
+        Restores the graphs and relevance saved by `_get_cache_data`.
+
+        Args
+        ----
+        data : dict
+            The cached data.
+        """
+        self._sgraph = nx.DiGraph()
+        self._sgraph.add_nodes_from(data['sys_nodes'])
+        self._sgraph.add_edges_from(data['sys_edges'])
+
+        self._varnames = names = data['varnames']
+        self._var_idxs = dict((name, i) for i, name in enumerate(names))
+        self._edges = tuple(data['edges'])
+        self._all_vars = set(names)
+
+        names = np.empty(len(names), dtype=object)
+        names[:] = self._varnames
+        self.relevant = dict((name, set(names[idxs]))
+                             for name, idxs in data['relevant'].items())
+
     def json_dependencies(self):
         """ Returns a json representation of a model's data dependency graph.
 
@@ -224,3 +381,50 @@ class Relevance(object):
         }
 
         return json.dumps(dct)
+
+
+def _condensed_order(ncomps, srcs, tgts):
+    """
+    Orders the strongly connected components of the variable graph
+    topologically.
+
+    Args
+    ----
+    ncomps : int
+        Number of components.
+
+    srcs : ndarray of int
+        Component of the source of each edge. Edges within a component are
+        ignored.
+
+    tgts : ndarray of int
+        Component of the target of each edge.
+
+    Returns
+    -------
+    tuple of (list, list)
+        The components in topological order, and the list of successors of
+        each component.
+    """
+    keep = srcs != tgts
+    edges = np.unique(srcs[keep]*ncomps + tgts[keep])
+    srcs = (edges // ncomps).tolist()
+    tgts = (edges % ncomps).tolist()
+
+    succs = [[] for i in range(ncomps)]
+    indegree = [0]*ncomps
+    for u, v in zip(srcs, tgts):
+        succs[u].append(v)
+        indegree[v] += 1
+
+    ready = [c for c in range(ncomps) if indegree[c] == 0]
+    order = []
+    while ready:
+        c = ready.pop()
+        order.append(c)
+        for d in succs[c]:
+            indegree[d] -= 1
+            if indegree[d] == 0:
+                ready.append(d)
+
+    return order, succs
@@ -0,0 +1,217 @@
+""" Class definition for SetupCache, an on-disk cache of the parts of
+`Problem.setup` that only depend on the structure of the model."""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+from six import iteritems, string_types
+
+# Bump this whenever the layout of the cached data changes.
+_CACHE_VERSION = 1
+
+# Metadata entries that affect setup. Values and everything else that can
+# change without changing the structure of the model are left out.
+_STRUCTURAL_META = ('promoted_name', 'size', 'shape', 'units', 'pass_by_obj',
+                    'state', 'src_indices', 'remote')
+
+
+class SetupCache(object):
+    """
+    An on-disk cache of the connections, unit conversions, relevance,
+    execution orders and data transfer index arrays computed by
+    `Problem.setup`.
+
+    Each model structure is stored in its own NumPy .npz file, named after
+    the hash of the structure. The index arrays are stored as arrays in the
+    file and everything else as a JSON manifest.
+
+    Args
+    ----
+    cache_dir : str
+        Directory where the cache files are kept. It is created if it
+        doesn't exist.
+
+    key : str
+        Hash of the model structure, from `structure_hash`.
+    """
+
+    def __init__(self, cache_dir, key):
+        self.cache_dir = cache_dir
+        self.key = key
+        self.path = os.path.join(cache_dir, 'setup_%s.npz' % key)
+
+    def load(self):
+        """
+        Reads the cached setup data for our model structure.
+
+        Returns
+        -------
+        dict or None
+            The cached data, or None if there isn't any (or it can't be
+            read).
+        """
+        if not os.path.isfile(self.path):
+            return None
+
+        try:
+            with np.load(self.path) as npz:
+                arrays = dict((name, npz[name]) for name in npz.files)
+        except Exception:
+            return None
+
+        manifest = json.loads(str(arrays.pop('__manifest__')))
+        if manifest.get('version') != _CACHE_VERSION:
+            return None
+
+        return _decode(manifest['data'], arrays)
+
+    def save(self, data):
+        """
+        Writes the setup data for our model structure to the cache.
+
+        Args
+        ----
+        data : dict
+            The data to cache. It may contain dicts, lists, tuples, sets,
+            strings, numbers, None and ndarrays.
+        """
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+        arrays = {}
+        manifest = {'version': _CACHE_VERSION, 'data': _encode(data, arrays)}
+        arrays['__manifest__'] = np.array(json.dumps(manifest))
+
+        # write to a temporary file first, so a reader never sees a
+        # partially written cache file.
+        tmp = os.path.join(self.cache_dir, 'tmp_%d_%s.npz' % (os.getpid(), self.key))
+        np.savez(tmp, **arrays)
+        try:
+            os.rename(tmp, self.path)
+        except OSError:
+            os.remove(self.path)
+            os.rename(tmp, self.path)
+
+
+def structure_hash(problem, params_dict, unknowns_dict, pois, oois):
+    """
+    Computes a hash of everything that the cached part of setup depends
+    on: the system tree, the structural metadata of the variables, the
+    connections declared in each `Group` and the variables of interest.
+
+    Args
+    ----
+    problem : `Problem`
+        The `Problem` being set up.
+
+    params_dict : dict
+        Metadata for all params in the model, keyed on absolute pathname.
+
+    unknowns_dict : dict
+        Metadata for all unknowns in the model, keyed on absolute pathname.
+
+    pois : list of tuple
+        Params of interest.
+
+    oois : list of tuple
+        Outputs of interest.
+
+    Returns
+    -------
+    str
+        Hex digest of the structure.
+    """
+    systems = []
+    for sub in problem.root.subsystems(recurse=True, include_self=True):
+        entry = [sub.pathname, type(sub).__name__, sub._promotes]
+        if hasattr(sub, '_src'):
+            entry.append(sorted(sub._src.items()))
+            entry.append(sorted(sub._src_idxs.items()))
+        systems.append(entry)
+
+    variables = []
+    for vardict in (params_dict, unknowns_dict):
+        for pathname, meta in iteritems(vardict):
+            val = meta.get('val')
+            variables.append([pathname, type(val).__name__, str(getattr(val, 'dtype', ''))] +
+                             [meta.get(name) for name in _STRUCTURAL_META])
+
+    structure = [problem._impl.__name__, systems, variables,
+                 list(pois), list(oois)]
+
+    dump = json.dumps(structure, default=_to_json)
+    return hashlib.sha1(dump.encode('utf-8')).hexdigest()
+
+
+def _to_json(obj):
+    """ Converts the objects that show up in metadata to something that
+    json can dump."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return repr(obj)
+
+
+def _encode(obj, arrays):
+    """
+    Converts data into something json can dump, moving any arrays into
+    `arrays` and tagging containers json can't represent.
+    """
+    if isinstance(obj, np.ndarray):
+        name = 'a%d' % len(arrays)
+        arrays[name] = obj
+        return {'__array__': name}
+    if isinstance(obj, dict):
+        # dicts of strings, like the connections, are much faster to load
+        # as a pair of string arrays.
+        if obj and all(isinstance(k, string_types) and isinstance(v, string_types)
+                       for k, v in iteritems(obj)):
+            return {'__strdict__': [_encode(np.array(list(obj.keys())), arrays),
+                                    _encode(np.array(list(obj.values())), arrays)]}
+        return {'__dict__': [[_encode(k, arrays), _encode(v, arrays)]
+                             for k, v in iteritems(obj)]}
+    if isinstance(obj, tuple):
+        return {'__tuple__': [_encode(v, arrays) for v in obj]}
+    if isinstance(obj, (set, frozenset)):
+        return {'__set__': [_encode(v, arrays) for v in obj]}
+    if isinstance(obj, list):
+        if obj and all(isinstance(v, string_types) for v in obj):
+            return {'__strlist__': _encode(np.array(obj), arrays)}
+        # same for lists of pairs of strings, like the connections in a
+        # data transfer.
+        if obj and all(isinstance(v, tuple) and len(v) == 2 and
+                       isinstance(v[0], string_types) and
+                       isinstance(v[1], string_types) for v in obj):
+            return {'__strpairs__': _encode(np.array(obj), arrays)}
+        return [_encode(v, arrays) for v in obj]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return obj
+
+
+def _decode(obj, arrays):
+    """ Reverses `_encode`."""
+    if isinstance(obj, list):
+        return [_decode(v, arrays) for v in obj]
+    if isinstance(obj, dict):
+        if '__array__' in obj:
+            return arrays[obj['__array__']]
+        if '__strlist__' in obj:
+            return _decode(obj['__strlist__'], arrays).tolist()
+        if '__strpairs__' in obj:
+            return [tuple(pair) for pair in _decode(obj['__strpairs__'], arrays).tolist()]
+        if '__strdict__' in obj:
+            keys, values = obj['__strdict__']
+            return dict(zip(_decode(keys, arrays).tolist(),
+                            _decode(values, arrays).tolist()))
+        if '__dict__' in obj:
+            return dict((_decode(k, arrays), _decode(v, arrays))
+                        for k, v in obj['__dict__'])
+        if '__tuple__' in obj:
+            return tuple(_decode(v, arrays) for v in obj['__tuple__'])
+        if '__set__' in obj:
+            return set(_decode(v, arrays) for v in obj['__set__'])
+    return obj
@@ -1,6 +1,8 @@
 """ Base class for all systems in OpenMDAO."""
 
 import sys
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 from collections import OrderedDict
 from fnmatch import fnmatch
 from itertools import chain
@@ -11,6 +13,7 @@ import numpy as np
 from openmdao.core.mpiwrap import MPI
 from openmdao.core.options import OptionsDictionary
 from openmdao.core.vecwrapper import PlaceholderVecWrapper
+from openmdao.util.procutil import fork_available, fork_map
 
 
 class System(object):
@@ -24,6 +27,12 @@ class System(object):
         self._params_dict = OrderedDict()
         self._unknowns_dict = OrderedDict()
 
+        # indexes from promoted names to lists of absolute pathnames and
+        # from absolute pathnames to promoted names, built during setup
+        self._to_abs_pnames = {}
+        self._to_abs_unames = {}
+        self._to_prom_name = {}
+
         # specify which variables are promoted up to the parent.  Wildcards
         # are allowed.
         self._promotes = ()
@@ -56,6 +65,15 @@ class System(object):
         opt.add_option("step_type", 'absolute',
                        values=['absolute', 'relative'],
                        desc='Set to absolute, relative')
+        opt.add_option('executor', 'serial',
+                       values=['serial', 'thread', 'process'],
+                       desc="Run the finite difference steps one at a time "
+                       "(serial), or concurrently in a pool of threads "
+                       "(thread) or forked processes (process). Threads are "
+                       "only used for Components.")
+        opt.add_option('num_workers', 0, low=0,
+                       desc="Number of workers in the thread or process pool. "
+                       "Set to 0 to use one worker per CPU.")
 
         self._relevance = None
         self._impl_factory = None
@@ -263,6 +281,29 @@ class System(object):
         """
         self.comm = comm
 
+    def _setup_prom_map(self, params_dict, unknowns_dict):
+        """
+        Builds the indexes between the promoted names of our variables and
+        their absolute pathnames.
+
+        Args
+        ----
+        params_dict : dict
+            Metadata for our params, keyed on absolute pathname.
+
+        unknowns_dict : dict
+            Metadata for our unknowns, keyed on absolute pathname.
+        """
+        to_prom = {}
+        to_abs = ({}, {})
+        for names, vardict in zip(to_abs, (params_dict, unknowns_dict)):
+            for pathname, meta in vardict.items():
+                names.setdefault(meta['promoted_name'], []).append(pathname)
+                to_prom[pathname] = meta['promoted_name']
+
+        self._to_abs_pnames, self._to_abs_unames = to_abs
+        self._to_prom_name = to_prom
+
     def _set_vars_as_remote(self):
         """
         Set 'remote' attribute in metadata of all variables for this subsystem.
@@ -322,46 +363,25 @@ class System(object):
         step_type = self.fd_options.get('step_type', step_type)
 
         jac = {}
-        cache2 = None
 
         # Prepare for calculating partial derivatives or total derivatives
         if total_derivs == False:
-            run_model = self.apply_nonlinear
-            cache1 = resids.vec.copy()
-            resultvec = resids
             states = [name for name, meta in self.unknowns.items() if meta.get('state')]
         else:
-            run_model = self.solve_nonlinear
-            cache1 = unknowns.vec.copy()
-            resultvec = unknowns
             states = []
 
-        # Compute gradient for this param or state.
+        # Work out the step for each entry of each param or state first, so
+        # the steps can be run either serially or concurrently.
+        fd_steps = []
         for p_name in chain(fd_params, states):
 
-            if p_name in states:
-                inputs = unknowns
-            else:
-                inputs = params
-
-            target_input = inputs.flat[p_name]
+            inputs, target_input = self._get_fd_target(p_name, params, unknowns,
+                                                       states)
 
-            # If our input is connected to a Paramcomp, then we need to twiddle
-            # the unknowns vector instead of the params vector.
-            param_src = self.connections.get(p_name)
-            if param_src is not None:
-
-                # Have to convert to promoted name to key into unknowns
-                if param_src not in self.unknowns:
-                    param_src = self.unknowns.get_promoted_varname(param_src)
-
-                target_input = unknowns.flat[param_src]
-
-            mydict = {}
-            for val in self._params_dict.values():
-                if val['promoted_name'] == p_name:
-                    mydict = val
-                    break
+            if inputs is params:
+                mydict = params.metadata(p_name)
+            else:
+                mydict = {}
 
             # Local settings for this var trump all
             fdstep = mydict.get('fd_step_size', step_size)
@@ -387,57 +407,204 @@ class System(object):
                 else:
                     step = fdstep
 
-                if fdform == 'forward':
+                fd_steps.append((p_name, idx, step, fdform))
+
+        executor = self.fd_options['executor']
+        nworkers = self.fd_options['num_workers']
+        if nworkers == 0:
+            nworkers = multiprocessing.cpu_count()
+        nworkers = min(nworkers, len(fd_steps))
+
+        # Running a Group in threads isn't safe, because its subsystems
+        # operate on their own (shared) vectors. Forking needs a platform
+        # that supports it, and doesn't mix with MPI.
+        if nworkers < 2 or MPI or (executor == 'thread' and total_derivs) or \
+           (executor == 'process' and not fork_available()):
+            executor = 'serial'
+
+        args = (fd_unknowns, states, total_derivs)
+        if executor == 'serial':
+            columns = self._fd_steps(fd_steps, params, unknowns, resids, *args)
+        else:
+            chunks = [fd_steps[i::nworkers] for i in range(nworkers)]
+
+            if executor == 'thread':
+                # Each thread gets its own copy of our vectors.
+                pool = ThreadPool(nworkers)
+                try:
+                    results = pool.map(lambda chunk: self._fd_steps(chunk,
+                                                                    params._clone(),
+                                                                    unknowns._clone(),
+                                                                    resids._clone(),
+                                                                    *args),
+                                       chunks)
+                finally:
+                    pool.close()
+                    pool.join()
+            else:
+                # Forked processes get a copy of everything, so only the
+                # chunks are sent to them.
+                results = fork_map(lambda chunk: self._fd_steps(chunk, params,
+                                                                unknowns, resids,
+                                                                *args),
+                                   chunks, nworkers)
+
+            # put the columns back in their original order
+            columns = [None]*len(fd_steps)
+            for i, result in enumerate(results):
+                columns[i::nworkers] = result
+
+        for (p_name, idx, step, fdform), column in zip(fd_steps, columns):
+            for u_name, val in zip(fd_unknowns, column):
+                jac[u_name, p_name][:, idx] = val
+
+        return jac
+
+    def _get_fd_target(self, p_name, params, unknowns, states):
+        """
+        Returns the vector holding the given param or state and the flat
+        array that should be perturbed to finite difference it.
+
+        Args
+        ----
+        p_name : str
+            Name of the param or state.
+
+        params : `VecWrapper`
+            `VecWrapper` containing parameters. (p)
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+
+        states : list of str
+            Names of the states that are being finite differenced.
+
+        Returns
+        -------
+        tuple of (`VecWrapper`, ndarray)
+        """
+        if p_name in states:
+            inputs = unknowns
+        else:
+            inputs = params
+
+        target_input = inputs.flat[p_name]
+
+        # If our input is connected to a Paramcomp, then we need to twiddle
+        # the unknowns vector instead of the params vector.
+        param_src = self.connections.get(p_name)
+        if param_src is not None:
+
+            # Have to convert to promoted name to key into unknowns
+            if param_src not in self.unknowns:
+                param_src = self.unknowns.get_promoted_varname(param_src)
+
+            target_input = unknowns.flat[param_src]
+
+        return inputs, target_input
+
+    def _fd_steps(self, fd_steps, params, unknowns, resids, fd_unknowns,
+                  states, total_derivs):
+        """
+        Runs the given finite difference steps and returns the resulting
+        Jacobian columns. The vectors are restored to their original state
+        afterwards.
+
+        Args
+        ----
+        fd_steps : list of tuple
+            Tuples of the form (param_name, index, step, form).
+
+        params : `VecWrapper`
+            `VecWrapper` containing parameters. (p)
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+
+        resids : `VecWrapper`
+            `VecWrapper` containing residuals. (r)
+
+        fd_unknowns : list of str
+            Names of the unknowns to return derivatives for.
 
-                    target_input[idx] += step
+        states : list of str
+            Names of the states that are being finite differenced.
 
-                    run_model(params, unknowns, resids)
+        total_derivs : bool
+            Set to true to calculate total derivatives. Otherwise, partial
+            derivatives are returned.
 
-                    target_input[idx] -= step
+        Returns
+        -------
+        list
+            For each step, a list with the derivatives of each of the
+            fd_unknowns.
+        """
+        if total_derivs == False:
+            run_model = self.apply_nonlinear
+            resultvec = resids
+        else:
+            run_model = self.solve_nonlinear
+            resultvec = unknowns
 
-                    # delta resid is delta unknown
-                    resultvec.vec[:] -= cache1
-                    resultvec.vec[:] *= (1.0/step)
+        cache1 = resultvec.vec.copy()
+        cache2 = None
 
-                elif fdform == 'backward':
+        columns = []
+        for p_name, idx, step, fdform in fd_steps:
+            target_input = self._get_fd_target(p_name, params, unknowns,
+                                               states)[1]
 
-                    target_input[idx] -= step
+            if fdform == 'forward':
 
-                    run_model(params, unknowns, resids)
+                target_input[idx] += step
 
-                    target_input[idx] += step
+                run_model(params, unknowns, resids)
 
-                    # delta resid is delta unknown
-                    resultvec.vec[:] -= cache1
-                    resultvec.vec[:] *= (-1.0/step)
+                target_input[idx] -= step
 
-                elif fdform == 'central':
+                # delta resid is delta unknown
+                resultvec.vec[:] -= cache1
+                resultvec.vec[:] *= (1.0/step)
 
-                    target_input[idx] += step
+            elif fdform == 'backward':
 
-                    run_model(params, unknowns, resids)
-                    cache2 = resultvec.vec.copy()
+                target_input[idx] -= step
 
-                    target_input[idx] -= step
-                    resultvec.vec[:] = cache1
+                run_model(params, unknowns, resids)
 
-                    target_input[idx] -= step
+                target_input[idx] += step
 
-                    run_model(params, unknowns, resids)
+                # delta resid is delta unknown
+                resultvec.vec[:] -= cache1
+                resultvec.vec[:] *= (-1.0/step)
 
-                    # central difference formula
-                    resultvec.vec[:] -= cache2
-                    resultvec.vec[:] *= (-0.5/step)
+            elif fdform == 'central':
 
-                    target_input[idx] += step
+                target_input[idx] += step
 
-                for u_name in fd_unknowns:
-                    jac[u_name, p_name][:, idx] = resultvec.flat[u_name]
+                run_model(params, unknowns, resids)
+                cache2 = resultvec.vec.copy()
 
-                # Restore old residual
+                target_input[idx] -= step
                 resultvec.vec[:] = cache1
 
-        return jac
+                target_input[idx] -= step
+
+                run_model(params, unknowns, resids)
+
+                # central difference formula
+                resultvec.vec[:] -= cache2
+                resultvec.vec[:] *= (-0.5/step)
+
+                target_input[idx] += step
+
+            columns.append([resultvec.flat[u_name].copy() for u_name in fd_unknowns])
+
+            # Restore old residual
+            resultvec.vec[:] = cache1
+
+        return columns
 
     def _apply_linear_jac(self, params, unknowns, dparams, dunknowns, dresids, mode):
         """ See apply_linear. This method allows the framework to override
@@ -547,7 +714,7 @@ class System(object):
         relevance = self._relevance
 
         # map promoted name in parent to corresponding promoted name in this view
-        umap = _get_relname_map(parent.unknowns, unknowns_dict, self.pathname)
+        umap = _get_relname_map(parent.unknowns, self._to_prom_name, self.pathname)
 
         if voi is None:
             self.unknowns = parent.unknowns.get_view(self.pathname, comm, umap, relevance,
@@ -639,15 +806,16 @@ class System(object):
             return '.'.join((self.pathname, name))
         return name
 
-def _get_relname_map(unknowns, unknowns_dict, child_name):
+def _get_relname_map(unknowns, to_prom_name, child_name):
     """
     Args
     ----
     unknowns : `VecWrapper`
         A dict-like object containing variables keyed using promoted names.
 
-    unknowns_dict : `OrderedDict`
-        An ordered mapping of absolute variable name to its metadata.
+    to_prom_name : dict
+        A mapping of absolute variable name to its promoted name in the
+        child.
 
     child_name : str
         The pathname of the child for which to get promoted name.
@@ -659,17 +827,10 @@ def _get_relname_map(unknowns, unknowns_dict, child_name):
         the corresponding promoted name in the child.
     """
     # unknowns is keyed on promoted name relative to the parent system
-    # unknowns_dict is keyed on absolute pathname
     umap = {}
     for rel, meta in unknowns.items():
         abspath = meta['pathname']
         if abspath.startswith(child_name+'.'):
-            for m in unknowns_dict.values():
-                if abspath == m['pathname']:
-                    newrel = m['promoted_name']
-                    break
-            else:
-                newrel = rel
-            umap[rel] = newrel
+            umap[rel] = to_prom_name.get(abspath, rel)
 
     return umap
@@ -15,8 +15,9 @@ from openmdao.core.vecwrapper import SrcVecWrapper
 
 from openmdao.components.paramcomp import ParamComp
 from openmdao.components.execcomp import ExecComp
+from openmdao.test.converge_diverge import ConvergeDivergeGroups
 from openmdao.test.simplecomps import SimpleArrayComp, \
-                                      SimpleImplicitComp
+                                      SimpleImplicitComp, ArrayComp2D
 from openmdao.test.paraboloid import Paraboloid
 from openmdao.test.testutil import assert_equal_jacobian, assert_rel_error
 
@@ -544,6 +545,54 @@ class CompFDinSystemTestCase(unittest.TestCase):
         J = prob.calc_gradient(['p12.x2'], unknowns_list, return_format='dict')
         self.assertLess(J['comp.f_xy']['p12.x2'][0][0], 0.0)
 
+    def test_fd_options_executor(self):
+
+        prob = Problem()
+        prob.root = Group()
+        comp = prob.root.add('comp', ArrayComp2D())
+        prob.root.add('p1', ParamComp('x', np.array([[1.0, 2.0], [3.0, 4.0]])))
+        prob.root.connect('p1.x', 'comp.x')
+
+        comp.fd_options['force_fd'] = True
+        comp.fd_options['form'] = 'central'
+
+        prob.setup(check=False)
+        prob.run()
+
+        Jbase = comp.jacobian(comp.params, comp.unknowns, comp.resids)[('y', 'x')]
+
+        for executor in ('serial', 'thread', 'process'):
+            comp.fd_options['executor'] = executor
+            comp.fd_options['num_workers'] = 3
+
+            J = prob.calc_gradient(['p1.x'], ['comp.y'], mode='fwd',
+                                   return_format='dict')
+            assert_rel_error(self, np.linalg.norm(J['comp.y']['p1.x'] - Jbase),
+                             0.0, 1e-6)
+
+            # the component's vectors must not have been disturbed
+            assert_rel_error(self, comp.params['x'][1][0], 3.0, 1e-15)
+            assert_rel_error(self, prob['comp.y'][0][0], 41.0, 1e-15)
+
+    def test_fd_options_executor_group(self):
+
+        prob = Problem()
+        prob.root = ConvergeDivergeGroups()
+        prob.root.sub1.fd_options['force_fd'] = True
+        prob.root.sub1.fd_options['executor'] = 'process'
+        prob.root.sub1.fd_options['num_workers'] = 2
+
+        prob.setup(check=False)
+        prob.run()
+
+        J = prob.calc_gradient(['p.x'], ['comp7.y1'], mode='fwd', return_format='dict')
+        assert_rel_error(self, J['comp7.y1']['p.x'][0][0], -40.75, 1e-6)
+
+        J = prob.calc_gradient(['p.x'], ['comp7.y1'], mode='rev', return_format='dict')
+        assert_rel_error(self, J['comp7.y1']['p.x'][0][0], -40.75, 1e-6)
+
+        assert_rel_error(self, prob['comp7.y1'], -102.7, 1e-6)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+import numpy as np
+
+from openmdao.core.dataxfer import DataXfer, _transfer_plan
+
+
+class _Vec(object):
+    """ Just enough of a VecWrapper for a transfer."""
+    def __init__(self, vec):
+        self.vec = vec
+
+
+class TestDataXfer(unittest.TestCase):
+
+    def test_plan(self):
+        src_idxs = np.concatenate((np.arange(10, 110), [3, 7, 5], np.arange(200, 270)))
+        tgt_idxs = np.concatenate((np.arange(0, 100), [100, 101, 102], np.arange(103, 173)))
+
+        slices, srcs, tgts = _transfer_plan(src_idxs, tgt_idxs)
+
+        self.assertEqual(slices, [(slice(10, 110), slice(0, 100)),
+                                  (slice(200, 270), slice(103, 173))])
+        self.assertEqual(list(srcs), [3, 7, 5])
+        self.assertEqual(list(tgts), [100, 101, 102])
+
+        # a short run is a slice if it's the whole transfer
+        slices, srcs, tgts = _transfer_plan(np.arange(4, 7), np.arange(0, 3))
+        self.assertEqual(slices, [(slice(4, 7), slice(0, 3))])
+        self.assertEqual(srcs, None)
+
+        # runs must be contiguous in both the source and the target
+        slices, srcs, tgts = _transfer_plan(np.arange(100), np.arange(200, 0, -2))
+        self.assertEqual(slices, [])
+        self.assertEqual(len(srcs), 100)
+
+        self.assertEqual(_transfer_plan([], []), ([], None, None))
+
+    def test_transfer(self):
+        np.random.seed(11)
+        src_idxs = np.concatenate((np.random.permutation(50), np.arange(50, 250),
+                                   np.random.permutation(np.arange(250, 300))))
+        tgt_idxs = np.arange(300)[::-1].copy()
+        tgt_idxs[50:250] = np.arange(20, 220)
+        tgt_idxs[:20] = np.arange(280, 300)
+        tgt_idxs[250:] = np.random.permutation(np.concatenate((np.arange(20),
+                                                               np.arange(220, 250))))
+
+        xfer = DataXfer(src_idxs, tgt_idxs, [], [])
+        self.assertEqual(len(xfer._fwd_slices), 1)
+
+        src = _Vec(np.random.random(300))
+        tgt = _Vec(np.zeros(300))
+        xfer.transfer(src, tgt, deriv=True)
+
+        expected = np.zeros(300)
+        expected[tgt_idxs] = src.vec[src_idxs]
+        self.assertTrue(np.all(tgt.vec == expected))
+
+    def test_rev_transfer(self):
+        np.random.seed(12)
+
+        # unique sources, accumulated through the forward plan
+        src_idxs = np.concatenate((np.arange(100, 200), np.random.permutation(100)))
+        tgt_idxs = np.random.permutation(200)
+        xfer = DataXfer(src_idxs, tgt_idxs, [], [])
+        self.assertEqual(xfer._rev_inverse, None)
+
+        src = _Vec(np.random.random(200))
+        tgt = _Vec(np.random.random(200))
+        expected = src.vec.copy()
+        np.add.at(expected, src_idxs, tgt.vec[tgt_idxs])
+        xfer.transfer(src, tgt, mode='rev', deriv=True)
+        np.testing.assert_allclose(src.vec, expected, rtol=1e-15)
+
+        # sources with fan-out
+        src_idxs = np.concatenate((np.arange(100), np.random.randint(0, 100, 150)))
+        tgt_idxs = np.random.permutation(250)
+        xfer = DataXfer(src_idxs, tgt_idxs, [], [])
+        self.assertEqual(len(xfer._rev_uniq_srcs), 100)
+
+        src = _Vec(np.random.random(100))
+        tgt = _Vec(np.random.random(250))
+        expected = src.vec.copy()
+        np.add.at(expected, src_idxs, tgt.vec[tgt_idxs])
+        xfer.transfer(src, tgt, mode='rev', deriv=True)
+        np.testing.assert_allclose(src.vec, expected, rtol=1e-14)
+
+    def test_unit_conversion(self):
+        src_idxs = np.arange(10)
+        tgt_idxs = np.arange(10)[::-1].copy()
+        xfer = DataXfer(src_idxs, tgt_idxs, [], [],
+                        [(np.arange(2, 5), 2.0, 1.0), (np.array([8]), 0.5, 0.0)])
+
+        scale = np.ones(10)
+        scale[2:5] = 2.0
+        scale[8] = 0.5
+        offset = np.zeros(10)
+        offset[2:5] = 1.0
+
+        src = _Vec(np.random.random(10))
+        tgt = _Vec(np.zeros(10))
+        xfer.transfer(src, tgt)
+        expected = scale*(src.vec[::-1] + offset)
+        np.testing.assert_allclose(tgt.vec, expected, rtol=1e-15)
+
+        # derivatives only get the scale
+        xfer.transfer(src, tgt, deriv=True)
+        np.testing.assert_allclose(tgt.vec, scale*src.vec[::-1], rtol=1e-15)
+
+        # reverse accumulates the scaled targets and leaves them untouched
+        tgt.vec[:] = np.random.random(10)
+        orig = tgt.vec.copy()
+        expected = src.vec + (scale*tgt.vec)[::-1]
+        xfer.transfer(src, tgt, mode='rev', deriv=True)
+        np.testing.assert_allclose(src.vec, expected, rtol=1e-15)
+        self.assertTrue(np.all(tgt.vec == orig))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,8 +7,11 @@ from openmdao.components.paramcomp import ParamComp
 from openmdao.core.component import Component
 from openmdao.core.group import Group
 from openmdao.core.problem import Problem
+from openmdao.components.execcomp import ExecComp
+from openmdao.solvers.scipy_gmres import ScipyGMRES
 from openmdao.test.converge_diverge import ConvergeDivergeGroups
-from openmdao.test.simplecomps import SimpleCompDerivMatVec
+from openmdao.test.sellar import SellarStateConnection
+from openmdao.test.simplecomps import SimpleCompDerivMatVec, SimpleSparseArrayComp
 from openmdao.test.testutil import assert_rel_error
 
 
@@ -120,5 +123,76 @@ class TestGroupDerivatves(unittest.TestCase):
         assert_rel_error(self, J[0][0], 81.0, 1e-6)
 
 
+class TestAssembleJacobian(unittest.TestCase):
+
+    def assert_matches_apply_linear(self, prob):
+        root = prob.root
+        root.jacobian(root.params, root.unknowns, root.resids)
+        A = root.assemble_jacobian().toarray()
+
+        # build the same matrix one column at a time through apply_linear
+        solver = ScipyGMRES()
+        solver.system = root
+        n = A.shape[0]
+        for mode, target in (('fwd', A), ('rev', A.T)):
+            solver.mode = mode
+            for i in range(n):
+                arg = np.zeros(n)
+                arg[i] = 1.0
+                col = solver.mult(arg)
+                diff = np.linalg.norm(col - target[:, i])
+                assert_rel_error(self, diff, 0.0, 1e-10)
+
+    def test_converge_diverge_groups(self):
+        prob = Problem()
+        prob.root = ConvergeDivergeGroups()
+        prob.setup(check=False)
+        prob.run()
+
+        self.assert_matches_apply_linear(prob)
+
+    def test_states(self):
+        prob = Problem()
+        prob.root = SellarStateConnection()
+        prob.setup(check=False)
+        prob.run()
+
+        self.assert_matches_apply_linear(prob)
+
+    def test_sparse_matvec_and_src_indices(self):
+
+        class CooComp(SimpleSparseArrayComp):
+
+            def jacobian(self, params, unknowns, resids):
+                J = super(CooComp, self).jacobian(params, unknowns, resids)
+                J['y', 'x'] = J['y', 'x'].tocoo()
+                return J
+
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('p', ParamComp('x', np.array([1.0, 2.0, 3.0, 4.0])))
+        root.add('sparse', CooComp())
+        root.add('px', ParamComp('x', 3.0))
+        root.add('matvec', SimpleCompDerivMatVec())
+        root.add('idx', ExecComp('y = 3.0*x*x', x=np.zeros(2), y=np.zeros(2)))
+        root.connect('p.x', 'sparse.x')
+        root.connect('px.x', 'matvec.x')
+        root.connect('sparse.y', 'idx.x', src_indices=[2, 0])
+        prob.setup(check=False)
+        prob.run()
+
+        self.assert_matches_apply_linear(prob)
+
+        # coo blocks are converted to a format with fast matvecs
+        self.assertEqual(root.sparse._jacobian_cache['y', 'x'].format, 'csr')
+        A = root.assemble_jacobian()
+        self.assertTrue(A.nnz < A.shape[0]*A.shape[1]/2)
+
+        J = prob.calc_gradient(['p.x'], ['idx.y'], mode='rev')
+        assert_rel_error(self, J[0][1], 30.0, 1e-8)
+        assert_rel_error(self, J[1][0], 360.0, 1e-8)
+        assert_rel_error(self, J[1][3], 1260.0, 1e-8)
+
+
 if __name__ == "__main__":
     unittest.main()
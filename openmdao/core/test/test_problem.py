@@ -669,7 +669,7 @@ class TestProblem(unittest.TestCase):
         try:
             prob.run()
         except AttributeError as err:
-            msg = "'unknowns' has not been initialized, setup() must be called before 'x' can be accessed"
+            msg = "'params' has not been initialized, setup() must be called before 'x' can be accessed"
             self.assertEqual(text_type(err), msg)
         else:
             self.fail('Exception expected')
@@ -0,0 +1,75 @@
+import unittest
+
+import networkx as nx
+
+from openmdao.core.problem import Problem
+from openmdao.core.relevance import Relevance
+from openmdao.test.converge_diverge import ConvergeDivergeGroups
+from openmdao.test.sellar import SellarDerivativesGrouped
+
+
+def _relevant_by_search(g, inputs, outputs):
+    """ Relevance computed with a separate graph search per input and
+    output."""
+    succs = {}
+    for nodes in inputs:
+        for node in nodes:
+            succs[node] = set([v for u, v in nx.dfs_edges(g, node)])
+            succs[node].add(node)
+
+    relevant = {}
+    grev = g.reverse()
+    for nodes in outputs:
+        for node in nodes:
+            relevant[node] = set()
+            preds = set([v for u, v in nx.dfs_edges(grev, node)])
+            preds.add(node)
+            for inps in inputs:
+                for inp in inps:
+                    common = preds.intersection(succs[inp])
+                    relevant[node].update(common)
+                    relevant.setdefault(inp, set()).update(common)
+
+    return relevant
+
+
+class TestRelevance(unittest.TestCase):
+
+    def _check(self, root, inputs, outputs):
+        prob = Problem(root)
+        prob.setup(check=False)
+
+        rel = Relevance(root, root._params_dict, root._unknowns_dict,
+                        root.connections, inputs, outputs, 'fwd')
+
+        expected = _relevant_by_search(rel._vgraph, rel.inputs, rel.outputs)
+        self.assertEqual(rel.relevant, expected)
+        self.assertEqual(rel[None], set(rel._vgraph.nodes()))
+
+        for voi, names in expected.items():
+            for name in rel[None]:
+                self.assertEqual(rel.is_relevant(voi, name), name in names)
+
+        return rel
+
+    def test_sellar(self):
+        # the two disciplines form a cycle
+        rel = self._check(SellarDerivativesGrouped(), ['x', 'z'],
+                          ['obj', 'con1', 'con2'])
+        self.assertTrue('y1' in rel['x'])
+        self.assertTrue('y2' in rel['con1'])
+
+    def test_converge_diverge(self):
+        rel = self._check(ConvergeDivergeGroups(), ['p.x'],
+                          ['comp7.y1', 'sub1.comp4.y2', 'sub3.comp5.y1'])
+
+        self.assertTrue('sub1.sub2.comp3.y1' in rel['comp7.y1'])
+        self.assertFalse(rel.is_relevant('sub3.comp5.y1', 'sub1.comp4.y2'))
+
+    def test_no_outputs(self):
+        rel = self._check(ConvergeDivergeGroups(), ['p.x'], [])
+        self.assertEqual(rel.relevant, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
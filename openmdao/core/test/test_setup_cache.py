@@ -0,0 +1,145 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from openmdao.components.paramcomp import ParamComp
+from openmdao.core.group import Group
+from openmdao.core.problem import Problem
+from openmdao.core.setupcache import SetupCache
+from openmdao.core.test.test_units import SrcComp, TgtCompF, TgtCompC, TgtCompK
+from openmdao.test.sellar import SellarDerivativesGrouped
+from openmdao.test.testutil import assert_rel_error
+
+
+def _sellar():
+    prob = Problem(SellarDerivativesGrouped())
+    prob.driver.add_param('x', low=0.0, high=10.0)
+    prob.driver.add_param('z', low=-10.0, high=10.0)
+    prob.driver.add_objective('obj')
+    prob.driver.add_constraint('con1')
+    prob.driver.add_constraint('con2')
+    return prob
+
+
+def _units():
+    prob = Problem(Group())
+    prob.root.add('src', SrcComp())
+    prob.root.add('tgtF', TgtCompF())
+    prob.root.add('tgtC', TgtCompC())
+    prob.root.add('tgtK', TgtCompK())
+    prob.root.add('px1', ParamComp('x1', 100.0), promotes=['x1'])
+    prob.root.connect('x1', 'src.x1')
+    prob.root.connect('src.x2', 'tgtF.x2')
+    prob.root.connect('src.x2', 'tgtC.x2')
+    prob.root.connect('src.x2', 'tgtK.x2')
+    return prob
+
+
+class TestSetupCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def _cache_files(self):
+        return sorted(os.listdir(self.cache_dir))
+
+    def _compare(self, builder):
+        expected = builder()
+        expected.setup(check=False)
+
+        first = builder()
+        first.setup(check=False, cache_dir=self.cache_dir)
+        files = self._cache_files()
+        self.assertEqual(len(files), 1)
+
+        # the second setup must come from the cache
+        cached = builder()
+        cached._setup_connections = None
+        cached._setup_units = None
+        cached.setup(check=False, cache_dir=self.cache_dir)
+        self.assertEqual(self._cache_files(), files)
+
+        for prob in (first, cached):
+            self.assertEqual(prob.root.connections, expected.root.connections)
+            self.assertEqual(prob._dangling, expected._dangling)
+            self.assertEqual(prob._unit_diffs, expected._unit_diffs)
+            self.assertEqual(prob.root._relevance.relevant,
+                             expected.root._relevance.relevant)
+
+            groups = list(prob.root.subgroups(recurse=True, include_self=True))
+            expected_groups = list(expected.root.subgroups(recurse=True,
+                                                           include_self=True))
+            for group, exp in zip(groups, expected_groups):
+                self.assertEqual(group.list_order(), exp.list_order())
+                self.assertEqual(sorted(group._data_xfer), sorted(exp._data_xfer))
+                for key, xfer in group._data_xfer.items():
+                    exp_xfer = exp._data_xfer[key]
+                    self.assertTrue(np.all(xfer.src_idxs == exp_xfer.src_idxs))
+                    self.assertTrue(np.all(xfer.tgt_idxs == exp_xfer.tgt_idxs))
+                    self.assertEqual(xfer.vec_conns, exp_xfer.vec_conns)
+                    self.assertEqual(xfer.byobj_conns, exp_xfer.byobj_conns)
+
+        return cached
+
+    def test_sellar(self):
+        prob = self._compare(_sellar)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+        J = prob.calc_gradient(['x', 'z'], ['obj'], mode='rev',
+                               return_format='dict')
+        assert_rel_error(self, J['obj']['x'][0][0], 2.98061391, .001)
+
+    def test_units(self):
+        prob = self._compare(_units)
+        prob.run()
+
+        assert_rel_error(self, prob['tgtF.x3'], 212.0, 1e-6)
+        assert_rel_error(self, prob['tgtK.x3'], 373.15, 1e-6)
+
+        J = prob.calc_gradient(['x1'], ['tgtF.x3'], mode='rev',
+                               return_format='dict')
+        assert_rel_error(self, J['tgtF.x3']['x1'][0][0], 1.8, 1e-6)
+
+    def test_changed_structure(self):
+        prob = _units()
+        prob.setup(check=False, cache_dir=self.cache_dir)
+
+        prob = _units()
+        prob.root.tgtC.add_param('extra', 1.0)
+        prob.setup(check=False, cache_dir=self.cache_dir)
+        self.assertEqual(len(self._cache_files()), 2)
+
+        prob = _units()
+        prob.driver.add_objective('tgtF.x3')
+        prob.setup(check=False, cache_dir=self.cache_dir)
+        self.assertEqual(len(self._cache_files()), 3)
+
+    def test_round_trip(self):
+        data = {
+            'a': np.arange(5),
+            (None, 'x'): [(1, 2.5), set(['p', 'q'])],
+            None: {'nested': [np.ones(3), 'str']},
+        }
+        cache = SetupCache(os.path.join(self.cache_dir, 'sub'), 'key')
+        self.assertEqual(cache.load(), None)
+        cache.save(data)
+
+        loaded = cache.load()
+        self.assertEqual(sorted(loaded, key=str), sorted(data, key=str))
+        self.assertTrue(np.all(loaded['a'] == data['a']))
+        self.assertEqual(loaded[(None, 'x')], data[(None, 'x')])
+        self.assertTrue(np.all(loaded[None]['nested'][0] == 1.0))
+        self.assertEqual(loaded[None]['nested'][1], 'str')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -168,6 +168,62 @@ class TestVecWrapper(unittest.TestCase):
         unorm = u.norm()
         self.assertAlmostEqual(unorm, np.linalg.norm(np.array([2.0, 3.0, -4.0])))
 
+    def test_views_and_adjoint(self):
+        unknowns_dict = OrderedDict()
+        unknowns_dict['y1'] = { 'shape': (3,2), 'size': 6, 'val': np.ones((3, 2)) }
+        unknowns_dict['y2'] = { 'shape': 1, 'size': 1, 'val': 2.0 }
+
+        for u, meta in unknowns_dict.items():
+            meta['pathname'] = u
+            meta['promoted_name'] = u
+
+        u = SrcVecWrapper()
+        u.setup(unknowns_dict, store_byobjs=True)
+
+        params = OrderedDict()
+        params['x1'] = { 'shape': (3,2), 'size': 6, 'val': np.ones((3, 2)) }
+        params['x2'] = { 'shape': 1, 'size': 1, 'val': 2.0, 'unit_conv': (2.0, 1.0) }
+
+        connections = {'x1': 'y1', 'x2': 'y2'}
+        for p, meta in params.items():
+            meta['pathname'] = p
+            meta['promoted_name'] = p
+
+        # unit conversion happens in the data transfer, not on access
+        p = TgtVecWrapper()
+        p.setup(None, params, u, params.keys(), connections, store_byobjs=True)
+        p.vec[:] = np.arange(7.)
+
+        self.assertEqual(p['x2'], 6.0)
+        p['x2'] = 3.0
+        self.assertEqual(p.vec[6], 3.0)
+
+        # arrays come back as views into the vector
+        p['x1'][1, 1] = 99.
+        self.assertEqual(p.vec[3], 99.)
+        self.assertTrue(np.may_share_memory(p['x1'], p.vec))
+
+        dp = TgtVecWrapper()
+        dp.setup(None, params, u, params.keys(), connections)
+        dp.vec[:] = np.arange(7.)
+
+        # in adjoint mode, get returns zeros and set accumulates
+        dp._set_adjoint_mode(True)
+        self.assertTrue(np.all(dp['x1'] == np.zeros((3, 2))))
+        self.assertEqual(dp['x2'], 0.0)
+        dp['x1'] = np.ones((3, 2))
+        dp['x2'] = 1.0
+        dp._set_adjoint_mode(False)
+
+        self.assertTrue(np.all(dp['x1'].flatten() == np.arange(6.) + 1.0))
+        self.assertEqual(dp.vec[6], 7.0)
+
+        # unconnected vars added after setup are accessible
+        p._add_unconnected_var('x3', { 'val': 'foo' })
+        self.assertEqual(p['x3'], 'foo')
+        p['x3'] = 'bar'
+        self.assertEqual(p['x3'], 'bar')
+
     def test_bad_get_unknown(self):
         unknowns_dict = OrderedDict()
 
@@ -72,12 +72,16 @@ class VecWrapper(object):
         self._vardict = OrderedDict()
         self._slices = OrderedDict()
 
+        # table of precomputed accessors for __getitem__ and __setitem__
+        self._access = {}
+
+        # maps absolute pathnames to our (promoted) variable names
+        self._to_prom_name = {}
+
         # add a flat attribute that will have access method consistent
         # with non-flat access  (__getitem__)
         self.flat = _flat_dict(self._vardict)
 
-        # Automatic unit conversion in target vectors
-        self.deriv_units = False
         self.adj_accumulate_mode = False
 
     def metadata(self, name):
@@ -118,38 +122,23 @@ class VecWrapper(object):
         -------
             The unflattened value of the named variable.
         """
-        meta = self.metadata(name)
-
-        if meta.get('pass_by_obj'):
-            return meta['val'].val
+        try:
+            byobj, val, flat, scalar = self._access[name]
+        except KeyError:
+            byobj, val, flat, scalar = self._setup_access(name)
 
-        unitconv = meta.get('unit_conv')
-        shape = meta.get('shape')
+        if byobj:
+            return val.val
 
         # For dparam vector, getitem is disabled in adjoint mode.
-        if self.adj_accumulate_mode == True:
-            return numpy.zeros((shape))
-
-        # Convert units
-        elif unitconv:
-            scale, offset = unitconv
-
-            # Gradient is just the scale
-            if self.deriv_units:
-                offset = 0.0
+        if self.adj_accumulate_mode:
+            return numpy.zeros(val.shape)
 
-            # if shape is 1, it's a float
-            if shape == 1:
-                return scale*(meta['val'][0] + offset)
-            else:
-                return scale*(meta['val'].reshape(shape) + offset)
+        # if it's a float, return the value rather than a view
+        if scalar:
+            return flat[0]
 
-        else:
-            # if shape is 1, it's a float
-            if shape == 1:
-                return meta['val'][0]
-            else:
-                return meta['val'].reshape(shape)
+        return val
 
     def __setitem__(self, name, value):
         """
@@ -163,45 +152,77 @@ class VecWrapper(object):
         value :
             The unflattened value of the named variable.
         """
-        meta = self.metadata(name)
+        try:
+            byobj, val, flat, _ = self._access[name]
+        except KeyError:
+            byobj, val, flat, _ = self._setup_access(name)
 
-        if meta.get('pass_by_obj'):
-            meta['val'].val = value
+        if byobj:
+            val.val = value
             return
 
-        unitconv = meta.get('unit_conv')
+        if isinstance(value, numpy.ndarray):
+            # copy straight into the shaped view when we can
+            if value.shape != val.shape:
+                value = value.flat[:]
+                val = flat
 
-        # For dparam vector in adjoint mode, assignement behaves as +=.
-        if self.adj_accumulate_mode is True:
-            if self.deriv_units and unitconv:
-                scale, offset = unitconv
+            # For dparam vector in adjoint mode, assignement behaves as +=.
+            if self.adj_accumulate_mode:
+                val += value
+            else:
+                val[...] = value
+        else:
+            if self.adj_accumulate_mode:
+                flat[0] += value
+            else:
+                flat[0] = value
 
-                if isinstance(value, numpy.ndarray):
-                    meta['val'][:] += scale*value.flat[:]
-                else:
-                    meta['val'][0] += scale*value
+    def _setup_access(self, name):
+        """
+        Creates the entry in the accessor table for the named variable.
 
-            else:
-                if isinstance(value, numpy.ndarray):
-                    meta['val'][:] += value.flat[:]
-                else:
-                    meta['val'][0] += value
+        The entry contains everything `__getitem__` and `__setitem__` need,
+        resolved ahead of time: whether the variable is 'pass by object',
+        the value (the `_ByObjWrapper` or a shaped view into vec), the flat
+        view and whether the variable is a float.
+
+        Args
+        ----
+        name : str
+            Name of variable.
+
+        Returns
+        -------
+        tuple
+            The new entry.
+        """
+        meta = self.metadata(name)
 
-        # Convert Units
+        if meta.get('pass_by_obj'):
+            access = (True, meta['val'], None, False)
         else:
-            if self.deriv_units and unitconv:
-                scale, offset = unitconv
+            flat = meta['val']
+            shape = meta.get('shape')
 
-                if isinstance(value, numpy.ndarray):
-                    meta['val'][:] = scale*value.flat[:]
-                else:
-                    meta['val'][0] = scale*value
+            # if shape is 1, it's a float
+            scalar = shape == 1
+            access = (False, flat.reshape(shape), flat, scalar)
 
-            else:
-                if isinstance(value, numpy.ndarray):
-                    meta['val'][:] = value.flat[:]
-                else:
-                    meta['val'][0] = value
+        self._access[name] = access
+        return access
+
+    def _setup_access_table(self):
+        """
+        Builds the accessor table for all of our local variables and the
+        index of absolute pathnames to variable names.
+        """
+        self._access = {}
+        self._to_prom_name = {}
+        for name, meta in self._vardict.items():
+            self._to_prom_name.setdefault(meta['pathname'], name)
+            if not meta.get('remote'):
+                self._setup_access(name)
 
     def __len__(self):
         """
@@ -350,6 +371,8 @@ class VecWrapper(object):
         else:
             view.vec = self.vec[start:end]
 
+        view._setup_access_table()
+
         return view
 
     def make_idx_array(self, start, end):
@@ -444,10 +467,10 @@ class VecWrapper(object):
         rel_name : str
             Relative name mapped to the given absolute pathname.
         """
-        for rel_name, meta in self._vardict.items():
-            if meta['pathname'] == abs_name:
-                return rel_name
-        raise RuntimeError("Relative name not found for variable '%s'" % abs_name)
+        try:
+            return self._to_prom_name[abs_name]
+        except KeyError:
+            raise RuntimeError("Relative name not found for variable '%s'" % abs_name)
 
     def get_states(self):
         """
@@ -551,6 +574,43 @@ class VecWrapper(object):
         """ Turn on or off adjoint accumlate mode."""
         self.adj_accumulate_mode = mode
 
+    def _clone(self):
+        """
+        Returns a copy of this `VecWrapper` with its own storage, so it can
+        be modified without affecting this one (or any vector this one is
+        a view of).  'pass by object' values are shared.
+
+        Returns
+        -------
+        `VecWrapper`
+            A new `VecWrapper` of the same type, containing a copy of our
+            variables in a contiguous array.
+        """
+        clone = self.__class__(self.pathname, self.comm)
+        clone.adj_accumulate_mode = self.adj_accumulate_mode
+
+        vec_size = 0
+        for name, meta in self._vardict.items():
+            if not (meta.get('pass_by_obj') or meta.get('remote')):
+                clone._slices[name] = (vec_size, vec_size + meta['size'])
+                vec_size += meta['size']
+
+        clone.vec = numpy.zeros(vec_size)
+
+        for name, meta in self._vardict.items():
+            meta = meta.copy()
+            if name in clone._slices:
+                start, end = clone._slices[name]
+                clone.vec[start:end] = meta['val']
+                meta['val'] = clone.vec[start:end]
+            elif isinstance(meta.get('val'), _ByObjWrapper):
+                meta['val'] = _ByObjWrapper(meta['val'].val)
+            clone._vardict[name] = meta
+
+        clone._setup_access_table()
+
+        return clone
+
 
 
 class SrcVecWrapper(VecWrapper):
@@ -596,6 +656,8 @@ class SrcVecWrapper(VecWrapper):
                 start, end = self._slices[name]
                 meta['val'] = self.vec[start:end]
 
+        self._setup_access_table()
+
         # if store_byobjs is True, this is the unknowns vecwrapper,
         # so initialize all of the values from the unknowns dicts.
         if store_byobjs:
@@ -676,10 +738,6 @@ class TgtVecWrapper(VecWrapper):
             If True, store 'pass by object' variables in the `VecWrapper` we're building.
         """
 
-        # dparams vector has some additional behavior
-        if not store_byobjs:
-            self.deriv_units = True
-
         vec_size = 0
         missing = []  # names of our params that we don't 'own'
         for meta in params_dict.values():
@@ -726,16 +784,7 @@ class TgtVecWrapper(VecWrapper):
                 newmeta['owned'] = False # mark this param as not 'owned' by this VW
                 self._vardict[self._scoped_abs_name(pathname)] = newmeta
 
-        # Finally, set up unit conversions, if any exist.
-        for meta in params_dict.values():
-            pathname = meta['pathname']
-            if pathname in my_params and (relevant_vars is None or pathname in relevant_vars):
-                unitconv = meta.get('unit_conv')
-                if unitconv:
-                    scale, offset = unitconv
-                    if self.deriv_units:
-                        offset = 0.0
-                    self._vardict[self._scoped_abs_name(pathname)]['unit_conv'] = (scale, offset)
+        self._setup_access_table()
 
     def _setup_var_meta(self, pathname, meta, index, src_meta, store_byobjs):
         """
@@ -791,7 +840,10 @@ class TgtVecWrapper(VecWrapper):
                                pathname)
 
         vmeta['val'] = _ByObjWrapper(val)
-        self._vardict[self._scoped_abs_name(pathname)] = vmeta
+        name = self._scoped_abs_name(pathname)
+        self._vardict[name] = vmeta
+        self._to_prom_name.setdefault(pathname, name)
+        self._setup_access(name)
 
     def _get_flattened_sizes(self):
         """
@@ -0,0 +1,115 @@
+"""Benchmark for `DataXfer` transfers, comparing the compiled forward
+transfer plans against a plain fancy indexed copy of the same indices and
+the reverse accumulation against `np.add.at`.
+
+Usage: python bench_dataxfer.py [num_passes]
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+
+import numpy as np
+
+from openmdao.core.component import Component
+from openmdao.core.group import Group
+from openmdao.core.problem import Problem
+from openmdao.components.paramcomp import ParamComp
+from openmdao.test.converge_diverge import ConvergeDivergeGroups
+from openmdao.test.sellar import SellarDerivativesGrouped
+
+
+class _ArrayComp(Component):
+    """Passes a few large arrays through."""
+
+    def __init__(self, num_vars, size):
+        super(_ArrayComp, self).__init__()
+        for i in range(num_vars):
+            self.add_param('x%d' % i, np.zeros(size))
+            self.add_output('y%d' % i, np.zeros(size))
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        pass
+
+
+def _array_chain(num_comps=5, num_vars=4, size=500):
+    """A chain of components connected by large arrays."""
+    root = Group()
+    root.add('p', ParamComp([('y%d' % i, np.zeros(size)) for i in range(num_vars)]))
+    prev = 'p'
+    for i in range(num_comps):
+        name = 'c%d' % i
+        root.add(name, _ArrayComp(num_vars, size))
+        for j in range(num_vars):
+            root.connect('%s.y%d' % (prev, j), '%s.x%d' % (name, j))
+        prev = name
+    return root
+
+
+def _fan_out(num_comps=50, num_vars=4, size=500):
+    """Every output of a single component feeds many components."""
+    root = Group()
+    root.add('p', ParamComp([('y%d' % i, np.zeros(size)) for i in range(num_vars)]))
+    for i in range(num_comps):
+        name = 'c%d' % i
+        root.add(name, _ArrayComp(num_vars, size))
+        for j in range(num_vars):
+            root.connect('p.y%d' % j, '%s.x%d' % (name, j))
+    return root
+
+
+def bench(num_passes=20000):
+    """Times all of the forward and reverse transfers of a few models and
+    prints the cost of a single transfer on average.
+
+    Args
+    ----
+    num_passes : int, optional
+        Number of passes over all of the transfers.
+    """
+    for label, root in [('converge_diverge', ConvergeDivergeGroups()),
+                        ('sellar', SellarDerivativesGrouped()),
+                        ('array chain', _array_chain()),
+                        ('fan out', _fan_out())]:
+        prob = Problem(root)
+        prob.setup(check=False)
+
+        xfers = []
+        for group in root.subgroups(recurse=True, include_self=True):
+            for (tgt_sys, mode, voi), xfer in group._data_xfer.items():
+                if voi is None:
+                    xfers.append((mode, xfer, group.unknowns, group.params))
+        fwd = [x[1:] for x in xfers if x[0] == 'fwd']
+        rev = [x[1:] for x in xfers if x[0] == 'rev']
+
+        def planned():
+            for xfer, srcvec, tgtvec in fwd:
+                xfer.transfer(srcvec, tgtvec, deriv=True)
+
+        def fancy():
+            for xfer, srcvec, tgtvec in fwd:
+                tgtvec.vec[xfer.tgt_idxs] = srcvec.vec[xfer.src_idxs]
+
+        def accumulate():
+            for xfer, srcvec, tgtvec in rev:
+                xfer.transfer(srcvec, tgtvec, mode='rev', deriv=True)
+
+        def add_at():
+            for xfer, srcvec, tgtvec in rev:
+                np.add.at(srcvec.vec, xfer.src_idxs, tgtvec.vec[xfer.tgt_idxs])
+
+        for direction, funcs, xfer_list in [('fwd', [('fancy indexing', fancy),
+                                                     ('transfer plan', planned)], fwd),
+                                            ('rev', [('np.add.at', add_at),
+                                                     ('accumulate', accumulate)], rev)]:
+            nidxs = sum(len(xfer.src_idxs) for xfer, _, _ in xfer_list)
+            print("%s %s: %d transfers, %d entries" % (label, direction,
+                                                       len(xfer_list), nidxs))
+            for name, func in funcs:
+                best = min(timeit.repeat(func, number=num_passes, repeat=3))
+                print("    %-16s %8.3f us/transfer" %
+                      (name, best/(num_passes*len(xfer_list))*1e6))
+
+if __name__ == '__main__':
+    bench(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,186 @@
+"""Benchmark for the write throughput and file size of the case recorders,
+for the time `CaseReader` takes to read the history of one variable back,
+and for the time `raw_record` blocks the caller when recording
+synchronously and asynchronously.
+
+Usage: python bench_recorders.py [num_cases] [num_vars]
+"""
+
+from __future__ import print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from openmdao.devtools.bench_setup import build
+from openmdao.util.recordutil import format_iteration_coordinate
+
+
+def _cases(num_cases, num_vars):
+    """Yields the arguments of `num_cases` calls to `record`, for a model
+    with `num_vars` scalar params and as many 3 element unknowns."""
+    params = dict(('x%d' % i, 0.0) for i in range(num_vars))
+    unknowns = dict(('y%d' % i, np.zeros(3)) for i in range(num_vars))
+    resids = dict(('y%d' % i, np.zeros(3)) for i in range(num_vars))
+    for i in range(num_cases):
+        for name in params:
+            params[name] = float(i)
+        for val in unknowns.values():
+            val[:] = i
+        yield params, unknowns, resids, {'coord': ['Driver', (1,), 'root', (i,)]}
+
+
+def _hdf5_group_per_case(filename, cases):
+    """Writes cases the way `HDF5Recorder` used to, with an HDF5 group and a
+    dataset per variable for every case."""
+    from h5py import File
+    with File(filename, 'w') as f:
+        for params, unknowns, resids, metadata in cases:
+            group = f.require_group(format_iteration_coordinate(metadata['coord']))
+            for name, data in (('Parameters', params), ('Unknowns', unknowns),
+                               ('Residuals', resids)):
+                sub = group.create_group(name)
+                for key, val in data.items():
+                    sub.create_dataset(key, data=val)
+
+
+def _hdf5(filename, cases):
+    """Writes cases with `HDF5Recorder`."""
+    from openmdao.recorders.hdf5recorder import HDF5Recorder
+    recorder = HDF5Recorder(filename)
+    for case in cases:
+        recorder.record(*case)
+    recorder.close()
+
+
+def _shelve(filename, cases):
+    """Writes cases with `ShelveRecorder`."""
+    from openmdao.recorders.shelverecorder import ShelveRecorder
+    recorder = ShelveRecorder(filename)
+    for case in cases:
+        recorder.record(*case)
+    recorder.close()
+
+
+def _sqlite(filename, cases):
+    """Writes cases with `SqliteRecorder`."""
+    from openmdao.recorders.sqliterecorder import SqliteRecorder
+    recorder = SqliteRecorder(filename)
+    for case in cases:
+        recorder.record(*case)
+    recorder.close()
+
+
+def _file_size(path):
+    """Size in bytes of a file, or of everything in it if it's a directory."""
+    if os.path.isdir(path):
+        return sum(_file_size(os.path.join(path, f)) for f in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def bench(num_cases=10000, num_vars=20):
+    """Records `num_cases` cases with each recorder and prints the cost of
+    recording a case, the size of the resulting file, and the time it takes
+    to read the values of one variable in every case and in one case.
+
+    Args
+    ----
+    num_cases : int, optional
+        Number of cases to record.
+
+    num_vars : int, optional
+        Number of params (and unknowns) in each case.
+    """
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for label, func in [('hdf5 group per case', _hdf5_group_per_case),
+                            ('hdf5', _hdf5),
+                            ('shelve', _shelve),
+                            ('sqlite', _sqlite)]:
+            # some recorders add suffixes or write more than one file
+            dirname = os.path.join(tmpdir, label.replace(' ', '_'))
+            os.mkdir(dirname)
+            filename = os.path.join(dirname, 'cases')
+            try:
+                start = time.time()
+                func(filename, _cases(num_cases, num_vars))
+                elapsed = time.time() - start
+            except ImportError as err:
+                print("%-22s skipped (%s)" % (label, err))
+                continue
+            print("%-22s %10.1f us/case %10.1f kB" %
+                  (label, elapsed/num_cases*1e6, _file_size(dirname)/1024.))
+
+            if func is not _hdf5_group_per_case:
+                _bench_read(filename, num_cases)
+
+        _bench_raw_record(tmpdir, num_cases, num_vars)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def _bench_read(filename, num_cases):
+    """Times reading one variable back with `CaseReader`, across all cases
+    and for a coordinate prefix that matches a single case."""
+    from openmdao.recorders.casereader import CaseReader
+    start = time.time()
+    reader = CaseReader(filename)
+    try:
+        reader.get('y0')
+        read_all = time.time() - start
+        start = time.time()
+        reader.get('y0', prefix='Driver/1/root/%d' % (num_cases // 2))
+        read_one = time.time() - start
+    finally:
+        reader.close()
+    print("%-22s %10.3f s all cases %10.3f s one case" % ('', read_all, read_one))
+
+
+def _bench_raw_record(tmpdir, num_cases, num_vars):
+    """Times a loop that does some model work and then calls `raw_record`
+    for the root of a set up model, recording synchronously and
+    asynchronously."""
+    from openmdao.recorders.shelverecorder import ShelveRecorder
+    recorders = [('shelve', ShelveRecorder)]
+    try:
+        from openmdao.recorders.hdf5recorder import HDF5Recorder
+        recorders.append(('hdf5', HDF5Recorder))
+    except ImportError:
+        pass
+
+    prob = build(2*num_vars, vars_per_comp=num_vars)
+    prob.setup(check=False)
+    root = prob.root
+
+    # stands in for the work done by the model between cases
+    mat = np.random.random((120, 120)) + 120*np.eye(120)
+    rhs = np.ones(120)
+
+    for label, klass in recorders:
+        for mode in (False, True):
+            recorder = klass(os.path.join(tmpdir, 'raw_record_%s_%s' % (label, mode)))
+            recorder.options['async'] = mode
+            recorder.startup(root)
+
+            blocked = 0.0
+            start = time.time()
+            for i in range(num_cases):
+                np.linalg.solve(mat, rhs)
+                rec_start = time.time()
+                recorder.raw_record(root.params, root.unknowns, root.resids,
+                                    {'coord': ['Driver', (1,), 'root', (i,)]})
+                blocked += time.time() - rec_start
+            recorder.close()
+            total = time.time() - start
+
+            print("%-6s %-5s %10.1f us/case in raw_record, %10.1f us/case total" %
+                  (label, 'async' if mode else 'sync', blocked/num_cases*1e6,
+                   total/num_cases*1e6))
+
+
+if __name__ == '__main__':
+    bench(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,90 @@
+"""Benchmark for the time `Problem.setup` takes as the number of
+variables in the model grows, with and without a setup cache.
+
+Usage: python bench_setup.py [max_vars] [vars_per_comp]
+"""
+
+from __future__ import print_function
+
+import shutil
+import sys
+import tempfile
+import time
+
+from openmdao.core.component import Component
+from openmdao.core.group import Group
+from openmdao.core.problem import Problem
+from openmdao.components.paramcomp import ParamComp
+
+
+class _ScalarComp(Component):
+    """A component with a number of scalar params and outputs."""
+
+    def __init__(self, num_vars):
+        super(_ScalarComp, self).__init__()
+        for i in range(num_vars):
+            self.add_param('x%d' % i, 0.0)
+            self.add_output('y%d' % i, 0.0)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        pass
+
+
+def build(num_vars, vars_per_comp=10):
+    """Returns a `Problem` containing a chain of components, split across
+    a few groups, with about `num_vars` variables in total."""
+    num_comps = max(num_vars // (2*vars_per_comp), 1)
+    num_groups = max(int(num_comps**0.5), 1)
+
+    root = Group()
+    root.add('p', ParamComp([('y%d' % i, 0.0) for i in range(vars_per_comp)]))
+    groups = [root.add('g%d' % i, Group()) for i in range(num_groups)]
+
+    prev = 'p'
+    for i in range(num_comps):
+        group = 'g%d' % (i % num_groups)
+        groups[i % num_groups].add('c%d' % i, _ScalarComp(vars_per_comp))
+        name = '%s.c%d' % (group, i)
+        for j in range(vars_per_comp):
+            root.connect('%s.y%d' % (prev, j), '%s.x%d' % (name, j))
+        prev = name
+
+    return Problem(root)
+
+
+def bench(max_vars=100000, vars_per_comp=10):
+    """Times `Problem.setup` for models with 10**3 up to `max_vars`
+    variables, both without a cache and with a cache that was filled by an
+    earlier setup of the same model.
+
+    Args
+    ----
+    max_vars : int, optional
+        Number of variables in the largest model.
+
+    vars_per_comp : int, optional
+        Number of params (and outputs) on each component.
+    """
+    cache_dir = tempfile.mkdtemp()
+    try:
+        num_vars = 1000
+        while num_vars <= max_vars:
+            prob = build(num_vars, vars_per_comp)
+            start = time.time()
+            prob.setup(check=False)
+            uncached = time.time() - start
+
+            build(num_vars, vars_per_comp).setup(check=False, cache_dir=cache_dir)
+
+            prob = build(num_vars, vars_per_comp)
+            start = time.time()
+            prob.setup(check=False, cache_dir=cache_dir)
+            print("%8d vars: setup %8.3f s, cached %8.3f s" %
+                  (num_vars, uncached, time.time() - start))
+            num_vars *= 10
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+if __name__ == '__main__':
+    bench(*[int(arg) for arg in sys.argv[1:]])
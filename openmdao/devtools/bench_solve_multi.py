@@ -0,0 +1,98 @@
+"""Benchmark for `calc_gradient` with many design variables, comparing the
+block solve of `ScipyGMRES` against one solve per right-hand side.
+
+Usage: python bench_solve_multi.py [size]
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+
+import numpy as np
+from scipy import sparse
+
+from openmdao.components.paramcomp import ParamComp
+from openmdao.core.component import Component
+from openmdao.core.group import Group
+from openmdao.core.problem import Problem
+from openmdao.solvers.nl_gauss_seidel import NLGaussSeidel
+from openmdao.solvers.scipy_gmres import ScipyGMRES
+from openmdao.solvers.solverbase import LinearSolver
+
+
+class _Stage(Component):
+    """Passes an array through with a sparse Jacobian."""
+
+    def __init__(self, size, coupled=False):
+        super(_Stage, self).__init__()
+        self.size = size
+        self.coupled = coupled
+        self.add_param('x', np.zeros(size))
+        if coupled:
+            self.add_param('c', np.zeros(size))
+        self.add_output('y', np.zeros(size))
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['y'] = 0.5*params['x']
+        unknowns['y'][:-1] += 0.1*params['x'][1:]
+        if self.coupled:
+            unknowns['y'] += 0.25*params['c']
+
+    def jacobian(self, params, unknowns, resids):
+        diags = [np.full(self.size, 0.5), np.full(self.size - 1, 0.1)]
+        J = {('y', 'x'): sparse.diags(diags, [0, 1]).tocsr()}
+        if self.coupled:
+            J[('y', 'c')] = 0.25*sparse.eye(self.size).tocsr()
+        return J
+
+
+def _stages(size, num_stages=4):
+    """A chain of stages with the last one fed back into the second."""
+    root = Group()
+    root.add('p', ParamComp('x', np.ones(size)))
+    prev = 'p.x'
+    for i in range(num_stages):
+        name = 's%d' % i
+        root.add(name, _Stage(size, coupled=(i == 1)))
+        root.connect(prev, name + '.x')
+        prev = name + '.y'
+    root.connect(prev, 's1.c')
+
+    root.nl_solver = NLGaussSeidel()
+    root.ln_solver = ScipyGMRES()
+    return root
+
+
+def bench(size=2000):
+    """Times the gradient of the last stage with respect to all of the
+    entries of the parameter, with and without block solves.
+
+    Args
+    ----
+    size : int, optional
+        Size of the parameter and of each of the stages.
+    """
+    prob = Problem(_stages(size))
+    prob.setup(check=False)
+    prob.run()
+
+    block_solve = ScipyGMRES.solve_multi
+    for mode in ('fwd', 'rev'):
+        times = []
+        for solve_multi in (LinearSolver.solve_multi, block_solve):
+            ScipyGMRES.solve_multi = solve_multi
+            try:
+                start = time.time()
+                prob.calc_gradient(['p.x'], ['s3.y'], mode=mode,
+                                   return_format='array')
+                times.append(time.time() - start)
+            finally:
+                ScipyGMRES.solve_multi = block_solve
+
+        print("gmres %s: %d right-hand sides" % (mode, size))
+        print("    per column %8.3f s" % times[0])
+        print("    block      %8.3f s" % times[1])
+
+if __name__ == '__main__':
+    bench(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,99 @@
+"""Benchmark for the per-access cost of `VecWrapper.__getitem__` and
+`VecWrapper.__setitem__`.
+
+Usage: python bench_vecwrapper.py [num_vars] [num_passes]
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+
+import numpy as np
+
+from openmdao.core.component import Component
+from openmdao.core.group import Group
+from openmdao.core.problem import Problem
+from openmdao.components.paramcomp import ParamComp
+
+
+class _BenchComp(Component):
+    """A component with scalar and array params and outputs, some of the
+    params with unit conversions."""
+
+    def __init__(self, num_vars):
+        super(_BenchComp, self).__init__()
+        self.num_vars = num_vars
+        for i in range(num_vars):
+            self.add_param('x%d' % i, 0.0, units='m')
+            self.add_param('a%d' % i, np.zeros((3, 2)))
+            self.add_output('y%d' % i, 0.0)
+            self.add_output('b%d' % i, np.zeros((3, 2)))
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        pass
+
+
+def build(num_vars):
+    """Returns a set up `Problem` containing a `_BenchComp`."""
+    root = Group()
+    root.add('p', ParamComp([('x%d' % i, 0.0, {'units': 'ft'}) for i in range(num_vars)] +
+                            [('a%d' % i, np.zeros((3, 2))) for i in range(num_vars)]))
+    root.add('c', _BenchComp(num_vars))
+    for i in range(num_vars):
+        root.connect('p.x%d' % i, 'c.x%d' % i)
+        root.connect('p.a%d' % i, 'c.a%d' % i)
+
+    prob = Problem(root)
+    prob.setup(check=False)
+    return prob
+
+
+def bench(num_vars=20, num_passes=2000):
+    """Times getting and setting every variable of a component and prints
+    the cost of a single access.
+
+    Args
+    ----
+    num_vars : int, optional
+        Number of variables of each kind (scalar and array params and
+        outputs) on the component.
+
+    num_passes : int, optional
+        Number of passes over all of the variables.
+    """
+    comp = build(num_vars).root.c
+    params, unknowns = comp.params, comp.unknowns
+
+    scalars = ['x%d' % i for i in range(num_vars)]
+    arrays = ['a%d' % i for i in range(num_vars)]
+    outputs = ['y%d' % i for i in range(num_vars)]
+    array_outputs = ['b%d' % i for i in range(num_vars)]
+    arr = np.ones((3, 2))
+
+    def get_scalars():
+        for name in scalars:
+            params[name]
+
+    def get_arrays():
+        for name in arrays:
+            params[name]
+
+    def set_scalars():
+        for name in outputs:
+            unknowns[name] = 1.0
+
+    def set_arrays():
+        for name in array_outputs:
+            unknowns[name] = arr
+
+    for label, func in [('get scalar', get_scalars),
+                        ('get array', get_arrays),
+                        ('set scalar', set_scalars),
+                        ('set array', set_arrays)]:
+        best = min(timeit.repeat(func, number=num_passes, repeat=3))
+        print("%-20s %8.3f us/access" % (label, best/(num_passes*num_vars)*1e6))
+
+
+if __name__ == '__main__':
+    bench(*[int(arg) for arg in sys.argv[1:]])
@@ -1,16 +1,33 @@
 """ Class definition for BaseRecorder, the base class for all recorders."""
 
-from fnmatch import fnmatch
+from copy import deepcopy
+from fnmatch import translate
+import os
+import re
 import sys
+import threading
 
-from six.moves import filter
-from six import StringIO
+import numpy as np
+
+from six.moves import filter, queue
+from six import StringIO, reraise
 
 from openmdao.core.options import OptionsDictionary
 
 
 class BaseRecorder(object):
-    """ Base class for all case recorders. """
+    """ Base class for all case recorders.
+
+    At startup, the variables to record are resolved to index arrays into
+    the vectors of the group, so recording a case is a gather into a
+    reusable buffer. Each case passed to `record` gets its own copy of the
+    gathered values, so they stay valid after the call.
+
+    If the 'async' option is set, `raw_record` copies the recorded
+    variables into a ring buffer and returns, and `record` is called from a
+    background thread. `flush` waits for the queued cases, and `close` must
+    be called to record them all.
+    """
 
     def __init__(self):
         self.options = OptionsDictionary()
@@ -19,12 +36,25 @@ class BaseRecorder(object):
         self.options.add_option('excludes', [],
                                 desc='Patterns for variables to exclude from recording '
                                 '(processed after includes)')
+        self.options.add_option('async', False,
+                                desc='If True, copy the recorded variables into a '
+                                'buffer and call record from a background thread')
+        self.options.add_option('queue_size', 32, low=1,
+                                desc='Number of cases per system that can wait to be '
+                                'recorded when recording asynchronously')
 
         self.out = None
 
         self._filtered = {}
+        self._filter = None
         # TODO: System specific includes/excludes
 
+        # state for asynchronous recording
+        self._snapshots = {}
+        self._queue = None
+        self._writer = None
+        self._error = None
+
     def startup(self, group):
         """ Prepare for a new run.
 
@@ -34,30 +64,20 @@ class BaseRecorder(object):
             Group that owns this recorder.
         """
 
+        self._filter = _compile_filter(self.options['includes'],
+                                       self.options['excludes'])
+
         # Compute the inclusion lists for recording
         params = list(filter(self._check_path, group.params))
         unknowns = list(filter(self._check_path, group.unknowns))
         resids = list(filter(self._check_path, group.resids))
 
         self._filtered[group.pathname] = (params, unknowns, resids)
+        self._snapshots.pop(group.pathname, None)
 
     def _check_path(self, path):
         """ Return True if `path` should be recorded. """
-
-        includes = self.options['includes']
-        excludes = self.options['excludes']
-
-        # First see if it's included
-        for pattern in includes:
-            if fnmatch(path, pattern):
-                # We found a match. Check to see if it is excluded.
-                for ex_pattern in excludes:
-                    if fnmatch(path, ex_pattern):
-                        return False
-                return True
-
-        # Did not match anything in includes.
-        return False
+        return self._filter.match(path) is not None
 
     def raw_record(self, params, unknowns, resids, metadata):
         """
@@ -87,11 +107,107 @@ class BaseRecorder(object):
         # Coord will look like ['Driver', (1,), 'root', (1,), 'G1', (1,1), ...]
         # So the pathname is every other entry, starting with the fifth.
         pathname = '.'.join(metadata['coord'][4::2])
-        pnames, unames, rnames = self._filtered[pathname]
-        filtered_params = {key: params[key] for key in pnames}
-        filtered_unknowns = {key: unknowns[key] for key in unames}
-        filtered_resids = {key: resids[key] for key in rnames}
-        self.record(filtered_params, filtered_unknowns, filtered_resids, metadata)
+
+        if self.options['async']:
+            self._record_async(pathname, params, unknowns, resids, metadata)
+            return
+
+        snapshots = self._get_snapshots(pathname, (params, unknowns, resids), 1)
+        byobjs = snapshots.take(0, copy_byobjs=False)
+        self.record(*(snapshots.case(0, byobjs) + (metadata,)))
+
+    def _get_snapshots(self, pathname, vecs, size):
+        """
+        Args
+        ----
+        pathname : str
+            Pathname of the system being recorded.
+
+        vecs : tuple of `VecWrapper`
+            The params, unknowns and resids of the system.
+
+        size : int
+            Number of cases in the buffer.
+
+        Returns
+        -------
+        `_CaseSnapshots`
+            The buffer for the cases of the system, created on first use.
+        """
+        snapshots = self._snapshots.get(pathname)
+        if snapshots is None or snapshots.size != size:
+            snapshots = _CaseSnapshots(vecs, self._filtered[pathname], size)
+            self._snapshots[pathname] = snapshots
+        return snapshots
+
+    def _record_async(self, pathname, params, unknowns, resids, metadata):
+        """
+        Copies the variables to record into a free slot of a ring buffer,
+        and queues the case for the writer thread. Blocks while the ring
+        buffer for this system is full.
+
+        Args
+        ----
+        pathname : str
+            Pathname of the system being recorded.
+
+        params : `VecWrapper`
+            `VecWrapper` containing parameters. (p)
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+
+        resids : `VecWrapper`
+            `VecWrapper` containing residuals. (r)
+
+        metadata : dict
+            Dictionary containing execution metadata (e.g. iteration coordinate).
+        """
+        self._check_writer()
+
+        snapshots = self._get_snapshots(pathname, (params, unknowns, resids),
+                                        self.options['queue_size'])
+
+        if self._writer is None:
+            self._queue = queue.Queue()
+            self._writer = threading.Thread(target=self._write_cases)
+            self._writer.daemon = True
+            self._writer.start()
+
+        slot = snapshots.free.get()
+        byobjs = snapshots.take(slot)
+
+        # the coordinate is updated in place as execution continues
+        metadata = dict(metadata)
+        metadata['coord'] = list(metadata['coord'])
+
+        self._queue.put((snapshots, slot, byobjs, metadata))
+
+    def _write_cases(self):
+        """ Main loop of the writer thread. Passes queued cases to `record`
+        until it gets None."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+
+                snapshots, slot, byobjs, metadata = item
+                if self._error is None:
+                    try:
+                        params, unknowns, resids = snapshots.case(slot, byobjs)
+                        self.record(params, unknowns, resids, metadata)
+                    except Exception:
+                        self._error = sys.exc_info()
+                snapshots.free.put(slot)
+            finally:
+                self._queue.task_done()
+
+    def _check_writer(self):
+        """ Re-raises any exception raised by `record` in the writer thread."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            reraise(*error)
 
     def record(self, params, unknowns, resids, metadata):
         """ Records the requested variables. This method must be defined in
@@ -113,11 +229,192 @@ class BaseRecorder(object):
         """
         raise NotImplementedError("record")
 
+    def flush(self):
+        """ Waits until all of the cases recorded asynchronously have been
+        passed to `record`."""
+        if self._writer is not None:
+            self._queue.join()
+        self._check_writer()
+
     def close(self):
         """Closes `out` unless it's ``sys.stdout``, ``sys.stderr``, or StringIO.
-        Note that a closed recorder will do nothing in :meth:`record`."""
+        Note that a closed recorder will do nothing in :meth:`record`.
+        Any cases that are still queued are recorded first."""
+        try:
+            self.flush()
+        finally:
+            if self._writer is not None:
+                self._queue.put(None)
+                self._writer.join()
+                self._writer = None
+
         # Closing a StringIO deletes its contents.
         if self.out not in (None, sys.stdout, sys.stderr):
             if not isinstance(self.out, StringIO):
                 self.out.close()
             self.out = None
+
+
+def _compile_filter(includes, excludes):
+    """
+    Args
+    ----
+    includes : list of str
+        Glob patterns for variables to record.
+
+    excludes : list of str
+        Glob patterns for variables not to record, even if they match
+        `includes`.
+
+    Returns
+    -------
+    regex
+        A compiled regex that matches the variables to record.
+    """
+    include = '|'.join(translate(p) for p in includes) or '(?!)'
+    if excludes:
+        pattern = '(?!(?:%s))(?:%s)' % ('|'.join(translate(p) for p in excludes),
+                                        include)
+    else:
+        pattern = include
+
+    # fnmatch is case insensitive where file names are
+    flags = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+    return re.compile(pattern, flags)
+
+
+class _CaseSnapshots(object):
+    """
+    A buffer of copies of the recorded variables of one system. Each case is
+    copied out of the vectors with a single gather per vector into a free
+    row of the buffer. With more than one row, it's the ring buffer used for
+    asynchronous recording.
+
+    Args
+    ----
+    vecs : tuple of `VecWrapper`
+        The params, unknowns and resids of the system.
+
+    names : tuple of list of str
+        Names of the variables to record from each of `vecs`.
+
+    size : int
+        Number of cases in the ring buffer.
+    """
+
+    def __init__(self, vecs, names, size):
+        self.vecs = vecs
+        self.size = size
+        self.idxs = []
+        self.extras = []
+        self.layouts = []
+        self.byobj_names = []
+        self.bufs = []
+
+        for vec, vnames in zip(vecs, names):
+            idxs = []
+            layout = []
+            extras = []
+            byobjs = []
+            offset = 0
+            for name in vnames:
+                meta = vec.metadata(name)
+                if meta.get('pass_by_obj'):
+                    byobjs.append(name)
+                elif name in vec._slices:
+                    start, end = vec._slices[name]
+                    idxs.append(np.arange(start, end))
+                    layout.append((name, offset, offset + end - start,
+                                   meta['shape'], meta['shape'] == 1))
+                    offset += end - start
+
+            # params that a group doesn't own are views into the vector of
+            # its parent, so they're copied one at a time.
+            for name in vnames:
+                meta = vec.metadata(name)
+                if not (meta.get('pass_by_obj') or meta.get('remote') or
+                        name in vec._slices):
+                    extras.append((offset, offset + meta['size'], meta['val']))
+                    layout.append((name, offset, offset + meta['size'],
+                                   meta['shape'], meta['shape'] == 1))
+                    offset += meta['size']
+
+            self.idxs.append(np.concatenate(idxs) if idxs else np.zeros(0, dtype=int))
+            self.extras.append(extras)
+            self.layouts.append(layout)
+            self.byobj_names.append(byobjs)
+            self.bufs.append(np.empty((size, offset)))
+
+        # scalars are pulled out of a row with a single gather
+        self.arrays = [[(name, start, end, shape)
+                        for name, start, end, shape, scalar in layout if not scalar]
+                       for layout in self.layouts]
+        self.scalars = []
+        for layout in self.layouts:
+            scalars = [(name, start) for name, start, _, _, scalar in layout if scalar]
+            self.scalars.append(([name for name, _ in scalars],
+                                 np.array([start for _, start in scalars], dtype=int)))
+
+        self.free = queue.Queue()
+        for slot in range(size):
+            self.free.put(slot)
+
+    def take(self, slot, copy_byobjs=True):
+        """
+        Copies the current values of the variables into a slot.
+
+        Args
+        ----
+        slot : int
+            Row of the buffer to copy into.
+
+        copy_byobjs : bool, optional
+            If False, variables that are passed by object aren't copied.
+
+        Returns
+        -------
+        list of dict
+            Copies of the variables that are passed by object, which
+            don't live in the vectors.
+        """
+        byobjs = []
+        for vec, idxs, extras, buf, names in zip(self.vecs, self.idxs, self.extras,
+                                                 self.bufs, self.byobj_names):
+            row = buf[slot]
+            np.take(vec.vec, idxs, out=row[:len(idxs)])
+            for start, end, val in extras:
+                row[start:end] = val
+            if copy_byobjs:
+                byobjs.append(dict((name, deepcopy(vec[name])) for name in names))
+            else:
+                byobjs.append(dict((name, vec[name]) for name in names))
+        return byobjs
+
+    def case(self, slot, byobjs):
+        """
+        Args
+        ----
+        slot : int
+            Row of the buffer holding the case.
+
+        byobjs : list of dict
+            Variables passed by object, as returned by `take`.
+
+        Returns
+        -------
+        tuple of dict
+            The params, unknowns and resids of the case. Array values are
+            views into a copy of the row, so they stay valid after the slot
+            is reused.
+        """
+        case = []
+        for buf, arrays, scalars, byobj in zip(self.bufs, self.arrays,
+                                               self.scalars, byobjs):
+            row = buf[slot].copy()
+            names, idxs = scalars
+            data = dict((name, row[start:end].reshape(shape))
+                        for name, start, end, shape in arrays)
+            data.update(zip(names, row.take(idxs)))
+            data.update(byobj)
+            case.append(data)
+        return tuple(case)
@@ -0,0 +1,437 @@
+""" Readers for the files written by the case recorders."""
+
+import json
+import os
+import shelve
+import sqlite3
+
+import numpy as np
+
+_SQLITE_MAGIC = b'SQLite format 3\x00'
+_HDF5_MAGIC = b'\x89HDF\r\n\x1a\n'
+
+
+def CaseReader(filename):
+    """
+    Opens a file written by `HDF5Recorder`, `SqliteRecorder` or
+    `ShelveRecorder`, without reading any cases.
+
+    Args
+    ----
+    filename : str
+        Name of the file, as given to the recorder.
+
+    Returns
+    -------
+    `BaseCaseReader`
+        A reader for the file.
+    """
+    magic = b''
+    if os.path.isfile(filename):
+        with open(filename, 'rb') as f:
+            magic = f.read(16)
+
+    if magic.startswith(_SQLITE_MAGIC):
+        return SqliteCaseReader(filename)
+    if magic.startswith(_HDF5_MAGIC):
+        return HDF5CaseReader(filename)
+
+    # shelve may add a suffix to the filename, so that's all that's left
+    return ShelveCaseReader(filename)
+
+
+def _match_prefix(coords, prefix):
+    """
+    Args
+    ----
+    coords : ndarray of str
+        Formatted iteration coordinates.
+
+    prefix : str
+        A formatted iteration coordinate, or the start of one. Only whole
+        entries of the coordinate match, so 'Driver/1' doesn't match
+        'Driver/10'.
+
+    Returns
+    -------
+    ndarray of bool
+        True for each of `coords` that starts with `prefix`.
+    """
+    coords = np.asarray(coords, dtype=str)
+    return (coords == prefix) | np.char.startswith(coords, prefix + '/')
+
+
+class BaseCaseReader(object):
+    """
+    Base class for case readers. Cases are only read when asked for, and
+    only the requested variable is read.
+
+    Args
+    ----
+    filename : str
+        Name of the file.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def coordinates(self, prefix=''):
+        """
+        Args
+        ----
+        prefix : str, optional
+            Only include cases whose formatted iteration coordinate starts
+            with this, e.g. 'Driver/1/root'.
+
+        Returns
+        -------
+        list of str
+            The formatted iteration coordinates of the cases, in the order
+            they were recorded.
+        """
+        raise NotImplementedError("coordinates")
+
+    def get(self, name, kind='Unknowns', prefix=''):
+        """
+        Returns the values of one variable in all of the cases that
+        recorded it.
+
+        Args
+        ----
+        name : str
+            Name of the variable, as recorded.
+
+        kind : str, optional
+            'Parameters', 'Unknowns' or 'Residuals'.
+
+        prefix : str, optional
+            Only include cases whose formatted iteration coordinate starts
+            with this, e.g. 'Driver/1/root'.
+
+        Returns
+        -------
+        ndarray
+            The values, one row per case, in the order they were recorded.
+        """
+        raise NotImplementedError("get")
+
+    def close(self):
+        """ Closes the file."""
+        pass
+
+
+class HDF5CaseReader(BaseCaseReader):
+    """
+    Reads the columns written by `HDF5Recorder`. A variable is read with
+    a single read of its dataset in each matching group of cases, and the
+    coordinates are only read when filtering by a prefix. Datasets that are
+    stored contiguously and uncompressed are memory mapped instead. Cases
+    in a group that didn't record the variable give rows of NaN.
+
+    Args
+    ----
+    filename : str
+        Name of the file.
+    """
+
+    def __init__(self, filename):
+        super(HDF5CaseReader, self).__init__(filename)
+        from h5py import File
+        self._file = File(filename, 'r')
+
+        # groups of cases, keyed on the system names in their coordinates
+        self._tables = {}
+
+        def _find_tables(name, obj):
+            if name.endswith('/coordinates') or name == 'coordinates':
+                table = name.rsplit('coordinates', 1)[0].rstrip('/')
+                self._tables[table] = self._file[table] if table else self._file
+        self._file.visititems(_find_tables)
+
+    def _rows(self, prefix):
+        """
+        Yields each group of cases that may match `prefix`, with the rows of
+        the matching cases (a slice or a boolean mask).
+        """
+        names = prefix.split('/')[::2] if prefix else []
+        for table, group in sorted(self._tables.items()):
+            if table.split('/')[:len(names)] != names:
+                continue
+            if prefix:
+                yield group, _match_prefix(group['coordinates'][:], prefix)
+            else:
+                yield group, slice(None)
+
+    def coordinates(self, prefix=''):
+        """
+        Args
+        ----
+        prefix : str, optional
+            Only include cases whose formatted iteration coordinate starts
+            with this, e.g. 'Driver/1/root'.
+
+        Returns
+        -------
+        list of str
+            The formatted iteration coordinates of the cases, in the order
+            they were recorded.
+        """
+        coords = []
+        index = []
+        for group, rows in self._rows(prefix):
+            coords.extend(np.asarray(group['coordinates'][:], dtype=object)[rows])
+            index.extend(group['index'][:][rows])
+        return [coords[i] for i in np.argsort(index, kind='mergesort')]
+
+    def get(self, name, kind='Unknowns', prefix=''):
+        """
+        Returns the values of one variable in all of the cases that
+        recorded it.
+
+        Args
+        ----
+        name : str
+            Name of the variable, as recorded.
+
+        kind : str, optional
+            'Parameters', 'Unknowns' or 'Residuals'.
+
+        prefix : str, optional
+            Only include cases whose formatted iteration coordinate starts
+            with this, e.g. 'Driver/1/root'.
+
+        Returns
+        -------
+        ndarray
+            The values, one row per case, in the order they were recorded.
+        """
+        path = '%s/%s' % (kind, name)
+        vals = []
+        index = []
+        for group, rows in self._rows(prefix):
+            if path not in group:
+                continue
+            dset = _array(group[path])
+            if isinstance(rows, slice):
+                vals.append(dset[...])
+                index.append(group['index'][...])
+            else:
+                # only read the block of rows that holds the matches
+                idxs = np.nonzero(rows)[0]
+                if len(idxs):
+                    block = slice(idxs[0], idxs[-1] + 1)
+                    vals.append(dset[block][rows[block]])
+                    index.append(group['index'][block][rows[block]])
+
+        if not vals:
+            raise KeyError("Variable '%s' not found in %s." % (name, kind))
+        if len(vals) == 1:
+            return vals[0]
+
+        order = np.argsort(np.concatenate(index), kind='mergesort')
+        return np.concatenate(vals)[order]
+
+    def close(self):
+        """ Closes the file."""
+        self._file.close()
+
+
+def _array(dset):
+    """
+    Args
+    ----
+    dset : h5py.Dataset
+        A dataset.
+
+    Returns
+    -------
+    ndarray or h5py.Dataset
+        A read-only memory map of the dataset if it's stored contiguously
+        and uncompressed, otherwise the dataset itself.
+    """
+    if dset.chunks is None and dset.compression is None and dset.size:
+        offset = dset.id.get_offset()
+        if offset is not None:
+            return np.memmap(dset.file.filename, mode='r', dtype=dset.dtype,
+                             offset=offset, shape=dset.shape)
+    return dset
+
+
+class SqliteCaseReader(BaseCaseReader):
+    """
+    Reads the database written by `SqliteRecorder`. Cases are selected
+    with a range query on the indexed coordinate, and only the part of each
+    blob that holds the variable is read.
+
+    Args
+    ----
+    filename : str
+        Name of the database.
+    """
+
+    def __init__(self, filename):
+        super(SqliteCaseReader, self).__init__(filename)
+        self._db = sqlite3.connect(filename)
+
+    def _where(self, prefix):
+        """ Returns the WHERE clause and its args that select the cases
+        whose coordinates start with `prefix`."""
+        if not prefix:
+            return '', ()
+        # '0' is the character after '/'
+        return ("WHERE (cases.coord = ? OR (cases.coord >= ? AND cases.coord < ?))",
+                (prefix, prefix + '/', prefix + '0'))
+
+    def coordinates(self, prefix=''):
+        """
+        Args
+        ----
+        prefix : str, optional
+            Only include cases whose formatted iteration coordinate starts
+            with this, e.g. 'Driver/1/root'.
+
+        Returns
+        -------
+        list of str
+            The formatted iteration coordinates of the cases, in the order
+            they were recorded.
+        """
+        where, args = self._where(prefix)
+        return [row[0] for row in
+                self._db.execute("SELECT coord FROM cases %s ORDER BY id" % where, args)]
+
+    def get(self, name, kind='Unknowns', prefix=''):
+        """
+        Returns the values of one variable in all of the cases that
+        recorded it.
+
+        Args
+        ----
+        name : str
+            Name of the variable, as recorded.
+
+        kind : str, optional
+            'Parameters', 'Unknowns' or 'Residuals'.
+
+        prefix : str, optional
+            Only include cases whose formatted iteration coordinate starts
+            with this, e.g. 'Driver/1/root'.
+
+        Returns
+        -------
+        ndarray
+            The values, one row per case, in the order they were recorded,
+            or a list of them if the shape of the variable differs between
+            cases.
+        """
+        column = {'Parameters': 'params', 'Unknowns': 'unknowns',
+                  'Residuals': 'resids'}[kind]
+
+        # layouts are few, so look them up first
+        layouts = {}
+        for layout, start, end, shape in self._db.execute(
+                "SELECT layout, start, end, shape FROM variables "
+                "WHERE kind=? AND name=?", (kind, name)):
+            layouts[layout] = (start, end - start, json.loads(shape))
+        if not layouts:
+            raise KeyError("Variable '%s' not found in %s." % (name, kind))
+
+        # only the bytes of the variable are read from each blob, one
+        # layout at a time
+        where, args = self._where(prefix)
+        where = (where + ' AND' if where else 'WHERE') + ' cases.layout = ?'
+        ids = []
+        vals = []
+        for layout, (start, size, shape) in layouts.items():
+            for row_id, data in self._db.execute(
+                    "SELECT id, substr(%s, ?, ?) FROM cases %s" % (column, where),
+                    (8*start + 1, 8*size) + args + (layout,)):
+                ids.append(row_id)
+                vals.append(np.frombuffer(data, dtype=np.float64))
+
+        vals = [vals[i] for i in np.argsort(ids, kind='mergesort')]
+
+        shapes = set(tuple(np.atleast_1d(s[2])) for s in layouts.values())
+        if len(shapes) > 1:
+            return vals
+        shape = shapes.pop()
+        if shape == (1,):
+            shape = ()
+        if not vals:
+            return np.zeros((0,) + shape)
+        return np.concatenate(vals).reshape((len(vals),) + shape)
+
+    def close(self):
+        """ Closes the database."""
+        self._db.close()
+
+
+class ShelveCaseReader(BaseCaseReader):
+    """
+    Reads the file written by `ShelveRecorder`. Each case is pickled as a
+    whole, so only the cases that match are read, but all of each of
+    them.
+
+    Args
+    ----
+    filename : str
+        Name of the file, as given to the recorder.
+    """
+
+    def __init__(self, filename):
+        super(ShelveCaseReader, self).__init__(filename)
+        self._shelf = shelve.open(filename, 'r')
+
+    def coordinates(self, prefix=''):
+        """
+        Args
+        ----
+        prefix : str, optional
+            Only include cases whose formatted iteration coordinate starts
+            with this, e.g. 'Driver/1/root'.
+
+        Returns
+        -------
+        list of str
+            The formatted iteration coordinates of the cases, in the order
+            they were recorded.
+        """
+        order = self._shelf['order']
+        if not prefix or not order:
+            return list(order)
+        return [c for c, match in zip(order, _match_prefix(order, prefix)) if match]
+
+    def get(self, name, kind='Unknowns', prefix=''):
+        """
+        Returns the values of one variable in all of the cases that
+        recorded it.
+
+        Args
+        ----
+        name : str
+            Name of the variable, as recorded.
+
+        kind : str, optional
+            'Parameters', 'Unknowns' or 'Residuals'.
+
+        prefix : str, optional
+            Only include cases whose formatted iteration coordinate starts
+            with this, e.g. 'Driver/1/root'.
+
+        Returns
+        -------
+        ndarray
+            The values, one row per case, in the order they were recorded.
+        """
+        vals = []
+        for coord in self.coordinates(prefix):
+            data = self._shelf[coord][kind]
+            if name in data:
+                vals.append(data[name])
+        if not vals:
+            raise KeyError("Variable '%s' not found in %s." % (name, kind))
+        return np.array(vals)
+
+    def close(self):
+        """ Closes the file."""
+        self._shelf.close()
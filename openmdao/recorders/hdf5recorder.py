@@ -4,17 +4,34 @@ from numbers import Number
 
 import numpy as np
 
-from h5py import File
+from h5py import File, special_dtype
 
 from openmdao.recorders.baserecorder import BaseRecorder
 from openmdao.util.recordutil import format_iteration_coordinate
 
+# Chunks hold at most this many bytes of a variable.
+_CHUNK_BYTES = 1 << 16
+
 
 class HDF5Recorder(BaseRecorder):
     """
     A recorder that stores data using HDF5. This format naturally handles
     hierarchical data and is a standard for handling large datasets.
 
+    Cases are stored in columns. All of the cases recorded at the same level
+    of execution (e.g. the driver, or the solver of one `Group`) go into the
+    same HDF5 group, named after the system names in their iteration
+    coordinate, e.g. 'Driver/root/G1'. That group holds a 'coordinates'
+    dataset with the formatted iteration coordinate of each case, an
+    'index' dataset with the order in which the cases were recorded, and
+    'Parameters', 'Unknowns' and 'Residuals' groups with one resizable,
+    chunked and compressed dataset per variable. Row i of each of these
+    datasets belongs to the same case, and the rows of cases that didn't
+    record a variable are NaN.
+
+    Cases are buffered in memory and written out `buffer_size` at a time,
+    so `flush` (or `close`) must be called before reading the file.
+
     Args
     ----
     out : str
@@ -27,12 +44,23 @@ class HDF5Recorder(BaseRecorder):
     def __init__(self, out, **driver_kwargs):
 
         super(HDF5Recorder, self).__init__()
+        self.options.add_option('buffer_size', 100, low=1,
+                                desc='Number of cases to keep in memory before '
+                                'writing them to the file')
+        self.options.add_option('compression', 'gzip', values=['gzip', 'lzf', 'none'],
+                                desc='Compression filter applied to the variable '
+                                'datasets')
+
         self.out = File(out, 'w', **driver_kwargs)
 
+        self._num_cases = 0
+        self._buffers = {}
+        self._num_buffered = 0
+
     def record(self, params, unknowns, resids, metadata):
         """
-        Stores the provided data in the HDF5 file using the iteration
-        coordinate for the Group name.
+        Buffers the provided data, and writes out the buffered cases if there
+        are `buffer_size` of them.
 
         Args
         ----
@@ -48,27 +76,182 @@ class HDF5Recorder(BaseRecorder):
         metadata : dict, optional
             Dictionary containing execution metadata (e.g. iteration coordinate).
         """
+        if self.out is None:
+            return
 
         iteration_coordinate = metadata['coord']
-        group_name = format_iteration_coordinate(iteration_coordinate)
-
-        f = self.out
+        table = '/'.join(iteration_coordinate[::2])
 
-        group = f.require_group(group_name)
-        p_group = group.create_group("Parameters")
-        u_group = group.create_group("Unknowns")
-        r_group = group.create_group("Residuals")
+        buf = self._buffers.get(table)
+        if buf is None:
+            buf = self._buffers[table] = _CaseBuffer(self.options['buffer_size'])
 
-        pairings = ((p_group, params),
-                    (u_group, unknowns),
-                    (r_group, resids))
+        row = len(buf.coords)
+        buf.coords.append(format_iteration_coordinate(iteration_coordinate))
+        buf.index.append(self._num_cases)
 
-        for grp, data in pairings:
+        for name, data in (('Parameters', params),
+                           ('Unknowns', unknowns),
+                           ('Residuals', resids)):
+            columns = buf.columns[name]
             for key, val in data.items():
-                if isinstance(val, (np.ndarray, Number)):
-                    grp.create_dataset(key, data=val)
-                    # TODO: Compression/Checksum?
-                else:
-                    # TODO: Handling non-numeric data
-                    msg = "HDF5 Recorder does not support data of type '{0}'".format(type(val))
-                    raise NotImplementedError(msg)
+                block = columns.get(key)
+                if block is None:
+                    if not isinstance(val, (np.ndarray, Number)):
+                        # TODO: Handling non-numeric data
+                        msg = "HDF5 Recorder does not support data of type '{0}'"
+                        raise NotImplementedError(msg.format(type(val)))
+                    block = columns[key] = buf.new_block(val)
+                # copies the value, which may be a view of a vector that
+                # changes before we get around to writing it.
+                block[row] = val
+
+        self._num_cases += 1
+        self._num_buffered += 1
+        if self._num_buffered >= self.options['buffer_size']:
+            self._write_buffers()
+
+    def flush(self):
+        """ Writes all buffered cases to the file."""
+        super(HDF5Recorder, self).flush()
+        self._write_buffers()
+
+    def _write_buffers(self):
+        """ Writes the cases in our buffers to the file."""
+        if self.out is None:
+            return
+
+        for table, buf in self._buffers.items():
+            if buf.coords:
+                self._write_table(self.out.require_group(table), buf)
+        self._buffers = {}
+        self._num_buffered = 0
+        self.out.flush()
+
+    def _write_table(self, group, buf):
+        """
+        Appends the cases in a `_CaseBuffer` to the datasets in `group`.
+
+        Args
+        ----
+        group : h5py.Group
+            HDF5 group holding the cases of one level of execution.
+
+        buf : `_CaseBuffer`
+            The buffered cases.
+        """
+        nrows = len(buf.coords)
+        start = group['coordinates'].shape[0] if 'coordinates' in group else 0
+
+        _append(group, 'coordinates', np.array(buf.coords, dtype=object),
+                dtype=special_dtype(vlen=str))
+        _append(group, 'index', np.array(buf.index, dtype=np.int64))
+
+        compression = self.options['compression']
+        if compression == 'none':
+            compression = None
+
+        for name, columns in buf.columns.items():
+            sub = group.require_group(name)
+            for key, block in columns.items():
+                rows = block[:nrows]
+                if start and key not in sub:
+                    # the variable wasn't in any of the cases written before
+                    rows = np.concatenate((_nans((start,) + rows.shape[1:],
+                                                 rows.dtype), rows))
+                _append(sub, key, rows, compression=compression,
+                        chunk_rows=buf.size)
+
+            # variables that weren't in any of these cases
+            for key, dset in sub.items():
+                if key not in columns:
+                    _append(sub, key, _nans((nrows,) + dset.shape[1:], dset.dtype))
+
+
+class _CaseBuffer(object):
+    """
+    Cases from one level of execution that haven't been written yet. The
+    values of each variable are kept in a preallocated block with a row per
+    case.
+
+    Args
+    ----
+    size : int
+        Maximum number of cases in the buffer.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.coords = []
+        self.index = []
+        self.columns = {'Parameters': {}, 'Unknowns': {}, 'Residuals': {}}
+
+    def new_block(self, val):
+        """
+        Args
+        ----
+        val : ndarray or Number
+            First value of a variable.
+
+        Returns
+        -------
+        ndarray
+            A block for the values of the variable, filled with NaN for the
+            cases that don't record it.
+        """
+        val = np.asarray(val)
+        dtype = np.result_type(val.dtype, np.float64)
+        return _nans((self.size,) + val.shape, dtype)
+
+
+def _nans(shape, dtype):
+    """ Returns an array of the given shape and dtype filled with NaN."""
+    nans = np.empty(shape, dtype=dtype)
+    nans.fill(np.nan)
+    return nans
+
+
+def _append(group, name, rows, dtype=None, compression=None, chunk_rows=None):
+    """
+    Appends rows to a dataset, creating the dataset if it doesn't exist.
+
+    Args
+    ----
+    group : h5py.Group
+        Group containing the dataset.
+
+    name : str
+        Name of the dataset.
+
+    rows : ndarray
+        The new rows, stacked along the first axis.
+
+    dtype : numpy dtype, optional
+        dtype of the dataset, if it differs from that of `rows`.
+
+    compression : str, optional
+        Compression filter to use if the dataset is created.
+
+    chunk_rows : int, optional
+        Number of rows per chunk if the dataset is created. Writing whole
+        chunks at a time keeps HDF5 from recompressing a chunk on every
+        write. Chunks are made smaller if they would be too large.
+    """
+    if name in group:
+        dset = group[name]
+        start = dset.shape[0]
+        dset.resize(start + rows.shape[0], axis=0)
+        dset[start:] = rows
+    else:
+        shape = rows.shape[1:]
+        if dtype is None:
+            dtype = rows.dtype
+        row_bytes = max(int(np.prod(shape)), 1) * np.dtype(dtype).itemsize
+        if chunk_rows is None:
+            chunk_rows = rows.shape[0]
+        chunk_rows = max(1, min(chunk_rows, _CHUNK_BYTES // row_bytes))
+        group.create_dataset(name, data=rows, dtype=dtype,
+                             maxshape=(None,) + shape,
+                             chunks=(chunk_rows,) + shape,
+                             compression=compression,
+                             shuffle=compression is not None)
@@ -0,0 +1,191 @@
+""" Class definition for SqliteRecorder, which stores cases in an SQLite
+database."""
+
+import json
+import sqlite3
+from numbers import Number
+
+import numpy as np
+from six.moves import cPickle as pickle
+
+from openmdao.recorders.baserecorder import BaseRecorder
+from openmdao.util.recordutil import format_iteration_coordinate
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    id INTEGER PRIMARY KEY,
+    coord TEXT,
+    driver_iter INTEGER,
+    pathname TEXT,
+    layout INTEGER,
+    params BLOB,
+    unknowns BLOB,
+    resids BLOB,
+    objects BLOB
+);
+CREATE TABLE IF NOT EXISTS variables (
+    layout INTEGER,
+    kind TEXT,
+    name TEXT,
+    start INTEGER,
+    end INTEGER,
+    shape TEXT
+);
+CREATE INDEX IF NOT EXISTS cases_coord ON cases (coord);
+CREATE INDEX IF NOT EXISTS cases_driver_iter ON cases (driver_iter);
+CREATE INDEX IF NOT EXISTS cases_pathname ON cases (pathname);
+CREATE INDEX IF NOT EXISTS variables_layout ON variables (layout);
+"""
+
+_KINDS = ('Parameters', 'Unknowns', 'Residuals')
+
+
+class SqliteRecorder(BaseRecorder):
+    """
+    A recorder that stores cases in an SQLite database.
+
+    There is a row in the 'cases' table for every case, holding the
+    formatted iteration coordinate, the driver iteration, the pathname of
+    the recorded system, and the params, unknowns and resids of the case.
+    The numeric values of each of those are packed into a single blob of
+    float64s, and any other values are pickled into the 'objects' blob.
+    Where each variable lives in the blobs is given by the rows of the
+    'variables' table for the case's layout. The 'cases' table is indexed
+    on coordinate, driver iteration and pathname.
+
+    Cases are inserted `batch_size` at a time, each batch in one
+    transaction.
+
+    Args
+    ----
+    out : str
+        Filename of the database, or ':memory:'.
+
+    **connect_args
+        Additional keyword args to be passed to sqlite3.connect().
+    """
+
+    def __init__(self, out, **connect_args):
+        super(SqliteRecorder, self).__init__()
+        self.options.add_option('batch_size', 1000, low=1,
+                                desc='Number of cases to insert in each transaction')
+
+        # cases may be recorded from the thread used for async recording
+        connect_args.setdefault('check_same_thread', False)
+        self.out = sqlite3.connect(out, **connect_args)
+        self.out.executescript(_SCHEMA)
+        self.out.commit()
+
+        cursor = self.out.execute("SELECT MAX(layout) FROM variables")
+        last = cursor.fetchone()[0]
+        self._num_layouts = 0 if last is None else last + 1
+        self._layouts = {}
+        self._pending = []
+
+    def record(self, params, unknowns, resids, metadata):
+        """
+        Queues the provided data for insertion into the database, and
+        inserts the queued cases if there are `batch_size` of them.
+
+        Args
+        ----
+        params : dict
+            Dictionary containing parameters. (p)
+
+        unknowns : dict
+            Dictionary containing outputs and states. (u)
+
+        resids : dict
+            Dictionary containing residuals. (r)
+
+        metadata : dict, optional
+            Dictionary containing execution metadata (e.g. iteration coordinate).
+        """
+        if self.out is None:
+            return
+
+        coord = metadata['coord']
+
+        blobs = []
+        objects = {}
+        signature = []
+        for kind, data in zip(_KINDS, (params, unknowns, resids)):
+            # scalars are packed first, then arrays
+            scalars = []
+            arrays = []
+            array_sig = []
+            for name in sorted(data):
+                val = data[name]
+                if isinstance(val, np.ndarray) and val.dtype.kind in 'biuf':
+                    arrays.append(val.ravel())
+                    array_sig.append((kind, name, val.shape))
+                elif isinstance(val, Number) and not isinstance(val, complex):
+                    scalars.append(val)
+                    signature.append((kind, name, 1))
+                else:
+                    objects[(kind, name)] = val
+            signature.extend(array_sig)
+
+            if arrays:
+                arrays.insert(0, np.array(scalars, dtype=np.float64))
+                blobs.append(np.concatenate(arrays).astype(np.float64).tobytes())
+            else:
+                blobs.append(np.array(scalars, dtype=np.float64).tobytes())
+
+        layout = self._get_layout(tuple(signature))
+
+        self._pending.append((format_iteration_coordinate(coord), coord[1][0],
+                              '.'.join(coord[4::2]), layout, blobs[0], blobs[1],
+                              blobs[2],
+                              pickle.dumps(objects, pickle.HIGHEST_PROTOCOL)
+                              if objects else None))
+
+        if len(self._pending) >= self.options['batch_size']:
+            self._insert()
+
+    def _get_layout(self, signature):
+        """
+        Returns the id of the layout of cases with the given variables,
+        adding the layout to the 'variables' table if it's new.
+
+        Args
+        ----
+        signature : tuple
+            (kind, name, shape) of each numeric variable in the case, in the
+            order they are packed.
+
+        Returns
+        -------
+        int
+            Id of the layout.
+        """
+        layout = self._layouts.get(signature)
+        if layout is None:
+            layout = self._layouts[signature] = self._num_layouts
+            self._num_layouts += 1
+
+            rows = []
+            offsets = dict((kind, 0) for kind in _KINDS)
+            for kind, name, shape in signature:
+                start = offsets[kind]
+                end = offsets[kind] = start + int(np.prod(shape))
+                rows.append((layout, kind, name, start, end, json.dumps(shape)))
+            self.out.executemany("INSERT INTO variables VALUES (?,?,?,?,?,?)", rows)
+
+        return layout
+
+    def _insert(self):
+        """ Inserts all queued cases in one transaction."""
+        if self.out is None:
+            return
+
+        with self.out:
+            self.out.executemany("INSERT INTO cases (coord, driver_iter, pathname, layout, "
+                                 "params, unknowns, resids, objects) "
+                                 "VALUES (?,?,?,?,?,?,?,?)", self._pending)
+        self._pending = []
+
+    def flush(self):
+        """ Inserts all queued cases into the database."""
+        super(SqliteRecorder, self).flush()
+        self._insert()
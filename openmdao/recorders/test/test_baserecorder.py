@@ -0,0 +1,146 @@
+""" Unit test for filtering and asynchronous recording in BaseRecorder. """
+
+import time
+import unittest
+
+import numpy as np
+
+from openmdao.components.execcomp import ExecComp
+from openmdao.components.paramcomp import ParamComp
+from openmdao.core.group import Group
+from openmdao.core.problem import Problem
+from openmdao.recorders.baserecorder import BaseRecorder, _compile_filter
+from openmdao.test.sellar import SellarDerivativesGrouped
+
+
+class _ListRecorder(BaseRecorder):
+    """ Keeps copies of everything it records."""
+
+    def __init__(self, delay=0.0, fail_at=None):
+        super(_ListRecorder, self).__init__()
+        self.delay = delay
+        self.fail_at = fail_at
+        self.cases = []
+
+    def record(self, params, unknowns, resids, metadata):
+        if len(self.cases) == self.fail_at:
+            raise RuntimeError("can't record")
+        time.sleep(self.delay)
+        self.cases.append((dict((k, np.array(v)) for k, v in params.items()),
+                           dict((k, np.array(v)) for k, v in unknowns.items()),
+                           dict((k, np.array(v)) for k, v in resids.items()),
+                           list(metadata['coord'])))
+
+
+def _run(recorder):
+    prob = Problem(SellarDerivativesGrouped())
+    prob.root.mda.nl_solver.add_recorder(recorder)
+    prob.driver.add_recorder(recorder)
+    prob.setup(check=False)
+    prob.run()
+    return prob
+
+
+class TestFiltering(unittest.TestCase):
+
+    def test_compile_filter(self):
+        check = _compile_filter(['*'], []).match
+        self.assertTrue(check('d1.y1'))
+
+        check = _compile_filter(['d1.*', 'z'], ['*.y2']).match
+        self.assertTrue(check('d1.y1'))
+        self.assertTrue(check('z'))
+        self.assertFalse(check('d1.y2'))
+        self.assertFalse(check('d2.y1'))
+        self.assertFalse(check('zz'))
+
+        self.assertFalse(_compile_filter([], []).match('z'))
+
+    def test_record(self):
+        recorder = _ListRecorder()
+        recorder.options['includes'] = ['*y*', 'z', 'x']
+        recorder.options['excludes'] = ['*y2']
+        prob = _run(recorder)
+        recorder.close()
+
+        params, unknowns, resids, coord = recorder.cases[-1]
+        self.assertEqual(coord[:2], ['Driver', (1,)])
+        self.assertEqual(sorted(params), ['con_cmp1.y1', 'obj_cmp.y1'])
+        self.assertEqual(sorted(unknowns), ['x', 'y1', 'z'])
+        self.assertEqual(sorted(resids), ['x', 'y1', 'z'])
+        for name in unknowns:
+            self.assertTrue(np.all(unknowns[name] == prob.root.unknowns[name]))
+        for name in params:
+            self.assertTrue(np.all(params[name] == prob.root.params[name]))
+        self.assertEqual(unknowns['x'].shape, ())
+        self.assertEqual(unknowns['z'].shape, (2,))
+
+    def test_keep_references(self):
+        # a recorder that keeps the dicts it's given must get a copy of
+        # each case, not the buffer that the next case is gathered into
+        class _RefRecorder(BaseRecorder):
+            def __init__(self):
+                super(_RefRecorder, self).__init__()
+                self.cases = []
+
+            def record(self, params, unknowns, resids, metadata):
+                self.cases.append(unknowns)
+
+        recorder = _RefRecorder()
+        prob = Problem(Group())
+        prob.root.add('p', ParamComp('x', np.zeros(3)))
+        prob.root.add('comp', ExecComp('y = 2.0*x', x=np.zeros(3), y=np.zeros(3)))
+        prob.root.connect('p.x', 'comp.x')
+        prob.driver.add_recorder(recorder)
+        prob.setup(check=False)
+
+        for i in range(3):
+            prob['p.x'] = i*np.ones(3)
+            prob.run()
+
+        self.assertEqual(len(recorder.cases), 3)
+        for i, unknowns in enumerate(recorder.cases):
+            self.assertTrue(np.all(unknowns['comp.y'] == 2.0*i))
+
+
+class TestAsyncRecording(unittest.TestCase):
+
+    def test_same_cases(self):
+        sync = _ListRecorder()
+        _run(sync)
+        sync.close()
+
+        # a slow recorder with a tiny queue, so the solver has to wait
+        recorder = _ListRecorder(delay=0.001)
+        recorder.options['async'] = True
+        recorder.options['queue_size'] = 2
+        _run(recorder)
+
+        recorder.close()
+        self.assertEqual(recorder._writer, None)
+
+        self.assertTrue(len(sync.cases) > 5)
+        self.assertEqual(len(recorder.cases), len(sync.cases))
+        for case, expected in zip(recorder.cases, sync.cases):
+            self.assertEqual(case[3], expected[3])
+            for actual, exp in zip(case[:3], expected[:3]):
+                self.assertEqual(sorted(actual), sorted(exp))
+                for name in exp:
+                    self.assertEqual(actual[name].shape, exp[name].shape)
+                    self.assertTrue(np.all(actual[name] == exp[name]))
+
+    def test_error(self):
+        recorder = _ListRecorder(fail_at=3)
+        recorder.options['async'] = True
+
+        with self.assertRaises(RuntimeError) as cm:
+            _run(recorder)
+            recorder.close()
+
+        self.assertEqual(str(cm.exception), "can't record")
+        recorder.close()
+        self.assertEqual(len(recorder.cases), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
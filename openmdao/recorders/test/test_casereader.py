@@ -0,0 +1,159 @@
+""" Unit test for the case readers. """
+
+import errno
+import os
+import unittest
+from shutil import rmtree
+from tempfile import mkdtemp
+
+import numpy as np
+
+from openmdao.recorders.casereader import CaseReader, HDF5CaseReader, \
+     ShelveCaseReader, SqliteCaseReader
+from openmdao.recorders.shelverecorder import ShelveRecorder
+from openmdao.recorders.sqliterecorder import SqliteRecorder
+
+try:
+    from openmdao.recorders.hdf5recorder import HDF5Recorder
+except ImportError:
+    HDF5Recorder = None
+
+
+class CaseReaderTests(object):
+    """ Wrapped so that the base tests aren't run on their own."""
+
+    class Tests(unittest.TestCase):
+
+        reader_class = None
+
+        def make_recorder(self, filename):
+            raise NotImplementedError()
+
+        def setUp(self):
+            self.dir = mkdtemp()
+            self.filename = os.path.join(self.dir, 'cases')
+
+            recorder = self.make_recorder(self.filename)
+            for i in range(12):
+                recorder.record({'x': float(i)}, {'y': i*np.ones((2, 3))},
+                                {'y': np.zeros((2, 3))},
+                                {'coord': ['Driver', (i,), 'root', (1,), 'G1', (1,)]})
+                recorder.record({'x': float(i)}, {'y': -i*np.ones((2, 3)), 'z': 2.0*i},
+                                {'y': np.zeros((2, 3)), 'z': 0.0},
+                                {'coord': ['Driver', (i,), 'root', (1,)]})
+            recorder.close()
+
+            self.reader = CaseReader(self.filename)
+
+        def tearDown(self):
+            self.reader.close()
+            try:
+                rmtree(self.dir)
+            except OSError as e:
+                # If directory already deleted, keep going
+                if e.errno != errno.ENOENT:
+                    raise e
+
+        def test_type(self):
+            self.assertTrue(isinstance(self.reader, self.reader_class))
+
+        def test_coordinates(self):
+            coords = self.reader.coordinates()
+            self.assertEqual(len(coords), 24)
+            self.assertEqual(coords[:3], ['Driver/0/root/1/G1/1', 'Driver/0/root/1',
+                                          'Driver/1/root/1/G1/1'])
+
+            # whole entries only, so 'Driver/1' doesn't match 'Driver/10'
+            self.assertEqual(self.reader.coordinates('Driver/1'),
+                             ['Driver/1/root/1/G1/1', 'Driver/1/root/1'])
+            self.assertEqual(self.reader.coordinates('Driver/1/root/1/G1'),
+                             ['Driver/1/root/1/G1/1'])
+            self.assertEqual(self.reader.coordinates('Driver/1/root/2'), [])
+
+        def test_get(self):
+            z = self.reader.get('z')
+            self.assertEqual(z.shape, (12,))
+            np.testing.assert_array_equal(z, 2.0*np.arange(12))
+
+            # 'y' is recorded at both levels, in the order it was recorded
+            y = self.reader.get('y')
+            self.assertEqual(y.shape, (24, 2, 3))
+            expected = np.array([[i, -i] for i in range(12)]).ravel()
+            np.testing.assert_array_equal(y[:, 1, 2], expected)
+
+            y = self.reader.get('y', prefix='Driver/1/root/1/G1')
+            self.assertEqual(y.shape, (1, 2, 3))
+            np.testing.assert_array_equal(y[0], np.ones((2, 3)))
+
+            x = self.reader.get('x', kind='Parameters', prefix='Driver/11')
+            np.testing.assert_array_equal(x, [11.0, 11.0])
+
+            np.testing.assert_array_equal(self.reader.get('z', kind='Residuals'),
+                                          np.zeros(12))
+
+        def test_missing(self):
+            self.assertRaises(KeyError, self.reader.get, 'w')
+            self.assertRaises(KeyError, self.reader.get, 'z', kind='Parameters')
+
+
+class TestHDF5CaseReader(CaseReaderTests.Tests):
+
+    reader_class = HDF5CaseReader
+
+    def setUp(self):
+        if HDF5Recorder is None:
+            raise unittest.SkipTest("Could not import HDF5Recorder. Is h5py installed?")
+        super(TestHDF5CaseReader, self).setUp()
+
+    def make_recorder(self, filename):
+        recorder = HDF5Recorder(filename)
+        recorder.options['buffer_size'] = 5
+        return recorder
+
+    def test_memmap(self):
+        from h5py import File, special_dtype
+        filename = os.path.join(self.dir, 'contiguous')
+        with File(filename, 'w') as f:
+            group = f.create_group('Driver')
+            coords = np.array(['Driver/1', 'Driver/2'], dtype=object)
+            group.create_dataset('coordinates', data=coords,
+                                 dtype=special_dtype(vlen=str))
+            group['index'] = np.arange(2)
+            group['Unknowns/y'] = np.array([[1.0, 2.0], [3.0, 4.0]])
+
+        reader = CaseReader(filename)
+        try:
+            y = reader.get('y')
+            self.assertTrue(isinstance(y, np.memmap))
+            np.testing.assert_array_equal(y, [[1.0, 2.0], [3.0, 4.0]])
+        finally:
+            reader.close()
+
+
+class TestSqliteCaseReader(CaseReaderTests.Tests):
+
+    reader_class = SqliteCaseReader
+
+    def make_recorder(self, filename):
+        recorder = SqliteRecorder(filename)
+        recorder.options['batch_size'] = 5
+        return recorder
+
+    def test_query_plan(self):
+        # filtering by prefix should use the index on the coordinate
+        where, args = self.reader._where('Driver/1')
+        plan = self.reader._db.execute("EXPLAIN QUERY PLAN SELECT * FROM cases " +
+                                       where, args).fetchall()
+        self.assertTrue('cases_coord' in str(plan))
+
+
+class TestShelveCaseReader(CaseReaderTests.Tests):
+
+    reader_class = ShelveCaseReader
+
+    def make_recorder(self, filename):
+        return ShelveRecorder(filename, flag='n')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,7 @@ class TestDumpCaseRecorder(RecorderTests.Tests):
         self.recorder = DumpCaseRecorder(StringIO())
 
     def assertDatasetEquals(self, expected, tolerance):
+        self.recorder.flush()
         sout = self.recorder.out
         sout.seek(0)
 
@@ -34,5 +35,11 @@ class TestDumpCaseRecorder(RecorderTests.Tests):
                     line = sout.readline()
                     self.assertEqual("  {0}: {1}\n".format(key, str(val)), line)
 
+
+class TestDumpCaseRecorderAsync(TestDumpCaseRecorder):
+    def setUp(self):
+        super(TestDumpCaseRecorderAsync, self).setUp()
+        self.recorder.options['async'] = True
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,9 @@
 """ Unit test for the HDF5Recorder. """
 
 import unittest
+
+import numpy as np
+
 from openmdao.test.testutil import assert_rel_error
 from openmdao.recorders.test.recordertests import RecorderTests
 from openmdao.util.recordutil import format_iteration_coordinate
@@ -24,13 +27,19 @@ class TestHDF5Recorder(RecorderTests.Tests):
         self.recorder = HDF5Recorder('tmp.hdf5', driver='core', backing_store=False)
 
     def assertDatasetEquals(self, expected, tolerance):
+        self.recorder.flush()
+
         for coord, expect in expected:
             icoord = format_iteration_coordinate(coord)
 
-            f = self.recorder.out[icoord]
-            params = f['Parameters']
-            unknowns = f['Unknowns']
-            resids = f['Residuals']
+            table = self.recorder.out['/'.join(coord[::2])]
+            coords = list(table['coordinates'][:])
+            self.assertEqual(coords.count(icoord), 1)
+            row = coords.index(icoord)
+
+            params = table['Parameters']
+            unknowns = table['Unknowns']
+            resids = table['Residuals']
 
             sentinel = object()
 
@@ -42,7 +51,74 @@ class TestHDF5Recorder(RecorderTests.Tests):
                     found_val = actual.get(key, sentinel)
                     if found_val is sentinel:
                         self.fail("Did not find key '{0}'.".format(key))
-                    assert_rel_error(self, found_val[()], val, tolerance)
+                    assert_rel_error(self, found_val[row], val, tolerance)
+
+    def test_buffered_columns(self):
+        self.recorder.options['buffer_size'] = 7
+
+        for i in range(20):
+            meta = {'coord': ['Driver', (i,), 'root', (i, 1)]}
+            self.recorder.record({'x': float(i)}, {'y': i*np.ones((2, 3))},
+                                 {'y': np.zeros((2, 3))}, meta)
+
+        table = self.recorder.out['Driver/root']
+
+        # only whole buffers have been written so far
+        self.assertEqual(table['coordinates'].shape, (14,))
+        self.recorder.flush()
+        self.assertEqual(table['coordinates'].shape, (20,))
+        self.assertEqual(table['coordinates'][3], 'Driver/3/root/3-1')
+        self.assertEqual(list(table['index'][:]), list(range(20)))
+
+        x = table['Parameters/x']
+        self.assertEqual(x.shape, (20,))
+        self.assertEqual(x.maxshape, (None,))
+        self.assertEqual(x.compression, 'gzip')
+        self.assertTrue(np.all(x[:] == np.arange(20)))
+
+        y = table['Unknowns/y']
+        self.assertEqual(y.shape, (20, 2, 3))
+        self.assertEqual(y.chunks[1:], (2, 3))
+        self.assertTrue(np.all(y[5] == 5.0))
+
+    def test_changing_variables(self):
+        self.recorder.options['buffer_size'] = 4
+
+        # 'z' first shows up partway through the second buffer, and 'w' is
+        # only in the first two cases
+        for i in range(10):
+            unknowns = {'y': float(i)}
+            if i in (6, 8):
+                unknowns['z'] = np.array([i, -i], dtype=float)
+            if i < 2:
+                unknowns['w'] = 2.0*i
+            meta = {'coord': ['Driver', (i,), 'root', (i, 1)]}
+            self.recorder.record({}, unknowns, {}, meta)
+        self.recorder.flush()
+
+        table = self.recorder.out['Driver/root']
+        self.assertEqual(table['coordinates'].shape, (10,))
+
+        np.testing.assert_array_equal(table['Unknowns/y'][:], np.arange(10.))
+
+        z = table['Unknowns/z'][:]
+        self.assertEqual(z.shape, (10, 2))
+        np.testing.assert_array_equal(z[6], [6., -6.])
+        np.testing.assert_array_equal(z[8], [8., -8.])
+        rest = [i for i in range(10) if i not in (6, 8)]
+        self.assertTrue(np.all(np.isnan(z[rest])))
+
+        w = table['Unknowns/w'][:]
+        self.assertEqual(w.shape, (10,))
+        np.testing.assert_array_equal(w[:2], [0., 2.])
+        self.assertTrue(np.all(np.isnan(w[2:])))
+
+
+class TestHDF5RecorderAsync(TestHDF5Recorder):
+    def setUp(self):
+        super(TestHDF5RecorderAsync, self).setUp()
+        self.recorder.options['async'] = True
+
 
 if __name__ == "__main__":
     unittest.main()
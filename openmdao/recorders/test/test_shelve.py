@@ -34,6 +34,7 @@ class TestShelveRecorder(RecorderTests.Tests):
 
     def assertDatasetEquals(self, expected, tolerance):
         # Close the file to ensure it is written to disk.
+        self.recorder.flush()
         self.recorder.out.close()
         self.recorder.out = None
 
@@ -78,5 +79,11 @@ class TestShelveRecorder(RecorderTests.Tests):
         f.close()
 
 
+class TestShelveRecorderAsync(TestShelveRecorder):
+    def setUp(self):
+        super(TestShelveRecorderAsync, self).setUp()
+        self.recorder.options['async'] = True
+
+
 if __name__ == "__main__":
     unittest.main()
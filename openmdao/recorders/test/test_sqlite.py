@@ -0,0 +1,98 @@
+""" Unit test for the SqliteRecorder. """
+
+import json
+import unittest
+
+import numpy as np
+
+from openmdao.recorders.sqliterecorder import SqliteRecorder
+from openmdao.recorders.test.recordertests import RecorderTests
+from openmdao.test.testutil import assert_rel_error
+from openmdao.util.recordutil import format_iteration_coordinate
+
+
+class TestSqliteRecorder(RecorderTests.Tests):
+
+    def setUp(self):
+        self.recorder = SqliteRecorder(':memory:')
+
+    def _case(self, icoord):
+        """ Unpacks the case with the given iteration coordinate."""
+        db = self.recorder.out
+        rows = db.execute("SELECT layout, params, unknowns, resids FROM cases "
+                          "WHERE coord=?", (icoord,)).fetchall()
+        self.assertEqual(len(rows), 1)
+        layout, params, unknowns, resids = rows[0]
+
+        blobs = {
+            'Parameters': np.frombuffer(params, dtype=np.float64),
+            'Unknowns': np.frombuffer(unknowns, dtype=np.float64),
+            'Residuals': np.frombuffer(resids, dtype=np.float64),
+        }
+        case = {'Parameters': {}, 'Unknowns': {}, 'Residuals': {}}
+        for kind, name, start, end, shape in db.execute(
+                "SELECT kind, name, start, end, shape FROM variables "
+                "WHERE layout=?", (layout,)):
+            case[kind][name] = blobs[kind][start:end].reshape(json.loads(shape))
+        return case
+
+    def assertDatasetEquals(self, expected, tolerance):
+        self.recorder.flush()
+
+        for coord, expect in expected:
+            case = self._case(format_iteration_coordinate(coord))
+
+            for kind, exp in zip(('Parameters', 'Unknowns', 'Residuals'), expect):
+                actual = case[kind]
+                # If len(actual) == len(expected) and actual <= expected, then
+                # actual == expected.
+                self.assertEqual(len(actual), len(exp))
+                for key, val in exp:
+                    if key not in actual:
+                        self.fail("Did not find key '{0}'.".format(key))
+                    assert_rel_error(self, actual[key], val, tolerance)
+
+    def test_batches_and_queries(self):
+        self.recorder.options['batch_size'] = 6
+        db = self.recorder.out
+
+        for i in range(10):
+            self.recorder.record({'x': float(i)}, {'y': i*np.ones((2, 3))},
+                                 {'y': np.zeros((2, 3))},
+                                 {'coord': ['Driver', (i,), 'root', (1,), 'G1', (1,)]})
+            self.recorder.record({'x': float(i)}, {'z': 'a string'}, {},
+                                 {'coord': ['Driver', (i,)]})
+
+        # only whole batches have been inserted so far
+        self.assertEqual(db.execute("SELECT COUNT(*) FROM cases").fetchone()[0], 18)
+        self.recorder.flush()
+        self.assertEqual(db.execute("SELECT COUNT(*) FROM cases").fetchone()[0], 20)
+
+        rows = db.execute("SELECT coord FROM cases WHERE pathname='G1' "
+                          "ORDER BY id").fetchall()
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[3][0], 'Driver/3/root/1/G1/1')
+
+        # the query planner should use the indexes
+        plan = db.execute("EXPLAIN QUERY PLAN SELECT * FROM cases "
+                          "WHERE driver_iter=3").fetchall()
+        self.assertTrue('cases_driver_iter' in str(plan))
+
+        case = self._case('Driver/7/root/1/G1/1')
+        self.assertTrue(np.all(case['Unknowns']['y'] == 7.0))
+        self.assertEqual(case['Unknowns']['y'].shape, (2, 3))
+        self.assertEqual(case['Parameters']['x'], 7.0)
+
+        # values that aren't numeric are pickled
+        self.assertEqual(db.execute("SELECT COUNT(*) FROM cases WHERE "
+                                    "objects IS NOT NULL").fetchone()[0], 10)
+
+
+class TestSqliteRecorderAsync(TestSqliteRecorder):
+    def setUp(self):
+        super(TestSqliteRecorderAsync, self).setUp()
+        self.recorder.options['async'] = True
+
+
+if __name__ == "__main__":
+    unittest.main()
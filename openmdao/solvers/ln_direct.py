@@ -0,0 +1,115 @@
+""" OpenMDAO LinearSolver that solves the linear system directly using a
+sparse LU factorization of the assembled Jacobian."""
+
+from scipy.sparse.linalg import splu
+
+from openmdao.solvers.solverbase import LinearSolver
+
+
+class DirectSolver(LinearSolver):
+    """ LinearSolver that assembles the Jacobian of its `Group` into a
+    sparse matrix and factors it with SuperLU. The factorization is computed
+    once per linearization and then reused for every right-hand side, in
+    both forward and reverse mode. This is a serial solver, so it should
+    never be used in an MPI setting.
+    """
+
+    def __init__(self):
+        super(DirectSolver, self).__init__()
+
+        opt = self.options
+        opt.add_option('mode', 'fwd', values=['fwd', 'rev', 'auto'],
+                       desc="Derivative calculation mode, set to 'fwd' for " + \
+                       "forward mode, 'rev' for reverse mode, or 'auto' to " + \
+                       "let OpenMDAO determine the best mode.")
+
+        # LU factors keyed by variable of interest, along with the
+        # linearization of the system they were computed from.
+        self._lu = {}
+        self._jacobian_count = None
+
+    def solve(self, rhs_mat, system, mode):
+        """ Solves the linear system for the problem in self.system. The
+        full solution vector is returned.
+
+        Args
+        ----
+        rhs_mat : dict of ndarray
+            Dictionary containing one ndarry per top level quantity of
+            interest. Each array contains the right-hand side for the linear
+            solve.
+
+        system : `System`
+            Parent `System` object.
+
+        mode : string
+            Derivative mode, can be 'fwd' or 'rev'.
+
+        Returns
+        -------
+        dict of ndarray : Solution vectors
+        """
+        return self.solve_multi(rhs_mat, system, mode)
+
+    def solve_multi(self, rhs_mat, system, mode):
+        """ Solves the linear system for a block of right-hand sides using
+        one back-substitution per right-hand side.
+
+        Args
+        ----
+        rhs_mat : dict of ndarray
+            Dictionary containing one ndarray per top level quantity of
+            interest. Each array contains the right-hand side for the linear
+            solve, or a 2D array with one right-hand side per column.
+
+        system : `System`
+            Parent `System` object.
+
+        mode : string
+            Derivative mode, can be 'fwd' or 'rev'.
+
+        Returns
+        -------
+        dict of ndarray : Solution vectors
+        """
+        # The assembled matrix is the forward operator, so reverse mode
+        # solves with its transpose.
+        trans = 'T' if mode == 'rev' else 'N'
+
+        sol_buf = {}
+        for voi, rhs in rhs_mat.items():
+            if len(rhs) == 0:
+                sol_buf[voi] = rhs.copy()
+                continue
+
+            sol_buf[voi] = self._get_factor(system, voi).solve(rhs, trans=trans)
+
+        self.iter_count = 1
+        return sol_buf
+
+    def _get_factor(self, system, voi):
+        """ Returns the LU factorization of the Jacobian of `system` for the
+        given variable of interest, assembling and factoring it if the system
+        has been linearized since we last did so.
+
+        Args
+        ----
+        system : `System`
+            Parent `System` object.
+
+        voi : str or None
+            Variable of interest.
+
+        Returns
+        -------
+        `scipy.sparse.linalg.SuperLU`
+        """
+        if self._jacobian_count != system._jacobian_count:
+            self._lu = {}
+            self._jacobian_count = system._jacobian_count
+
+        lu = self._lu.get(voi)
+        if lu is None:
+            lu = self._lu[voi] = splu(system.assemble_jacobian(voi))
+
+        return lu
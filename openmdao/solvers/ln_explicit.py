@@ -27,15 +27,38 @@ class ExplicitSolver(ScipyGMRES):
         mode : string
             Derivative mode, can be 'fwd' or 'rev'.
 
+        Returns
+        -------
+        dict of ndarray : Solution vectors
+        """
+        return self.solve_multi(rhs_mat, system, mode)
+
+    def solve_multi(self, rhs_mat, system, mode):
+        """ Solves the linear system for a block of right-hand sides. The
+        matrix is assembled once per quantity of interest and then used to
+        solve for all of the right-hand sides at the same time.
+
+        Args
+        ----
+        rhs_mat : dict of ndarray
+            Dictionary containing one ndarray per top level quantity of
+            interest. Each array contains the right-hand side for the linear
+            solve, or a 2D array with one right-hand side per column.
+
+        system : `System`
+            Parent `System` object.
+
+        mode : string
+            Derivative mode, can be 'fwd' or 'rev'.
+
         Returns
         -------
         dict of ndarray : Solution vectors
         """
         sol_buf = {}
 
-        # TODO: This solver could probably work with multiple RHS
         for voi, rhs in rhs_mat.items():
-            self.voi = None
+            self.voi = voi
 
             #TODO: When to record?
             self.system = system
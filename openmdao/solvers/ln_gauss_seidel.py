@@ -2,6 +2,9 @@
 
 from __future__ import print_function
 
+import numpy as np
+from six import get_unbound_function
+
 from openmdao.core.component import Component
 from openmdao.solvers.solverbase import LinearSolver
 
@@ -151,6 +154,137 @@ class LinearGaussSeidel(LinearSolver):
 
         return sol_buf
 
+    def solve_multi(self, rhs_mat, system, mode):
+        """ Solves the linear system for a block of right-hand sides. If the
+        Jacobian of the system can be assembled from the Jacobians cached by
+        its last linearization, each sweep updates all of the columns at
+        once with a sparse product for each subsystem, and `Groups` solve
+        their part of the block with the `solve_multi` of their own
+        `ln_solver`. Each sweep corrects the current solution by the linear
+        residual of each subsystem, which is the same as `solve` for the
+        first iteration, and converges when there are more of them.
+
+        Otherwise (e.g., under MPI, for `Components` with a matrix-free
+        `apply_linear` or their own `solve_linear`, or for finite
+        differenced subgroups), `solve` is called once per column.
+
+        Args
+        ----
+        rhs_mat : dict of ndarray
+            Dictionary containing one 2D array per top level quantity of
+            interest. Each column of an array is a right-hand side for the
+            linear solve. All arrays must have the same number of columns.
+
+        system : `System`
+            Parent `System` object.
+
+        mode : string
+            Derivative mode, can be 'fwd' or 'rev'.
+
+        Returns
+        -------
+        dict of ndarray : Solution vectors, one column per right-hand side.
+        """
+        subs = list(system.subsystems(local=True))
+        default_solve = get_unbound_function(Component.solve_linear)
+
+        ops = {}
+        for sub in subs:
+            if isinstance(sub, Component):
+                if get_unbound_function(type(sub).solve_linear) is not default_solve:
+                    ops = None
+                    break
+            elif sub.fd_options['force_fd'] == True:
+                ops = None
+                break
+
+        if ops is not None:
+            for voi in rhs_mat:
+                ops[voi] = self._assembled_jacobian(system, voi, mode)
+                if ops[voi] is None:
+                    ops = None
+                    break
+
+        if ops is None:
+            return super(LinearGaussSeidel, self).solve_multi(rhs_mat, system,
+                                                              mode)
+
+        # The rows of each subsystem in our vectors, in the order of its own
+        # vectors, and the rows of the operator that give its residual.
+        blocks = []
+        for sub in subs:
+            sub_blocks = {}
+            for voi in rhs_mat:
+                idxs = _sub_indices(system.dumat[voi], sub.dumat[voi])
+                if len(idxs) > 0:
+                    sub_blocks[voi] = (idxs, ops[voi][idxs])
+            if sub_blocks:
+                blocks.append((sub, sub_blocks))
+
+        if mode == 'rev':
+            blocks.reverse()
+
+        sol_buf = {}
+        for voi, rhs in rhs_mat.items():
+            sol_buf[voi] = np.zeros(rhs.shape)
+
+        f_norm0, f_norm = 1.0, 1.0
+        self.iter_count = 0
+        while self.iter_count < self.options['maxiter'] and \
+              f_norm > self.options['atol'] and \
+              f_norm/f_norm0 > self.options['rtol']:
+
+            for sub, sub_blocks in blocks:
+                resid = {}
+                for voi, (idxs, op) in sub_blocks.items():
+                    resid[voi] = rhs_mat[voi][idxs] - op.dot(sol_buf[voi])
+
+                # Components just pass their residual through, like their
+                # solve_linear does.
+                if isinstance(sub, Component):
+                    delta = resid
+                else:
+                    delta = sub.ln_solver.solve_multi(resid, sub, mode)
+
+                for voi, (idxs, op) in sub_blocks.items():
+                    sol_buf[voi][idxs] += delta[voi]
+
+            self.iter_count += 1
+            if self.options['maxiter'] == 1:
+                f_norm = 0.0
+            else:
+                f_norm = self._norm_multi(ops, rhs_mat, sol_buf)
+
+            if self.options['iprint'] > 0:
+                self.print_norm('LN_GS', self.local_meta, self.iter_count,
+                                f_norm, f_norm0, indent=1)
+
+        return sol_buf
+
+    def _norm_multi(self, ops, rhs_mat, sol_buf):
+        """ Computes the largest norm of the linear residual over the
+        columns of a block solve.
+
+        Args
+        ----
+        ops : dict of `scipy.sparse.csr_matrix`
+            Assembled operator for each quantity of interest.
+
+        rhs_mat : dict of ndarray
+            Right-hand sides for each quantity of interest.
+
+        sol_buf : dict of ndarray
+            Current solutions for each quantity of interest.
+        """
+        norms = 0.0
+        for voi, rhs in rhs_mat.items():
+            resid = rhs - ops[voi].dot(sol_buf[voi])
+            norms = norms + np.sum(resid**2, axis=0)
+
+        if np.size(norms) == 0:
+            return 0.0
+        return np.max(np.sqrt(norms))
+
     def _norm(self, system, mode, rhs_mat):
         """ Computes the norm of the linear residual
 
@@ -185,3 +319,33 @@ class LinearGaussSeidel(LinearSolver):
             norm += rhs_vec[voi].norm()**2
 
         return norm**0.5
+
+
+def _sub_indices(vec, sub_vec):
+    """
+    Returns the indices in `vec` of each entry of `sub_vec`, which is the
+    vector of one of our subsystems.
+
+    Args
+    ----
+    vec : `VecWrapper`
+        Derivative vector of a `Group`.
+
+    sub_vec : `VecWrapper`
+        The same derivative vector of one of its subsystems.
+
+    Returns
+    -------
+    ndarray
+        Index array the size of `sub_vec`.
+    """
+    offsets = {}
+    for name, meta in vec.get_vecvars():
+        offsets[meta['pathname']] = vec._slices[name]
+
+    idxs = np.empty(len(sub_vec.vec), dtype=int)
+    for name, meta in sub_vec.get_vecvars():
+        start, end = sub_vec._slices[name]
+        idxs[start:end] = np.arange(*offsets[meta['pathname']])
+
+    return idxs
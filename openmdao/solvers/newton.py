@@ -1,5 +1,11 @@
 """ Non-linear solver that implements a Newton's method."""
 
+import numpy as np
+from scipy import sparse
+from six import iteritems
+
+from openmdao.components.paramcomp import ParamComp
+from openmdao.core.component import Component
 from openmdao.solvers.solverbase import NonLinearSolver
 from openmdao.util.recordutil import update_local_meta, create_local_meta
 
@@ -7,6 +13,22 @@ from openmdao.util.recordutil import update_local_meta, create_local_meta
 class Newton(NonLinearSolver):
     """A python Newton solver with line-search adapation of the relaxation
     parameter.
+
+    By default the system is linearized on every iteration. Setting
+    'jac_reuse' to k > 1 gives a modified Newton method, where each
+    linearization is reused for up to k iterations, or until an iteration
+    reduces the residual by less than 'reuse_rtol'. If 'broyden' is set,
+    the cached Jacobians of the components are corrected with a Broyden
+    rank-one update on each iteration that reuses them. `linearizations`
+    and `linearizations_saved` count the linearizations done and skipped
+    during the last solve.
+
+    If 'jfnk' is set, the `ScipyGMRES` linear solver of the system solves
+    for each step without a Jacobian, with one evaluation of the residuals
+    per Krylov iteration, so the system is only linearized if the solver
+    has a preconditioner. The tolerance of each of those solves is set by
+    the Eisenstat-Walker forcing terms, unless 'eisenstat_walker' is
+    False.
     """
 
     def __init__(self):
@@ -27,6 +49,37 @@ class Newton(NonLinearSolver):
                        desc='Maximum number of line searches.')
         opt.add_option('alpha', 1.0,
                        desc='Initial over-relaxation factor.')
+        opt.add_option('jac_reuse', 1, low=1,
+                       desc='Maximum number of iterations to use each '
+                       'linearization for. 1 relinearizes on every iteration.')
+        opt.add_option('reuse_rtol', 0.5,
+                       desc='Relinearize early if an iteration that reused the '
+                       'linearization reduced the residual by less than this '
+                       'factor.')
+        opt.add_option('broyden', False,
+                       desc='Set to True to apply Broyden updates to the cached '
+                       'Jacobians when a linearization is reused.')
+        opt.add_option('jfnk', False,
+                       desc='Set to True to solve for each step without a '
+                       'Jacobian, using directional differences of the residuals. '
+                       'Requires a ScipyGMRES linear solver.')
+        opt.add_option('jfnk_step', 1e-7,
+                       desc='Step size of the directional differences, relative '
+                       'to the norm of the unknowns.')
+        opt.add_option('eisenstat_walker', True,
+                       desc='Set to True to solve each Jacobian-free step only as '
+                       'accurately as the Eisenstat-Walker forcing term requires.')
+        opt.add_option('ew_eta0', 0.3,
+                       desc='Relative tolerance of the first Jacobian-free step.')
+        opt.add_option('ew_eta_max', 0.9,
+                       desc='Upper limit of the Eisenstat-Walker forcing terms.')
+        opt.add_option('ew_gamma', 0.9,
+                       desc='Eisenstat-Walker gamma.')
+        opt.add_option('ew_alpha', 2.0,
+                       desc='Eisenstat-Walker alpha.')
+
+        self.linearizations = 0
+        self.linearizations_saved = 0
 
     def solve(self, params, unknowns, resids, system, metadata=None):
         """ Solves the system using a Netwon's Method.
@@ -56,6 +109,14 @@ class Newton(NonLinearSolver):
         ls_rtol = self.options['ls_rtol']
         ls_maxiter = self.options['ls_maxiter']
         alpha = self.options['alpha']
+        jac_reuse = self.options['jac_reuse']
+        reuse_rtol = self.options['reuse_rtol']
+        broyden = self.options['broyden']
+        jfnk = self.options['jfnk']
+
+        if jfnk and not hasattr(system.ln_solver, 'solve_jfnk'):
+            msg = "Newton in '{}' needs a ScipyGMRES linear solver for 'jfnk'."
+            raise RuntimeError(msg.format(system.pathname))
 
         # Metadata setup
         self.iter_count = 0
@@ -77,16 +138,46 @@ class Newton(NonLinearSolver):
         arg = system.drmat[None]
         result = system.dumat[None]
 
+        self.linearizations = 0
+        self.linearizations_saved = 0
+        jac_age = jac_reuse
+        f_norm_prev = f_norm
+        if broyden:
+            linearized = _linearized_systems(system)
+
+        # A Jacobian-free solve only needs a linearization to precondition.
+        linearize = not jfnk or system.ln_solver.preconditioner is not None
+        eta = None
+
         alpha_base = alpha
         while self.iter_count < maxiter and f_norm > atol and \
                 f_norm/f_norm0 > rtol:
 
-            # Linearize Model
-            system.jacobian(params, unknowns, resids)
+            # Linearize Model, unless we can get away with the last one
+            if linearize and (jac_age >= jac_reuse or
+                              f_norm > reuse_rtol*f_norm_prev):
+                system.jacobian(params, unknowns, resids)
+                self.linearizations += 1
+                jac_age = 0
+            elif linearize:
+                self.linearizations_saved += 1
+                if broyden:
+                    _broyden_update(system, linearized, points)
+            if broyden and linearize:
+                points = _linearization_points(linearized)
+            jac_age += 1
 
             # Calculate direction to take step
-            arg.vec[:] = resids.vec[:]
-            system.solve_linear(system.dumat, system.drmat, [None], mode='fwd')
+            if jfnk:
+                if self.options['eisenstat_walker']:
+                    eta = self._forcing_term(eta, f_norm, f_norm_prev)
+                result.vec[:] = system.ln_solver.solve_jfnk(
+                    resids.vec.copy(), system, params, unknowns, resids, tol=eta,
+                    step=self.options['jfnk_step'])
+            else:
+                arg.vec[:] = resids.vec[:]
+                system.solve_linear(system.dumat, system.drmat, [None], mode='fwd')
+            f_norm_prev = f_norm
 
             unknowns.vec[:] += alpha*result.vec[:]
 
@@ -146,3 +237,151 @@ class Newton(NonLinearSolver):
         if self.options['iprint'] > 0:
             self.print_norm('NEWTON', local_meta, self.iter_count, f_norm,
                             f_norm0, msg='Converged')
+            if jac_reuse > 1:
+                msg = '%d linearizations, %d saved' % (self.linearizations,
+                                                      self.linearizations_saved)
+                self.print_norm('NEWTON', local_meta, self.iter_count, f_norm,
+                                f_norm0, msg=msg)
+
+    def _forcing_term(self, eta, f_norm, f_norm_prev):
+        """
+        Args
+        ----
+        eta : float or None
+            Forcing term of the last step, or None for the first step.
+
+        f_norm : float
+            Norm of the residuals.
+
+        f_norm_prev : float
+            Norm of the residuals before the last step.
+
+        Returns
+        -------
+        float
+            Relative tolerance of the linear solve for the next step, from
+            choice 2 of Eisenstat and Walker.
+        """
+        opt = self.options
+        if eta is None:
+            return opt['ew_eta0']
+
+        gamma = opt['ew_gamma']
+        alpha = opt['ew_alpha']
+        new_eta = gamma * (f_norm / f_norm_prev)**alpha
+
+        # don't let the tolerance drop too quickly
+        safeguard = gamma * eta**alpha
+        if safeguard > 0.1:
+            new_eta = max(new_eta, safeguard)
+
+        return min(new_eta, opt['ew_eta_max'])
+
+
+def _linearized_systems(system):
+    """
+    Args
+    ----
+    system : `Group`
+        The `Group` being solved.
+
+    Returns
+    -------
+    list of `System`
+        The `Components` and finite differenced `Groups` below `system`
+        whose Jacobians are cached when it's linearized.
+    """
+    found = []
+    subs = list(system.subsystems(local=True))
+    while subs:
+        sub = subs.pop()
+        if isinstance(sub, ParamComp):
+            continue
+        if isinstance(sub, Component) or sub.fd_options['force_fd'] == True:
+            found.append(sub)
+        else:
+            subs.extend(sub.subsystems(local=True))
+    return found
+
+
+def _linearization_points(systems):
+    """
+    Args
+    ----
+    systems : list of `System`
+        Systems with cached Jacobians.
+
+    Returns
+    -------
+    list of (dict, dict)
+        For each system, copies of the inputs and the outputs of its cached
+        Jacobian, keyed by name. The output of an explicit variable is its
+        value, f(p), and that of a state is its residual.
+    """
+    points = []
+    for sub in systems:
+        inputs = {}
+        outputs = {}
+        for unknown, param in sub._jacobian_cache or ():
+            if param not in inputs:
+                vec = sub.params if param in sub.params else sub.unknowns
+                inputs[param] = vec.flat[param].copy()
+            if unknown not in outputs:
+                out = sub.resids.flat[unknown].copy()
+                if isinstance(sub, Component) and \
+                   sub.unknowns.metadata(unknown).get('state'):
+                    outputs[unknown] = out
+                else:
+                    outputs[unknown] = out + sub.unknowns.flat[unknown]
+        points.append((inputs, outputs))
+    return points
+
+
+def _broyden_update(system, systems, points):
+    """
+    Corrects the cached Jacobian of each of `systems` with a Broyden
+    rank-one update, from the change in its inputs and outputs since
+    `points` were taken. Only the dense blocks that are already in a Jacobian
+    are updated, each row with the change in just the inputs it depends on,
+    so the sparsity of the Jacobian is kept.
+
+    Args
+    ----
+    system : `Group`
+        The `Group` being solved.
+
+    systems : list of `System`
+        Systems with cached Jacobians.
+
+    points : list of (dict, dict)
+        The inputs and outputs of `systems` when the Jacobians were last
+        computed or updated, as returned by `_linearization_points`.
+    """
+    for sub, new, old in zip(systems, _linearization_points(systems), points):
+        jac = sub._jacobian_cache
+        if not jac:
+            continue
+
+        dx = dict((name, val - old[0][name]) for name, val in iteritems(new[0]))
+
+        # residual of the secant equation, and the length of the step in
+        # the inputs of each row
+        resid = dict((name, val - old[1][name]) for name, val in iteritems(new[1]))
+        denom = dict((name, 0.0) for name in resid)
+        for (unknown, param), J in iteritems(jac):
+            resid[unknown] -= J.dot(dx[param])
+            if not sparse.issparse(J):
+                denom[unknown] += dx[param].dot(dx[param])
+
+        for (unknown, param), J in iteritems(jac):
+            if not sparse.issparse(J) and denom[unknown] > 0.0:
+                jac[(unknown, param)] = J + np.outer(resid[unknown], dx[param]) / \
+                                        denom[unknown]
+
+    # Jacobians changed, so factorizations of the old ones are stale.
+    groups = [system]
+    while groups:
+        group = groups.pop()
+        group._jacobian_count += 1
+        groups.extend(sub for sub in group.subsystems(local=True)
+                      if not isinstance(sub, Component))
@@ -1,5 +1,7 @@
 """ Gauss Seidel non-linear solver."""
 
+import numpy as np
+
 from openmdao.solvers.solverbase import NonLinearSolver
 from openmdao.util.recordutil import update_local_meta, create_local_meta
 
@@ -9,6 +11,13 @@ class NLGaussSeidel(NonLinearSolver):
     `Group`. If there are no cycles, then the system will solve its
     subsystems once and terminate. Equivalent to fixed point iteration in
     cases with cycles.
+
+    Fixed point iteration on cycles can be accelerated by setting the
+    'acceleration' option. Each Gauss Seidel pass is then treated as one
+    evaluation of the fixed point map G(u), and the next iterate is either
+    u + w*(G(u) - u), with the relaxation factor w from Aitken's delta
+    squared method, or an Anderson mixing of the last 'anderson_depth'
+    passes.
     """
 
     def __init__(self):
@@ -21,6 +30,25 @@ class NLGaussSeidel(NonLinearSolver):
                        desc='Relative convergence tolerance.')
         opt.add_option('maxiter', 100,
                        desc='Maximum number of iterations.')
+        opt.add_option('acceleration', 'none', values=['none', 'aitken', 'anderson'],
+                       desc='Acceleration of the fixed point iteration.')
+        opt.add_option('aitken_min_factor', 0.1,
+                       desc='Lower limit of the Aitken relaxation factor.')
+        opt.add_option('aitken_max_factor', 1.5,
+                       desc='Upper limit of the Aitken relaxation factor.')
+        opt.add_option('anderson_depth', 5, low=1,
+                       desc='Number of previous iterations used by Anderson '
+                       'mixing.')
+
+        # state of the acceleration, in arrays that are reused between solves
+        self._u = None
+        self._r = None
+        self._r_prev = None
+        self._g_prev = None
+        self._dr = None
+        self._dg = None
+        self._omega = 1.0
+        self._accel_count = 0
 
     def solve(self, params, unknowns, resids, system, metadata=None):
         """ Solves the system using Gauss Seidel.
@@ -56,8 +84,15 @@ class NLGaussSeidel(NonLinearSolver):
         system.ln_solver.local_meta = local_meta
         update_local_meta(local_meta, (self.iter_count,))
 
+        accel = self.options['acceleration'] != 'none' and maxiter > 1
+        if accel:
+            self._setup_acceleration(len(unknowns.vec))
+            self._u[:] = unknowns.vec
+
         # Initial Solve
         system.children_solve_nonlinear(local_meta)
+        if accel:
+            self._accelerate(unknowns.vec)
 
         for recorder in self.recorders:
             recorder.raw_record(params, unknowns, resids, local_meta)
@@ -85,7 +120,11 @@ class NLGaussSeidel(NonLinearSolver):
             update_local_meta(local_meta, (self.iter_count,))
 
             # Runs an iteration
+            if accel:
+                self._u[:] = unknowns.vec
             system.children_solve_nonlinear(local_meta)
+            if accel:
+                self._accelerate(unknowns.vec)
             for recorder in self.recorders:
                 recorder.raw_record(params, unknowns, resids, local_meta)
 
@@ -100,3 +139,70 @@ class NLGaussSeidel(NonLinearSolver):
         if self.options['iprint'] > 0:
             self.print_norm('NLN_GS', local_meta, self.iter_count, normval,
                             basenorm, msg='Converged')
+
+    def _setup_acceleration(self, size):
+        """
+        Allocates the history of the acceleration, unless it's already
+        allocated for an unknowns vector of this size, and resets it.
+
+        Args
+        ----
+        size : int
+            Length of the unknowns vector.
+        """
+        depth = self.options['anderson_depth']
+        if self._u is None or len(self._u) != size or self._dr.shape[0] != depth:
+            self._u = np.empty(size)
+            self._r = np.empty(size)
+            self._r_prev = np.empty(size)
+            self._g_prev = np.empty(size)
+            self._dr = np.empty((depth, size))
+            self._dg = np.empty((depth, size))
+
+        self._omega = 1.0
+        self._accel_count = 0
+
+    def _accelerate(self, vec):
+        """
+        Replaces the result of a Gauss Seidel pass with the next iterate of
+        the accelerated fixed point iteration.
+
+        Args
+        ----
+        vec : ndarray
+            The unknowns, G(u), after a pass that started from the unknowns
+            saved in `_u`. It's overwritten with the next iterate.
+        """
+        u = self._u
+        r = self._r
+        r_prev = self._r_prev
+        count = self._accel_count
+        np.subtract(vec, u, out=r)
+
+        if self.options['acceleration'] == 'aitken':
+            if count > 0:
+                dr = r - r_prev
+                dr_norm2 = dr.dot(dr)
+                if dr_norm2 > 0.0:
+                    omega = -self._omega * r_prev.dot(dr) / dr_norm2
+                    self._omega = min(max(omega, self.options['aitken_min_factor']),
+                                      self.options['aitken_max_factor'])
+                vec[:] = u + self._omega*r
+            r_prev[:] = r
+
+        else:
+            depth = self._dr.shape[0]
+            if count > 0:
+                slot = (count - 1) % depth
+                np.subtract(r, r_prev, out=self._dr[slot])
+                np.subtract(vec, self._g_prev, out=self._dg[slot])
+            r_prev[:] = r
+            self._g_prev[:] = vec
+
+            # mix in the passes that best cancel the current residual
+            num = min(count, depth)
+            if num > 0:
+                gamma = np.linalg.lstsq(self._dr[:num].T, r, rcond=-1)[0]
+                vec -= self._dg[:num].T.dot(gamma)
+
+        self._accel_count += 1
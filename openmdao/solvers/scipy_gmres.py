@@ -2,13 +2,36 @@
 
 from __future__ import print_function
 
+from collections import OrderedDict
+
+import numpy as np
 from scipy.sparse.linalg import gmres, LinearOperator
 
 from openmdao.solvers.solverbase import LinearSolver
 
+# Number of solutions kept for warm starts.
+_MAX_SOLUTIONS = 100
+
 class ScipyGMRES(LinearSolver):
     """ Scipy's GMRES Solver. This is a serial solver, so
     it should never be used in an MPI setting.
+
+    Any `LinearSolver` can be set as the `preconditioner`, e.g. a
+    `LinearGaussSeidel` with 'maxiter' of 1 for a block Gauss Seidel sweep
+    that uses the `solve_linear` of each subsystem, or a `DirectSolver`,
+    which keeps its factorization until the system is linearized again.
+    It's applied to the same system, with the same variable of interest
+    and mode, as the solve.
+
+    If 'warm_start' is set, each solve starts from the last solution for
+    the same right-hand side, variable of interest and mode, such as the
+    same column of the previous `calc_gradient`, or else from the last
+    solution for the same variable of interest and mode. The initial guess
+    is scaled to best fit the new right-hand side.
+
+    `solve_jfnk` solves for a Newton step without a linearization of the
+    system, using a directional difference of its residuals for each
+    product with the Jacobian.
     """
 
     def __init__(self):
@@ -19,6 +42,12 @@ class ScipyGMRES(LinearSolver):
                        desc='Absolute convergence tolerance.')
         opt.add_option('maxiter', 100,
                        desc='Maximum number of iterations.')
+        opt.add_option('restart', 20, low=1,
+                       desc='Number of iterations between restarts. Larger '
+                       'values use more memory but converge more reliably.')
+        opt.add_option('warm_start', False,
+                       desc='Set to True to start each solve from the previous '
+                       'solution for the same variable of interest.')
         opt.add_option('mode', 'fwd', values=['fwd', 'rev', 'auto'],
                        desc="Derivative calculation mode, set to 'fwd' for " + \
                        "forward mode, 'rev' for reverse mode, or 'auto' to " + \
@@ -30,6 +59,18 @@ class ScipyGMRES(LinearSolver):
         self.voi = None
         self.mode = None
 
+        self.preconditioner = None
+
+        # tolerance that overrides 'atol', and the state of the current
+        # Jacobian-free solve, if any.
+        self._tol = None
+        self._jfnk = None
+
+        # recent solutions, keyed on variable of interest, mode and
+        # right-hand side, with the last one for each variable of interest
+        # and mode under None.
+        self._solutions = OrderedDict()
+
     def solve(self, rhs_mat, system, mode):
         """ Solves the linear system for the problem in self.system. The
         full solution vector is returned.
@@ -57,37 +98,269 @@ class ScipyGMRES(LinearSolver):
 
             # Scipy can only handle one right-hand-side at a time.
             self.voi = voi
+            self.system = system
+            self.mode = mode
 
-            n_edge = len(rhs)
-            A = LinearOperator((n_edge, n_edge),
-                               matvec=self.mult,
-                               dtype=float)
+            unknowns_mat[voi] = self._gmres(self.mult, rhs)
+
+            self.system = None
+
+        return unknowns_mat
+
+    def solve_multi(self, rhs_mat, system, mode):
+        """ Solves the linear system for a block of right-hand sides. If the
+        Jacobian of the system can be assembled from the Jacobians cached by
+        its last linearization, it's assembled once and each column is
+        solved with sparse products instead of a pass through the model per
+        iteration. The preconditioner gets the same chance to use its own
+        `solve_multi`. Scipy still solves one column at a time.
+
+        Otherwise (e.g., under MPI, for `Components` with a matrix-free
+        `apply_linear`, or in `solve_jfnk`), `solve` is called once per
+        column.
+
+        Args
+        ----
+        rhs_mat : dict of ndarray
+            Dictionary containing one 2D array per top level quantity of
+            interest. Each column of an array is a right-hand side for the
+            linear solve. All arrays must have the same number of columns.
 
+        system : `System`
+            Parent `System` object.
+
+        mode : string
+            Derivative mode, can be 'fwd' or 'rev'.
+
+        Returns
+        -------
+        dict of ndarray : Solution vectors, one column per right-hand side.
+        """
+        ops = None if self._jfnk is not None else {}
+        if ops is not None:
+            for voi in rhs_mat:
+                ops[voi] = self._assembled_jacobian(system, voi, mode)
+                if ops[voi] is None:
+                    ops = None
+                    break
+
+        if ops is None:
+            return super(ScipyGMRES, self).solve_multi(rhs_mat, system, mode)
+
+        sol_buf = {}
+        for voi, rhs in rhs_mat.items():
+            self.voi = voi
             self.system = system
-            options = self.options
             self.mode = mode
 
-            # Call GMRES to solve the linear system
-            d_unknowns, info = gmres(A, rhs,
-                                     tol=options['atol'],
-                                     maxiter=options['maxiter'])
+            sol_buf[voi] = np.empty(rhs.shape)
+            for i in range(rhs.shape[1]):
+                rhs_col = np.ascontiguousarray(rhs[:, i])
+                sol_buf[voi][:, i] = self._gmres(ops[voi].dot, rhs_col)
+
+            self.system = None
 
-            if info > 0:
-                msg = "ERROR in solve in '{}': gmres failed to converge " \
-                      "after {} iterations"
-                print(msg.format(system.name, options['maxiter']))
-                #logger.error(msg, system.name, info)
-            elif info < 0:
-                msg = "ERROR in solve in '{}': gmres failed"
-                print(msg.format(system.name))
-                #logger.error(msg, system.name)
+        return sol_buf
 
-            unknowns_mat[voi] = d_unknowns
+    def _gmres(self, matvec, rhs):
+        """ Solves for one right-hand side of the current variable of
+        interest and mode with Scipy's GMRES.
 
-            #print system.name, 'Linear solution vec', d_unknowns
-            self.system = None
+        Args
+        ----
+        matvec : callable
+            Applies the Jacobian of the system to a vector.
 
-        return unknowns_mat
+        rhs : ndarray
+            Right-hand side of the solve.
+
+        Returns
+        -------
+        ndarray : Solution vector
+        """
+        system = self.system
+        options = self.options
+
+        n_edge = len(rhs)
+        A = LinearOperator((n_edge, n_edge), matvec=matvec, dtype=float)
+
+        if self.preconditioner is None:
+            M = None
+        else:
+            M = LinearOperator((n_edge, n_edge),
+                               matvec=self._precon,
+                               dtype=float)
+
+        x0 = None
+        if options['warm_start']:
+            x0 = self._initial_guess(matvec, rhs, self.voi, self.mode)
+
+        tol = options['atol'] if self._tol is None else self._tol
+        self.iter_count = 0
+
+        # Call GMRES to solve the linear system
+        d_unknowns, info = gmres(A, rhs, x0=x0, M=M, tol=tol,
+                                 restart=options['restart'],
+                                 maxiter=options['maxiter'],
+                                 callback=self._count)
+
+        if info > 0:
+            msg = "ERROR in solve in '{}': gmres failed to converge " \
+                  "after {} iterations"
+            print(msg.format(system.name, options['maxiter']))
+            #logger.error(msg, system.name, info)
+        elif info < 0:
+            msg = "ERROR in solve in '{}': gmres failed"
+            print(msg.format(system.name))
+            #logger.error(msg, system.name)
+
+        if options['warm_start']:
+            self._save_solution(rhs, self.voi, self.mode, d_unknowns)
+
+        return d_unknowns
+
+    def solve_jfnk(self, rhs, system, params, unknowns, resids, tol=None,
+                   step=1e-7):
+        """ Solves the forward linear system of `system` for a Newton step,
+        without the Jacobian. Each product of the Jacobian with a vector v
+        is approximated by a directional difference of the residuals,
+        (R(u) - R(u + h*v))/h, so it takes one evaluation of
+        `apply_nonlinear` instead of a linearization of the whole system.
+
+        Args
+        ----
+        rhs : ndarray
+            Right-hand side, usually the current residuals.
+
+        system : `Group`
+            The `Group` being solved.
+
+        params : `VecWrapper`
+            `VecWrapper` containing parameters. (p)
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+
+        resids : `VecWrapper`
+            `VecWrapper` containing residuals. (r). They must be the
+            residuals at the current unknowns.
+
+        tol : float, optional
+            Relative tolerance of the solve. Defaults to 'atol'.
+
+        step : float, optional
+            Step size of the directional differences, relative to the norm
+            of the unknowns.
+
+        Returns
+        -------
+        ndarray : Solution vector
+        """
+        self._jfnk = (params, unknowns, resids, unknowns.vec.copy(),
+                      resids.vec.copy(), step)
+        self._tol = tol
+        try:
+            return self.solve({None: rhs}, system, 'fwd')[None]
+        finally:
+            self._jfnk = None
+            self._tol = None
+
+    def _fd_mult(self, arg):
+        """ GMRES Callback: applies the Jacobian of a Jacobian-free solve
+        with a directional difference of the residuals.
+
+        Args
+        ----
+        arg : ndarray
+            Incoming vector
+
+        Returns
+        -------
+        ndarray : Approximate product of the Jacobian with arg.
+        """
+        params, unknowns, resids, u0, r0, step = self._jfnk
+
+        arg_norm = np.linalg.norm(arg)
+        if arg_norm == 0.0:
+            return np.zeros(len(arg))
+        h = step * (1.0 + np.linalg.norm(u0)) / arg_norm
+
+        unknowns.vec[:] = u0 + h*arg
+        self.system.apply_nonlinear(params, unknowns, resids)
+
+        # apply_linear gives the negative of the Jacobian of the residuals
+        result = (r0 - resids.vec) / h
+
+        unknowns.vec[:] = u0
+        resids.vec[:] = r0
+        return result
+
+    def _initial_guess(self, matvec, rhs, voi, mode):
+        """
+        Args
+        ----
+        matvec : callable
+            Applies the Jacobian of the system to a vector.
+
+        rhs : ndarray
+            Right-hand side of the solve.
+
+        voi : str
+            Variable of interest.
+
+        mode : string
+            Derivative mode, can be 'fwd' or 'rev'.
+
+        Returns
+        -------
+        ndarray or None
+            The previous solution, scaled by the factor that minimizes the
+            initial residual, so it's never worse than starting from zero.
+            None if there's no previous solution.
+        """
+        x0 = self._solutions.get((voi, mode, rhs.tobytes()))
+        if x0 is None:
+            x0 = self._solutions.get((voi, mode, None))
+        if x0 is None or len(x0) != len(rhs):
+            return None
+
+        Ax0 = np.array(matvec(x0))
+        denom = Ax0.dot(Ax0)
+        if denom == 0.0:
+            return None
+        return x0 * (Ax0.dot(rhs) / denom)
+
+    def _save_solution(self, rhs, voi, mode, sol):
+        """ Keeps a solution for warm starts, and forgets the oldest ones
+        once there are more than `_MAX_SOLUTIONS`."""
+        sol = sol.copy()
+        key = (voi, mode, rhs.tobytes())
+        self._solutions.pop(key, None)
+        self._solutions[key] = sol
+        self._solutions[(voi, mode, None)] = sol
+        while len(self._solutions) > _MAX_SOLUTIONS:
+            self._solutions.popitem(last=False)
+
+    def _count(self, resid):
+        """ GMRES Callback: counts the iterations."""
+        self.iter_count += 1
+
+    def _precon(self, arg):
+        """ GMRES Callback: applies the preconditioner.
+
+        Args
+        ----
+        arg : ndarray
+            Incoming vector
+
+        Returns
+        -------
+        ndarray : Approximate solution of the linear system with arg as the
+        right-hand side.
+        """
+        sol = self.preconditioner.solve_multi({self.voi: arg[:, np.newaxis]},
+                                              self.system, self.mode)
+        return sol[self.voi][:, 0]
 
     def mult(self, arg):
         """ GMRES Callback: applies Jacobian matrix. Mode is determined by the
@@ -102,6 +375,8 @@ class ScipyGMRES(LinearSolver):
         -------
         ndarray : Matrix vector product of arg with jacobian
         """
+        if self._jfnk is not None:
+            return self._fd_mult(arg)
 
         system = self.system
         mode = self.mode
@@ -2,6 +2,12 @@
 
 from __future__ import print_function
 
+import numpy as np
+from six import get_unbound_function
+
+from openmdao.components.paramcomp import ParamComp
+from openmdao.core.component import Component
+from openmdao.core.mpiwrap import MPI
 from openmdao.core.options import OptionsDictionary
 
 
@@ -72,6 +78,14 @@ class LinearSolver(SolverBase):
     """ Base class for all linear solvers. Inherit from this class to create a
     new custom linear solver."""
 
+    def __init__(self):
+        super(LinearSolver, self).__init__()
+
+        # Assembled Jacobians keyed by variable of interest and mode, along
+        # with the linearization of the system they were assembled from.
+        self._assembled = {}
+        self._assembled_count = None
+
     def add_recorder(self, recorder):
         """Appends the given recorder to this solver's list of recorders.
 
@@ -105,6 +119,119 @@ class LinearSolver(SolverBase):
         """
         pass
 
+    def solve_multi(self, rhs_mat, system, mode):
+        """ Solves the linear system for a block of right-hand sides. Each
+        column of the arrays in rhs_mat is one right-hand side. The default
+        implementation calls `solve` once per column, which is a full pass
+        through the model for each of them, so solvers that can do better
+        with several right-hand sides at once (e.g., by reusing a
+        factorization or an assembled Jacobian) should override this.
+
+        Args
+        ----
+        rhs_mat : dict of ndarray
+            Dictionary containing one 2D array per top level quantity of
+            interest. Each column of an array is a right-hand side for the
+            linear solve. All arrays must have the same number of columns.
+
+        system : `System`
+            Parent `System` object.
+
+        mode : string
+            Derivative mode, can be 'fwd' or 'rev'.
+
+        Returns
+        -------
+        dict of ndarray : Solution vectors, one column per right-hand side.
+        """
+        sol_buf = {}
+        ncols = 0
+        for voi, rhs in rhs_mat.items():
+            sol_buf[voi] = np.empty(rhs.shape)
+            ncols = rhs.shape[1]
+
+        for i in range(ncols):
+            rhs_col = {}
+            for voi, rhs in rhs_mat.items():
+                rhs_col[voi] = np.ascontiguousarray(rhs[:, i])
+
+            # Some solvers return their internal vectors, so we copy here.
+            for voi, dx in self.solve(rhs_col, system, mode).items():
+                sol_buf[voi][:, i] = dx
+
+        return sol_buf
+
+    def _assembled_jacobian(self, system, voi, mode):
+        """ Returns the operator that `apply_linear` of `system` applies in
+        the given mode, assembled into a sparse matrix once per
+        linearization, so a block of right-hand sides can be solved without
+        a pass through the model for each of them.
+
+        Args
+        ----
+        system : `Group`
+            Parent `Group` object.
+
+        voi : str or None
+            Variable of interest.
+
+        mode : string
+            Derivative mode, can be 'fwd' or 'rev'.
+
+        Returns
+        -------
+        `scipy.sparse.csr_matrix` or None
+            The Jacobian in forward mode or its transpose in reverse mode,
+            or None if it can't be assembled from the Jacobians cached by
+            the last linearization of `system`.
+        """
+        if self._assembled_count != system._jacobian_count:
+            self._assembled = {}
+            self._assembled_count = system._jacobian_count
+
+        key = (voi, mode)
+        if key not in self._assembled:
+            op = None
+            if _applies_jacobians(system):
+                op = system.assemble_jacobian(voi)
+                if mode == 'rev':
+                    op = op.T
+                op = op.tocsr()
+            self._assembled[key] = op
+
+        return self._assembled[key]
+
+
+def _applies_jacobians(system):
+    """
+    Returns True if `apply_linear` of `system` is just a product with the
+    Jacobians cached by its last linearization, i.e. we're running serially
+    and every `Component` below it either returned a Jacobian and uses the
+    default `apply_linear` or is finite differenced.
+
+    Args
+    ----
+    system : `Group`
+        Parent `Group` object.
+    """
+    if MPI:
+        return False
+
+    default_apply = get_unbound_function(Component.apply_linear)
+
+    subs = list(system.subsystems(local=True))
+    while subs:
+        sub = subs.pop()
+        if sub.fd_options['force_fd'] == True or isinstance(sub, ParamComp):
+            continue
+        if not isinstance(sub, Component):
+            subs.extend(sub.subsystems(local=True))
+        elif get_unbound_function(type(sub).apply_linear) is not default_apply \
+                or not sub._jacobian_cache:
+            return False
+
+    return True
+
 
 class NonLinearSolver(SolverBase):
     """ Base class for all nonlinear solvers. Inherit from this class to create a
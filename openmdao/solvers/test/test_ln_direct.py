@@ -0,0 +1,175 @@
+""" Unit test for the sparse direct linear solver. """
+
+import unittest
+import numpy as np
+
+from openmdao.core.group import Group
+from openmdao.core.problem import Problem
+from openmdao.components.paramcomp import ParamComp
+from openmdao.solvers.ln_direct import DirectSolver
+from openmdao.solvers.newton import Newton
+from openmdao.test.converge_diverge import ConvergeDivergeGroups, SingleDiamondGrouped
+from openmdao.test.sellar import SellarDerivativesGrouped, SellarStateConnection
+from openmdao.test.simplecomps import SimpleCompDerivMatVec, FanInGrouped, \
+                                      ArrayComp2D
+from openmdao.test.testutil import assert_rel_error
+
+
+class TestDirectSolver(unittest.TestCase):
+
+    def test_simple_matvec(self):
+        group = Group()
+        group.add('x_param', ParamComp('x', 1.0), promotes=['*'])
+        group.add('mycomp', SimpleCompDerivMatVec(), promotes=['x', 'y'])
+
+        prob = Problem()
+        prob.root = group
+        prob.root.ln_solver = DirectSolver()
+        prob.setup(check=False)
+        prob.run()
+
+        J = prob.calc_gradient(['x'], ['y'], mode='fwd', return_format='dict')
+        assert_rel_error(self, J['y']['x'][0][0], 2.0, 1e-6)
+
+        J = prob.calc_gradient(['x'], ['y'], mode='rev', return_format='dict')
+        assert_rel_error(self, J['y']['x'][0][0], 2.0, 1e-6)
+
+    def test_array2D(self):
+        group = Group()
+        group.add('x_param', ParamComp('x', np.ones((2, 2))), promotes=['*'])
+        group.add('mycomp', ArrayComp2D(), promotes=['x', 'y'])
+
+        prob = Problem()
+        prob.root = group
+        prob.root.ln_solver = DirectSolver()
+        prob.setup(check=False)
+        prob.run()
+
+        J = prob.calc_gradient(['x'], ['y'], mode='fwd', return_format='dict')
+        Jbase = prob.root.mycomp._jacobian_cache
+        diff = np.linalg.norm(J['y']['x'] - Jbase['y', 'x'])
+        assert_rel_error(self, diff, 0.0, 1e-8)
+
+        J = prob.calc_gradient(['x'], ['y'], mode='rev', return_format='dict')
+        diff = np.linalg.norm(J['y']['x'] - Jbase['y', 'x'])
+        assert_rel_error(self, diff, 0.0, 1e-8)
+
+    def test_fan_in_grouped(self):
+
+        prob = Problem()
+        prob.root = FanInGrouped()
+        prob.root.ln_solver = DirectSolver()
+        prob.setup(check=False)
+        prob.run()
+
+        param_list = ['p1.x1', 'p2.x2']
+        unknown_list = ['comp3.y']
+
+        J = prob.calc_gradient(param_list, unknown_list, mode='fwd', return_format='dict')
+        assert_rel_error(self, J['comp3.y']['p1.x1'][0][0], -6.0, 1e-6)
+        assert_rel_error(self, J['comp3.y']['p2.x2'][0][0], 35.0, 1e-6)
+
+        J = prob.calc_gradient(param_list, unknown_list, mode='rev', return_format='dict')
+        assert_rel_error(self, J['comp3.y']['p1.x1'][0][0], -6.0, 1e-6)
+        assert_rel_error(self, J['comp3.y']['p2.x2'][0][0], 35.0, 1e-6)
+
+    def test_converge_diverge_groups(self):
+
+        prob = Problem()
+        prob.root = ConvergeDivergeGroups()
+        prob.root.ln_solver = DirectSolver()
+        prob.setup(check=False)
+        prob.run()
+
+        param_list = ['p.x']
+        unknown_list = ['comp7.y1']
+
+        J = prob.calc_gradient(param_list, unknown_list, mode='fwd', return_format='dict')
+        assert_rel_error(self, J['comp7.y1']['p.x'][0][0], -40.75, 1e-6)
+
+        J = prob.calc_gradient(param_list, unknown_list, mode='rev', return_format='dict')
+        assert_rel_error(self, J['comp7.y1']['p.x'][0][0], -40.75, 1e-6)
+
+    def test_single_diamond_grouped(self):
+
+        prob = Problem()
+        prob.root = SingleDiamondGrouped()
+        prob.root.ln_solver = DirectSolver()
+        prob.setup(check=False)
+        prob.run()
+
+        param_list = ['p.x']
+        unknown_list = ['comp4.y1', 'comp4.y2']
+
+        J = prob.calc_gradient(param_list, unknown_list, mode='fwd', return_format='dict')
+        assert_rel_error(self, J['comp4.y1']['p.x'][0][0], 25, 1e-6)
+        assert_rel_error(self, J['comp4.y2']['p.x'][0][0], -40.5, 1e-6)
+
+        J = prob.calc_gradient(param_list, unknown_list, mode='rev', return_format='dict')
+        assert_rel_error(self, J['comp4.y1']['p.x'][0][0], 25, 1e-6)
+        assert_rel_error(self, J['comp4.y2']['p.x'][0][0], -40.5, 1e-6)
+
+    def test_sellar_derivs_grouped(self):
+
+        prob = Problem()
+        prob.root = SellarDerivativesGrouped()
+        prob.root.ln_solver = DirectSolver()
+        prob.root.mda.nl_solver.options['atol'] = 1e-12
+        prob.setup(check=False)
+        prob.run()
+
+        # Count the factorizations: one per linearization, no matter how
+        # many right-hand sides get solved.
+        factored = []
+        assemble = prob.root.assemble_jacobian
+        def counting_assemble(voi=None):
+            factored.append(voi)
+            return assemble(voi)
+        prob.root.assemble_jacobian = counting_assemble
+
+        indep_list = ['x', 'z']
+        unknown_list = ['obj', 'con1', 'con2']
+
+        Jbase = {}
+        Jbase['con1'] = {}
+        Jbase['con1']['x'] = -0.98061448
+        Jbase['con1']['z'] = np.array([-9.61002186, -0.78449158])
+        Jbase['con2'] = {}
+        Jbase['con2']['x'] = 0.09692762
+        Jbase['con2']['z'] = np.array([1.94989079, 1.0775421])
+        Jbase['obj'] = {}
+        Jbase['obj']['x'] = 2.98061391
+        Jbase['obj']['z'] = np.array([9.61001155, 1.78448534])
+
+        for mode in ('fwd', 'rev'):
+            J = prob.calc_gradient(indep_list, unknown_list, mode=mode,
+                                   return_format='dict')
+            for key1, val1 in Jbase.items():
+                for key2, val2 in val1.items():
+                    assert_rel_error(self, J[key1][key2], val2, .00001)
+
+        self.assertEqual(len(factored), 2)
+
+    def test_newton_state_connection(self):
+
+        prob = Problem()
+        prob.root = SellarStateConnection()
+        prob.root.nl_solver = Newton()
+        prob.root.ln_solver = DirectSolver()
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['state_eq.y2_command'], 12.05848819, .00001)
+
+        # Make sure we aren't iterating like crazy
+        self.assertLess(prob.root.nl_solver.iter_count, 8)
+
+        J = prob.calc_gradient(['x', 'z'], ['obj'], mode='rev', return_format='dict')
+        assert_rel_error(self, J['obj']['x'][0][0], 2.98061391, .00001)
+        assert_rel_error(self, J['obj']['z'][0][0], 9.61001155, .00001)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -74,6 +74,35 @@ class TestExplicitSolver(unittest.TestCase):
         diff = np.linalg.norm(J['y']['x'] - Jbase['y', 'x'])
         assert_rel_error(self, diff, 0.0, 1e-8)
 
+    def test_array2D_multi_rhs(self):
+        group = Group()
+        group.add('x_param', ParamComp('x', np.ones((2, 2))), promotes=['*'])
+        group.add('mycomp', ArrayComp2D(), promotes=['x', 'y'])
+
+        prob = Problem()
+        prob.root = group
+        prob.root.ln_solver = ExplicitSolver()
+        prob.setup(check=False)
+        prob.run()
+
+        # All 4 columns of the Jacobian come from a single assembled matrix.
+        ncalls = []
+        mult = prob.root.ln_solver.mult
+        def counting_mult(arg):
+            ncalls.append(1)
+            return mult(arg)
+        prob.root.ln_solver.mult = counting_mult
+
+        J = prob.calc_gradient(['x'], ['y'], mode='fwd', return_format='array')
+        Jbase = prob.root.mycomp._jacobian_cache
+        diff = np.linalg.norm(J - Jbase['y', 'x'])
+        assert_rel_error(self, diff, 0.0, 1e-8)
+        self.assertEqual(len(ncalls), len(prob.root.dumat[None].vec))
+
+        J = prob.calc_gradient(['x'], ['y'], mode='rev', return_format='array')
+        diff = np.linalg.norm(J - Jbase['y', 'x'])
+        assert_rel_error(self, diff, 0.0, 1e-8)
+
     def test_simple_in_group_matvec(self):
         group = Group()
         sub = group.add('sub', Group(), promotes=['x', 'y'])
@@ -8,6 +8,7 @@ from openmdao.components.paramcomp import ParamComp
 from openmdao.core.group import Group
 from openmdao.core.problem import Problem
 from openmdao.solvers.ln_gauss_seidel import LinearGaussSeidel
+from openmdao.solvers.solverbase import LinearSolver
 from openmdao.test.converge_diverge import ConvergeDiverge, SingleDiamond, \
                                            ConvergeDivergeGroups, SingleDiamondGrouped
 from openmdao.test.sellar import SellarDerivativesGrouped, SellarDerivatives
@@ -417,6 +418,76 @@ class TestLinearGaussSeidel(unittest.TestCase):
         for key1, val1 in Jbase.items():
             for key2, val2 in val1.items():
                 assert_rel_error(self, J[key1][key2], val2, .00001)
+    def test_solve_multi(self):
+
+        for model, unknown in ((ConvergeDivergeGroups, 'comp7.y1'),
+                               (SingleDiamondGrouped, 'comp4.y1')):
+            prob = Problem()
+            prob.root = model()
+            prob.root.ln_solver = LinearGaussSeidel()
+            for sub in prob.root.subgroups():
+                sub.ln_solver = LinearGaussSeidel()
+            prob.setup(check=False)
+            prob.run()
+            prob.calc_gradient(['p.x'], [unknown])
+
+            root = prob.root
+            rhs = {None: np.random.RandomState(0).rand(len(root.dumat[None].vec), 3)}
+            for mode in ('fwd', 'rev'):
+                # the whole block is solved with the assembled Jacobian
+                self.assertIsNotNone(root.ln_solver._assembled_jacobian(root, None, mode))
+
+                sol = root.ln_solver.solve_multi(rhs, root, mode)
+                sol_cols = LinearSolver.solve_multi(root.ln_solver, rhs, root, mode)
+                assert_rel_error(self, sol[None], sol_cols[None], 1e-10)
+
+    def test_solve_multi_sellar(self):
+
+        prob = Problem()
+        prob.root = SellarDerivativesGrouped()
+        prob.root.ln_solver = LinearGaussSeidel()
+        prob.root.ln_solver.options['maxiter'] = 100
+
+        prob.root.mda.nl_solver.options['atol'] = 1e-12
+        prob.setup(check=False)
+        prob.run()
+
+        Jbase = {}
+        Jbase['con1'] = {}
+        Jbase['con1']['x'] = -0.98061433
+        Jbase['con1']['z'] = np.array([-9.61002285, -0.78449158])
+        Jbase['con2'] = {}
+        Jbase['con2']['x'] = 0.09692762
+        Jbase['con2']['z'] = np.array([1.94989079, 1.0775421 ])
+        Jbase['obj'] = {}
+        Jbase['obj']['x'] = 2.98061392
+        Jbase['obj']['z'] = np.array([9.61001155, 1.78448534])
+
+        # The block sweeps converge around the coupling.
+        for mode in ('fwd', 'rev'):
+            J = prob.calc_gradient(['x', 'z'], ['obj', 'con1', 'con2'],
+                                   mode=mode, return_format='dict')
+            for key1, val1 in Jbase.items():
+                for key2, val2 in val1.items():
+                    assert_rel_error(self, J[key1][key2], val2, .00001)
+            self.assertLess(prob.root.ln_solver.iter_count, 100)
+
+    def test_solve_multi_matvec(self):
+
+        prob = Problem()
+        prob.root = Group()
+        prob.root.add('x_param', ParamComp('x', 1.0), promotes=['*'])
+        prob.root.add('mycomp', SimpleCompDerivMatVec(), promotes=['x', 'y'])
+        prob.root.ln_solver = LinearGaussSeidel()
+        prob.setup(check=False)
+        prob.run()
+
+        # a matrix-free apply_linear means one solve per right-hand side
+        for mode in ('fwd', 'rev'):
+            J = prob.calc_gradient(['x'], ['y'], mode=mode, return_format='dict')
+            assert_rel_error(self, J['y']['x'][0][0], 2.0, 1e-6)
+            self.assertIsNone(prob.root.ln_solver._assembled_jacobian(prob.root, None, mode))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -6,10 +6,14 @@ import numpy as np
 
 from openmdao.components.execcomp import ExecComp
 from openmdao.components.paramcomp import ParamComp
+from openmdao.core.component import Component
 from openmdao.core.group import Group
 from openmdao.core.problem import Problem
 from openmdao.solvers.ln_gauss_seidel import LinearGaussSeidel
-from openmdao.solvers.newton import Newton
+from openmdao.solvers.ln_direct import DirectSolver
+from openmdao.solvers.newton import Newton, _broyden_update, \
+                                    _linearization_points, _linearized_systems
+from openmdao.solvers.scipy_gmres import ScipyGMRES
 from openmdao.test.sellar import SellarDerivativesGrouped, \
                                  SellarNoDerivatives, SellarDerivatives, \
                                  SellarStateConnection
@@ -94,6 +98,184 @@ class TestNewton(unittest.TestCase):
         # Make sure we aren't iterating like crazy
         self.assertLess(prob.root.nl_solver.iter_count, 8)
 
+    def test_jac_reuse(self):
+
+        prob = Problem()
+        prob.root = SellarDerivatives()
+        prob.root.nl_solver = Newton()
+        prob.root.nl_solver.options['jac_reuse'] = 4
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+        solver = prob.root.nl_solver
+        self.assertEqual(solver.linearizations, 1)
+        self.assertEqual(solver.linearizations_saved, solver.iter_count - 1)
+
+    def test_broyden(self):
+
+        for broyden in (False, True):
+            prob = Problem(_coupled_exec_comps())
+            prob.root.nl_solver.options['jac_reuse'] = 100
+            prob.root.nl_solver.options['broyden'] = broyden
+            prob.setup(check=False)
+            prob.run()
+
+            solver = prob.root.nl_solver
+            self.assertEqual(solver.linearizations, 1)
+            self.assertEqual(solver.linearizations_saved, solver.iter_count - 1)
+            assert_rel_error(self, prob['c1.y1'][0], 1.83890694, 1e-6)
+            if broyden:
+                self.assertLess(solver.iter_count, iter_count)
+            iter_count = solver.iter_count
+
+    def test_broyden_secant(self):
+
+        prob = Problem(_coupled_exec_comps())
+        prob.setup(check=False)
+        prob.run()
+        root = prob.root
+
+        root.jacobian(root.params, root.unknowns, root.resids)
+        systems = _linearized_systems(root)
+        points = _linearization_points(systems)
+
+        prob['p.x'] += 0.1
+        root.apply_nonlinear(root.params, root.unknowns, root.resids)
+        _broyden_update(root, systems, points)
+
+        # the updated Jacobian of c1 maps the step in x onto the change in y1
+        J = root.c1._jacobian_cache
+        dy1 = root.c1.resids['y1'] + root.c1.unknowns['y1'] - \
+              points[systems.index(root.c1)][1]['y1']
+        assert_rel_error(self, J[('y1', 'x')].dot(0.1*np.ones(3)), dy1, 1e-10)
+
+    def test_jfnk(self):
+
+        evals = {}
+        linearizations = {}
+        for jfnk in (False, True):
+            prob = Problem(_coupled_fd_comps())
+            prob.root.nl_solver.options['jfnk'] = jfnk
+            prob.setup(check=False)
+            _FDComp.count = 0
+            prob.run()
+
+            root = prob.root
+            root.apply_nonlinear(root.params, root.unknowns, root.resids)
+            self.assertLess(root.resids.norm(), 1e-8)
+            evals[jfnk] = _FDComp.count
+            linearizations[jfnk] = root.nl_solver.linearizations
+
+        # the finite differenced Jacobian is never formed, so the model
+        # is evaluated far fewer times
+        self.assertTrue(linearizations[False] > 0)
+        self.assertEqual(linearizations[True], 0)
+        self.assertLess(3*evals[True], evals[False])
+
+    def test_jfnk_preconditioned(self):
+
+        prob = Problem()
+        prob.root = SellarDerivatives()
+        prob.root.nl_solver = Newton()
+        prob.root.nl_solver.options['jfnk'] = True
+        prob.root.ln_solver.preconditioner = LinearGaussSeidel()
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+        self.assertEqual(prob.root.nl_solver.linearizations,
+                         prob.root.nl_solver.iter_count)
+
+    def test_jfnk_needs_gmres(self):
+
+        prob = Problem()
+        prob.root = SellarDerivatives()
+        prob.root.nl_solver = Newton()
+        prob.root.nl_solver.options['jfnk'] = True
+        prob.root.ln_solver = DirectSolver()
+
+        prob.setup(check=False)
+        with self.assertRaises(RuntimeError) as cm:
+            prob.run()
+
+        self.assertEqual(str(cm.exception),
+                         "Newton in '' needs a ScipyGMRES linear solver for 'jfnk'.")
+
+    def test_forcing_term(self):
+
+        solver = Newton()
+        self.assertEqual(solver._forcing_term(None, 1.0, 1.0), 0.3)
+
+        # fast convergence tightens the tolerance
+        assert_rel_error(self, solver._forcing_term(0.3, 0.01, 1.0), 0.9e-4, 1e-10)
+
+        # but not faster than the safeguard allows
+        assert_rel_error(self, solver._forcing_term(0.9, 0.01, 1.0), 0.729, 1e-10)
+
+        # and never looser than the upper limit
+        self.assertEqual(solver._forcing_term(0.3, 2.0, 1.0), 0.9)
+
+
+class _FDComp(Component):
+    """ y = a*A*tanh(x) + b, without derivatives. Counts evaluations."""
+
+    count = 0
+    A = np.random.RandomState(0).rand(20, 20) / 20.0
+
+    def __init__(self, a, with_b):
+        super(_FDComp, self).__init__()
+        self.a = a
+        self.with_b = with_b
+        self.add_param('x', np.zeros(20))
+        if with_b:
+            self.add_param('b', np.zeros(20))
+        self.add_output('y', np.zeros(20))
+        self.fd_options['force_fd'] = True
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        _FDComp.count += 1
+        y = self.a * self.A.dot(np.tanh(params['x']))
+        if self.with_b:
+            y += params['b']
+        unknowns['y'] = y
+
+
+def _coupled_fd_comps():
+    """ Two coupled components that are finite differenced."""
+    root = Group()
+    root.add('p', ParamComp('b', np.ones(20)))
+    root.add('c1', _FDComp(-1.5, True))
+    root.add('c2', _FDComp(1.2, False))
+    root.connect('p.b', 'c1.b')
+    root.connect('c1.y', 'c2.x')
+    root.connect('c2.y', 'c1.x')
+    root.nl_solver = Newton()
+    root.ln_solver = ScipyGMRES()
+    return root
+
+
+def _coupled_exec_comps():
+    """ Two nonlinear ExecComps that are coupled through y1 and y2."""
+    root = Group()
+    root.add('p', ParamComp('x', np.array([1.0, 1.5, 2.0])))
+    root.add('c1', ExecComp('y1 = x + 0.3*y2**2 + sin(y2)',
+                            x=np.zeros(3), y1=np.zeros(3), y2=np.zeros(3)))
+    root.add('c2', ExecComp('y2 = 0.5*y1 - 0.1*y1**2 + exp(-y1)',
+                            y1=np.zeros(3), y2=np.zeros(3)))
+    root.connect('p.x', 'c1.x')
+    root.connect('c1.y1', 'c2.y1')
+    root.connect('c2.y2', 'c1.y2')
+    root.nl_solver = Newton()
+    root.nl_solver.options['maxiter'] = 50
+    root.ln_solver = DirectSolver()
+    return root
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,6 +2,11 @@
 
 import unittest
 
+import numpy as np
+
+from openmdao.components.execcomp import ExecComp
+from openmdao.components.paramcomp import ParamComp
+from openmdao.core.group import Group
 from openmdao.core.problem import Problem
 from openmdao.solvers.nl_gauss_seidel import NLGaussSeidel
 from openmdao.test.sellar import SellarNoDerivatives, SellarDerivativesGrouped
@@ -40,6 +45,57 @@ class TestNLGaussSeidel(unittest.TestCase):
         assert_rel_error(self, prob['y1'], 25.58830273, .00001)
         assert_rel_error(self, prob['y2'], 12.05848819, .00001)
 
+    def test_sellar_accelerated(self):
+
+        for acceleration in ('aitken', 'anderson'):
+            prob = Problem()
+            prob.root = SellarNoDerivatives()
+            prob.root.nl_solver = NLGaussSeidel()
+            prob.root.nl_solver.options['acceleration'] = acceleration
+
+            prob.setup(check=False)
+            prob.run()
+
+            assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+            assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+            self.assertLess(prob.root.nl_solver.iter_count, 6)
+
+    def test_strong_coupling(self):
+
+        expected = np.array([0.51139759, 0.77511976, 1.04536716])
+
+        iter_counts = {}
+        for acceleration in ('none', 'aitken', 'anderson'):
+            prob = Problem(_strongly_coupled())
+            prob.root.nl_solver = NLGaussSeidel()
+            prob.root.nl_solver.options['acceleration'] = acceleration
+            prob.root.nl_solver.options['atol'] = 1e-10
+            prob.root.nl_solver.options['maxiter'] = 500
+
+            prob.setup(check=False)
+            prob.run()
+
+            assert_rel_error(self, prob['c1.y1'], expected, 1e-6)
+            iter_counts[acceleration] = prob.root.nl_solver.iter_count
+
+        self.assertGreater(iter_counts['none'], 100)
+        self.assertLess(iter_counts['aitken'], 15)
+        self.assertLess(iter_counts['anderson'], 15)
+
+
+def _strongly_coupled():
+    """ A cycle that plain fixed point iteration converges on slowly."""
+    root = Group()
+    root.add('p', ParamComp('x', np.array([1.0, 1.5, 2.0])))
+    root.add('c1', ExecComp('y1 = x - 0.9*y2 + 0.05*y2**2',
+                            x=np.zeros(3), y1=np.zeros(3), y2=np.zeros(3)))
+    root.add('c2', ExecComp('y2 = y1 + 0.1*sin(y1)',
+                            y1=np.zeros(3), y2=np.zeros(3)))
+    root.connect('p.x', 'c1.x')
+    root.connect('c1.y1', 'c2.y1')
+    root.connect('c2.y2', 'c1.y2')
+    return root
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -7,7 +7,11 @@ from openmdao.core.group import Group
 from openmdao.core.problem import Problem
 from openmdao.components.paramcomp import ParamComp
 from openmdao.components.execcomp import ExecComp
+from openmdao.solvers.ln_direct import DirectSolver
+from openmdao.solvers.ln_gauss_seidel import LinearGaussSeidel
+from openmdao.solvers.newton import Newton
 from openmdao.solvers.scipy_gmres import ScipyGMRES
+from openmdao.solvers.solverbase import LinearSolver
 from openmdao.test.converge_diverge import ConvergeDiverge, SingleDiamond, \
                                            ConvergeDivergeGroups, SingleDiamondGrouped
 from openmdao.test.sellar import SellarDerivativesGrouped
@@ -346,6 +350,98 @@ class TestScipyGMRES(unittest.TestCase):
             for key2, val2 in val1.items():
                 assert_rel_error(self, J[key1][key2], val2, .00001)
 
+    def test_preconditioner(self):
+
+        iter_counts = {}
+        for name, precon in (('none', None),
+                             ('ln_gs', LinearGaussSeidel()),
+                             ('direct', DirectSolver())):
+            prob = Problem(_coupled())
+            prob.root.ln_solver = ScipyGMRES()
+            prob.root.ln_solver.preconditioner = precon
+            prob.root.ln_solver.options['restart'] = 5
+            prob.setup(check=False)
+            prob.run()
+
+            for mode in ('fwd', 'rev'):
+                J = prob.calc_gradient(['p.x'], ['c2.y2'], mode=mode,
+                                       return_format='dict')
+                assert_rel_error(self, J['c2.y2']['p.x'][0][0], 0.56697213, 1e-6)
+
+            iter_counts[name] = prob.root.ln_solver.iter_count
+
+        self.assertLess(iter_counts['ln_gs'], iter_counts['none'])
+        self.assertEqual(iter_counts['direct'], 1)
+
+    def test_warm_start(self):
+
+        prob = Problem(_coupled())
+        prob.root.ln_solver = ScipyGMRES()
+        prob.root.ln_solver.options['warm_start'] = True
+        prob.setup(check=False)
+        prob.run()
+
+        J = prob.calc_gradient(['p.x'], ['c2.y2'], mode='fwd', return_format='dict')
+        self.assertGreater(prob.root.ln_solver.iter_count, 0)
+
+        # the same right-hand sides again, so the initial guesses are right
+        J2 = prob.calc_gradient(['p.x'], ['c2.y2'], mode='fwd', return_format='dict')
+        self.assertEqual(prob.root.ln_solver.iter_count, 0)
+        assert_rel_error(self, J2['c2.y2']['p.x'], J['c2.y2']['p.x'], 1e-10)
+
+    def test_solve_multi(self):
+
+        for root, precon, param, unknown in \
+                ((_coupled(), None, 'p.x', 'c2.y2'),
+                 (_coupled(), LinearGaussSeidel(), 'p.x', 'c2.y2'),
+                 (SellarDerivativesGrouped(), None, 'x', 'obj')):
+            prob = Problem(root)
+            root.ln_solver = ScipyGMRES()
+            root.ln_solver.preconditioner = precon
+            prob.setup(check=False)
+            prob.run()
+            prob.calc_gradient([param], [unknown])
+
+            rhs = {None: np.random.RandomState(0).rand(len(root.dumat[None].vec), 3)}
+            for mode in ('fwd', 'rev'):
+                # the whole block is solved with the assembled Jacobian
+                self.assertIsNotNone(root.ln_solver._assembled_jacobian(root, None, mode))
+
+                sol = root.ln_solver.solve_multi(rhs, root, mode)
+                sol_cols = LinearSolver.solve_multi(root.ln_solver, rhs, root, mode)
+                assert_rel_error(self, sol[None], sol_cols[None], 1e-8)
+
+    def test_solve_multi_matvec(self):
+
+        prob = Problem()
+        prob.root = Group()
+        prob.root.add('x_param', ParamComp('x', 1.0), promotes=['*'])
+        prob.root.add('mycomp', SimpleCompDerivMatVec(), promotes=['x', 'y'])
+        prob.root.ln_solver = ScipyGMRES()
+        prob.setup(check=False)
+        prob.run()
+
+        # a matrix-free apply_linear means one solve per right-hand side
+        for mode in ('fwd', 'rev'):
+            J = prob.calc_gradient(['x'], ['y'], mode=mode, return_format='dict')
+            assert_rel_error(self, J['y']['x'][0][0], 2.0, 1e-6)
+            self.assertIsNone(prob.root.ln_solver._assembled_jacobian(prob.root, None, mode))
+
+
+def _coupled():
+    """ A cycle with a poorly conditioned Jacobian."""
+    root = Group()
+    root.add('p', ParamComp('x', np.array([1.0, 1.5, 2.0])))
+    root.add('c1', ExecComp('y1 = x - 0.9*y2 + 0.05*y2**2',
+                            x=np.zeros(3), y1=np.zeros(3), y2=np.zeros(3)))
+    root.add('c2', ExecComp('y2 = y1 + 0.1*sin(y1)',
+                            y1=np.zeros(3), y2=np.zeros(3)))
+    root.connect('p.x', 'c1.x')
+    root.connect('c1.y1', 'c2.y1')
+    root.connect('c2.y2', 'c1.y2')
+    root.nl_solver = Newton()
+    return root
+
 
 if __name__ == "__main__":
     unittest.main()
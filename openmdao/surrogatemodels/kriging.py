@@ -1,24 +1,40 @@
 """ Surrogate model based on Kriging. """
-from math import log, e, sqrt
+import multiprocessing
 
 # pylint: disable-msg=E0611,F0401
-from numpy import array, zeros, dot, ones, eye, abs, vstack, exp, \
-     sum, log10
-from numpy.linalg import det, linalg, lstsq
-from scipy.linalg import cho_factor, cho_solve
+from numpy import array, zeros, dot, ones, eye, abs, vstack, exp, log, \
+     sum, log10, sqrt, asarray, atleast_2d, newaxis, einsum, diag, \
+     diag_indices
+from numpy.linalg import det, linalg, lstsq, pinv
+from numpy.random import RandomState
+from scipy.linalg import cho_factor, cho_solve, solve_triangular
 from scipy.optimize import minimize
 
 
 from openmdao.surrogatemodels.uncertain_distributions import NormalDistribution
+from openmdao.util.procutil import fork_map
 
 
 class KrigingSurrogate(object):
     """Surrogate Modeling method based on the simple Kriging interpolation.
-    Predictions are returned as a NormalDistribution instance."""
+    Predictions are returned as a NormalDistribution instance.
 
-    def __init__(self):
+    Args
+    ----
+    n_start : int, optional
+        Number of starting points for the hyperparameter optimization.
+
+    num_workers : int, optional
+        Number of processes used to run the starts. Set to 0 to use one
+        per cpu.
+    """
+
+    def __init__(self, n_start=1, num_workers=1):
         super(KrigingSurrogate, self).__init__()
 
+        self.n_start = n_start
+        self.num_workers = num_workers
+
         self.m = None       # number of independent
         self.n = None       # number of training points
         self.thetas = None
@@ -29,6 +45,11 @@ class KrigingSurrogate(object):
         self.mu = None
         self.log_likelihood = None
 
+        # terms of the predictor that only depend on the training data
+        self.R_inv_ymu = None       # R^-1 (Y - mu)
+        self.R_inv_one = None       # R^-1 1
+        self.one_R_inv_one = None   # 1' R^-1 1
+
     def get_uncertain_value(self, value):
         """Returns a NormalDistribution centered around the value, with a
         standard deviation of 0."""
@@ -37,59 +58,91 @@ class KrigingSurrogate(object):
     def predict(self, new_x):
         """Calculates a predicted value of the response based on the current
         trained model for the supplied list of inputs.
+
+        Args
+        ----
+        new_x : array-like
+            Point at which the surrogate is evaluated, or a 2D array with
+            one point per row.
+
+        Returns
+        -------
+        `NormalDistribution`
+            Predicted mean and RMSE.  For a 2D array of points, `mu` and
+            `sigma` are arrays with one entry per point.
         """
         if self.m is None:  # untrained surrogate
             raise RuntimeError("KrigingSurrogate has not been trained, so no "
                                "prediction can be made")
-        r = zeros(self.n)
-        X, Y = self.X, self.Y
-        thetas = 10.**self.thetas
-        XX = array(X)
-        new_x = array(new_x)
-        for i in range(self.n):
-            r[i] = sum(thetas*(XX[i] - new_x)**2.)
-        r = exp(-r)
 
-        one = ones(self.n)
-        if self.R_fact is not None:
-            #---CHOLESKY DECOMPOSTION ---
-            #f = self.mu+dot(r,cho_solve(self.R_fact,Y-dot(one,self.mu)))
-            #term1 = dot(r,cho_solve(self.R_fact,r))
-            #term2 = (1.0-dot(one,cho_solve(self.R_fact,r)))**2./dot(one,cho_solve(self.R_fact,one))
+        new_x = asarray(new_x, dtype=float)
+        single = new_x.ndim < 2
+        r = self._correlation(atleast_2d(new_x))
 
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            R_fact = (self.R_fact[0].T, not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-
-            f = self.mu + dot(r, cho[0])
-            term1 = dot(r, cho[1])
-            term2 = (1.0 - dot(one, cho[1]))**2./dot(one, cho[2])
+        f = self.mu + dot(r, self.R_inv_ymu)
 
+        if self.R_fact is not None:
+            #---CHOLESKY DECOMPOSTION ---
+            # R = U'U, so r R^-1 r' is the squared norm of U'^-1 r'.
+            rhs = solve_triangular(self.R_fact[0], r.T, trans='T',
+                                   lower=self.R_fact[1])
+            term1 = sum(rhs**2, 0)
         else:
             #-----LSTSQ-------
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            lsq = lstsq(self.R.T, rhs)[0].T
-
-            f = self.mu + dot(r, lsq[0])
-            term1 = dot(r, lsq[1])
-            term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-            """
-      #-----LSTSQ-------
-      rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-      lsq = lstsq(self.R.T, rhs)[0].T
-
-      f = self.mu + dot(r, lsq[0])
-      term1 = dot(r, lsq[1])
-      term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-      """
+            term1 = sum(r.T*lstsq(self.R, r.T)[0], 0)
+
+        term2 = (1.0 - dot(r, self.R_inv_one))**2./self.one_R_inv_one
+
         MSE = self.sig2*(1.0 - term1 + term2)
         RMSE = sqrt(abs(MSE))
 
-        dist = NormalDistribution(f, RMSE)
-        return dist
+        if single:
+            return NormalDistribution(f[0], RMSE[0])
+        return NormalDistribution(f, RMSE)
+
+    def linearize(self, x):
+        """Calculates the derivatives of the predicted mean with respect
+        to the inputs.
+
+        Args
+        ----
+        x : array-like
+            Point at which the surrogate is evaluated, or a 2D array with
+            one point per row.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (number of points, number of inputs) containing
+            the gradient of the predicted mean at each point.
+        """
+        if self.m is None:  # untrained surrogate
+            raise RuntimeError("KrigingSurrogate has not been trained, so no "
+                               "derivatives can be calculated")
+
+        x = atleast_2d(asarray(x, dtype=float))
+        thetas = 10.**self.thetas
+        r = self._correlation(x)
+
+        # dr_i/dx = -2 thetas (x - X_i) r_i
+        dist = x[:, newaxis, :] - self.X[newaxis, :, :]
+        return -2.0*thetas*einsum('ij,ijk->ik', r*self.R_inv_ymu, dist)
+
+    def _correlation(self, x):
+        """Returns the correlation between each of the given points (one per
+        row) and each training point."""
+        thetas = 10.**self.thetas
+        dist = x[:, newaxis, :] - self.X[newaxis, :, :]
+        return exp(-sum(thetas*dist**2., 2))
 
     def train(self, X, Y):
-        """Train the surrogate model with the given set of inputs and outputs."""
+        """Train the surrogate model with the given set of inputs and outputs.
+
+        The hyperparameters are found by maximizing the log likelihood with
+        a bounded gradient based optimizer. When `n_start` is greater than
+        one, the optimizer is restarted from additional random points
+        (spread across `num_workers` processes) and the best result is kept.
+        """
 
         #TODO: Check if one training point will work... if not raise error
         """self.X = []
@@ -100,79 +153,149 @@ class KrigingSurrogate(object):
                 self.Y.append(out)
             else: "duplicate training point" """
 
-        self.X = X
-        self.Y = Y
-        self.m = len(X[0])
-        self.n = len(X)
+        self.X = array(X, dtype=float)
+        self.Y = array(Y, dtype=float)
+        self.m = self.X.shape[1]
+        self.n = self.X.shape[0]
 
-        thetas = zeros(self.m)
-        #print "initial guess", thetas
+        # squared distances between all pairs of training points
+        self._dist = (self.X[:, newaxis, :] - self.X[newaxis, :, :])**2
 
-        def _calcll(thetas):
-            ''' Callback function'''
-            self.thetas = thetas
-            self._calculate_log_likelihood()
-            return -self.log_likelihood
+        bounds = [(log10(1e-2), log10(3))]*self.m
 
-        #if self.thetas == None:
-        #self.thetas = fmin(_calcll, thetas, disp=False, ftol=0.0001)
-        def lowerBound(log10t):
-            return log10t - log10(self.thetas)
+        # The first start is the original initial guess, the rest are
+        # random, but repeatable.
+        starts = [zeros(self.m)]
+        rand = RandomState(0)
+        for i in range(1, self.n_start):
+            starts.append(rand.uniform(bounds[0][0], bounds[0][1], self.m))
 
-        def upperBound(log10t):
-            return log10(self.thetas) - log10t
+        nworkers = self.num_workers
+        if nworkers == 0:
+            nworkers = multiprocessing.cpu_count()
+        nworkers = min(nworkers, len(starts))
 
-        cons = []
-        for i in range(self.m):
-            cons.append({'type': 'ineq', 'fun': lambda log10t: log10t[i] - log10(1e-2)})  # min
-            cons.append({'type': 'ineq', 'fun': lambda log10t: log10(3) - log10t[i]})     # max
+        # Forked processes get a copy of the distances, so we only send
+        # them the starting points.
+        results = fork_map(lambda x0: _train_from(x0, self._dist, self.Y,
+                                                  self.nugget, bounds),
+                           starts, nworkers)
 
-        self.thetas = minimize(_calcll, thetas, method='COBYLA', constraints=cons, tol=1e-8).x
-        #print self.thetas
+        self.thetas = min(results, key=lambda result: result[0])[1]
         self._calculate_log_likelihood()
+        self._cache_factors()
 
-    def _calculate_log_likelihood(self):
-        #if self.m == None:
-        #    Give error message
-        R = zeros((self.n, self.n))
-        X, Y = array(self.X), array(self.Y)
-        thetas = 10.**self.thetas
+    def _cache_factors(self):
+        """Computes the terms that don't depend on the prediction point, so
+        they don't get recomputed for every prediction."""
+        one = ones(self.n)
+        rhs = vstack([self.Y - self.mu, one]).T
 
-        #weighted distance formula
-        for i in range(self.n):
-            R[i, i+1:self.n] = e**(-sum(thetas*(X[i] - X[i+1:self.n])**2., 1))
+        if self.R_fact is not None:
+            R_inv = cho_solve(self.R_fact, rhs).T
+        else:
+            R_inv = lstsq(self.R, rhs)[0].T
 
-        R = R*(1.0 - self.nugget)
-        R = R + R.T + eye(self.n)
-        self.R = R
+        self.R_inv_ymu = R_inv[0]
+        self.R_inv_one = R_inv[1]
+        self.one_R_inv_one = sum(R_inv[1])
 
-        one = ones(self.n)
-        try:
-            self.R_fact = cho_factor(R)
-            rhs = vstack([Y, one]).T
-            R_fact = (self.R_fact[0].T, not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-
-            self.mu = dot(one, cho[0])/dot(one, cho[1])
-            ymdotone = Y - dot(one, self.mu)
-            self.sig2 = dot(ymdotone, cho_solve(self.R_fact,
-                                                (ymdotone)))/self.n
-            #self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))-sum(thetas)
-            self.log_likelihood = -self.n/2.*log(self.sig2) - \
-                1./2.*log(abs(det(self.R) + 1.e-16))
-
-        except (linalg.LinAlgError, ValueError):
-            #------LSTSQ---------
-            self.R_fact = None  # reset this to none, so we know not to use cholesky
-            # self.R = self.R+diag([10e-6]*self.n)  # improve conditioning[Booker et al., 1999]
-            rhs = vstack([Y, one]).T
-            lsq = lstsq(self.R.T, rhs)[0].T
-            self.mu = dot(one, lsq[0])/dot(one, lsq[1])
-            ymdotone = Y - dot(one, self.mu)
-            self.sig2 = dot(ymdotone, lstsq(self.R, ymdotone)[0])/self.n
-            self.log_likelihood = -self.n/2.*log(self.sig2) - \
-                1./2.*log(abs(det(self.R) + 1.e-16))
-            #print self.log_likelihood
+    def _calculate_log_likelihood(self):
+        """Calculates the log likelihood for the current thetas and keeps
+        the correlation matrix and its factorization."""
+        self.log_likelihood, _, self.R, self.R_fact, self.mu, self.sig2 = \
+            _log_likelihood(self.thetas, self._dist, self.Y, self.nugget)
+
+
+def _train_from(x0, dist, Y, nugget, bounds):
+    """Maximizes the log likelihood starting at the given log10(thetas).
+    Returns the negative log likelihood and the optimum log10(thetas)."""
+    def _calcll(log10t):
+        """ Callback function"""
+        ll, grad = _log_likelihood(log10t, dist, Y, nugget, grad=True)[:2]
+        return -ll, -grad
+
+    result = minimize(_calcll, x0, method='L-BFGS-B', jac=True,
+                      bounds=bounds)
+    return result.fun, result.x
+
+
+def _log_likelihood(log10t, dist, Y, nugget, grad=False):
+    """
+    Calculates the concentrated log likelihood of the Kriging model.
+
+    Args
+    ----
+    log10t : ndarray
+        log10 of the thetas.
+
+    dist : ndarray
+        Squared distances between all pairs of training points, with shape
+        (n, n, m).
+
+    Y : ndarray
+        Training outputs.
+
+    nugget : float
+        Nugget smoothing parameter.
+
+    grad : bool, optional
+        If True, also calculate the gradient with respect to log10t.
+
+    Returns
+    -------
+    tuple
+        Log likelihood, its gradient (or None), R, the Cholesky
+        factorization of R (or None if R isn't positive definite), mu
+        and sigma squared.
+    """
+    n = len(Y)
+    thetas = 10.**log10t
+
+    #weighted distance formula
+    R = exp(-dot(dist, thetas))*(1.0 - nugget)
+    R[diag_indices(n)] = 1.0
+
+    one = ones(n)
+    try:
+        R_fact = cho_factor(R)
+        cho = cho_solve(R_fact, vstack([Y, one]).T).T
+
+        mu = sum(cho[0])/sum(cho[1])
+        R_inv_ymu = cho[0] - mu*cho[1]
+        logdet = 2.0*sum(log(diag(R_fact[0])))
+        if grad:
+            R_inv = cho_solve(R_fact, eye(n))
+            det_fact = 1.0
+
+    except (linalg.LinAlgError, ValueError):
+        #------LSTSQ---------
+        R_fact = None  # so we know not to use cholesky
+        # R = R+diag([10e-6]*n)  # improve conditioning[Booker et al., 1999]
+        lsq = lstsq(R, vstack([Y, one]).T)[0].T
+
+        mu = sum(lsq[0])/sum(lsq[1])
+        R_inv_ymu = lstsq(R, Y - mu)[0]
+        det_R = abs(det(R))
+        logdet = log(det_R + 1.e-16)
+        if grad:
+            R_inv = pinv(R)
+            det_fact = det_R/(det_R + 1.e-16)
+
+    sig2 = dot(Y - mu, R_inv_ymu)/n
+    log_likelihood = -n/2.*log(sig2) - 1./2.*logdet
+
+    if not grad:
+        return log_likelihood, None, R, R_fact, mu, sig2
+
+    # dR/dtheta_k = -dist_k*R, and the derivatives with respect to mu and
+    # sig2 vanish since they are optimal for the given thetas.
+    #   dL/dtheta_k = a' dR/dtheta_k a/(2 sig2) - tr(R^-1 dR/dtheta_k)/2
+    # where a = R^-1 (Y - mu).
+    W = (R_inv_ymu[:, newaxis]*R_inv_ymu/sig2 - det_fact*R_inv)*R
+    gradient = -0.5*einsum('ij,ijk->k', W, dist)*thetas*log(10.)
+
+    return log_likelihood, gradient, R, R_fact, mu, sig2
 
 
 class FloatKrigingSurrogate(KrigingSurrogate):
@@ -180,6 +303,9 @@ class FloatKrigingSurrogate(KrigingSurrogate):
     which are the mean of the NormalDistribution predicted by the model."""
 
     def predict(self, new_x):
+        """Calculates a predicted value of the response based on the current
+        trained model for the supplied list of inputs.
+        """
         dist = super(FloatKrigingSurrogate, self).predict(new_x)
         return dist.mu
 
@@ -1,7 +1,8 @@
-
 """Surrogate Model based on second order response surface equations."""
 
-from numpy import matrix, linalg, power, multiply, concatenate, ones
+from numpy import arange, asarray, atleast_2d, concatenate, dot, hstack, \
+     ones, triu_indices, vstack, zeros, add
+from numpy.linalg import lstsq, qr
 
 
 class ResponseSurface(object):
@@ -13,6 +14,18 @@ class ResponseSurface(object):
         self.n = None #number of independents
         self.betas = None #vector of response surface equation coefficients
 
+        # indices of the two inputs multiplied in each quadratic term
+        self._quad_i = None
+        self._quad_j = None
+
+        # R and Q'Y from a QR factorization of the design matrix, kept for
+        # incremental updates
+        self._R = None
+        self._QtY = None
+
+        # constant Hessian of the fitted polynomial
+        self._hessian = None
+
         if X is not None and Y is not None:
             self.train(X,Y)
 
@@ -20,42 +33,120 @@ class ResponseSurface(object):
         """Returns the value iself. Response surface equations don't have uncertainty."""
         return value
 
+    def _basis(self, X):
+        """ Returns the design matrix for the given 2D array of points: a
+        constant, the inputs, their squares and their cross terms. """
+        return hstack((ones((X.shape[0], 1)), X,
+                       X[:, self._quad_i]*X[:, self._quad_j]))
+
     def train(self,X,Y):
         """ Calculate response surface equation coefficients using least squares regression. """
 
-        X = matrix(X)
-        Y = matrix(Y).T
+        X = atleast_2d(asarray(X, dtype=float))
+        Y = asarray(Y, dtype=float).flatten()
 
         self.m = X.shape[0]
         self.n = X.shape[1]
 
-        # Modify X to include constant, squared terms and cross terms
-        X = concatenate((matrix(ones((self.m,1))),X),1)
-        for i in range(1,self.n+1):
-            X = concatenate((X,power(X[:,i],2)),1)
-        for i in range(1,self.n):
-            for j in range(i+1,self.n+1):
-                X = concatenate((X,multiply(X[:,i],X[:,j])),1)
+        # Squared terms first, then the cross terms.
+        cross_i, cross_j = triu_indices(self.n, 1)
+        self._quad_i = concatenate((arange(self.n), cross_i))
+        self._quad_j = concatenate((arange(self.n), cross_j))
+
+        X = self._basis(X)
+        self._R, self._QtY = _qr_reduce(X, Y)
 
         # Determine response surface equation coefficients (betas) using least squares
-        self.betas, rs, r, s = linalg.lstsq(X,Y)
+        self.betas = lstsq(X,Y)[0]
+        self._setup_hessian()
+
+    def update(self, X, Y):
+        """ Add training points to an already trained response surface,
+        updating the QR factorization of the design matrix with the new rows
+        instead of refitting all of the points. The factorization is never
+        squared into the normal equations, so the fit matches `train` on all
+        of the points to working precision.
+
+        Args
+        ----
+        X : array-like
+            New training inputs, one point per row.
+
+        Y : array-like
+            New training outputs.
+        """
+        if self.betas is None:
+            self.train(X, Y)
+            return
+
+        X = self._basis(atleast_2d(asarray(X, dtype=float)))
+        Y = asarray(Y, dtype=float).flatten()
+
+        self.m += X.shape[0]
+        self._R, self._QtY = _qr_reduce(vstack((self._R, X)),
+                                        concatenate((self._QtY, Y)))
+
+        # lstsq gives the minimum norm solution while there are still
+        # fewer points than coefficients.
+        self.betas = lstsq(self._R, self._QtY)[0]
+        self._setup_hessian()
+
+    def _setup_hessian(self):
+        """ Computes the Hessian of the polynomial from the coefficients of
+        the quadratic terms. """
+        H = zeros((self.n, self.n))
+        add.at(H, (self._quad_i, self._quad_j), self.betas[self.n+1:])
+        self._hessian = H + H.T
 
     def predict(self,new_x):
-        """Calculates a predicted value of the response based on the current response surface model for the supplied list of inputs. """
+        """Calculates a predicted value of the response based on the current response surface model for the supplied list of inputs.
+
+        Args
+        ----
+        new_x : array-like
+            Point at which the surrogate is evaluated, or a 2D array with
+            one point per row.
+
+        Returns
+        -------
+        float or ndarray
+            Predicted value, or an array with one value per point.
+        """
+        new_x = asarray(new_x, dtype=float)
+
+        # Predict new_y using the design matrix for new_x and betas
+        new_y = dot(self._basis(atleast_2d(new_x)), self.betas)
+
+        if new_x.ndim < 2:
+            return new_y[0]
+        return new_y
+
+    def linearize(self, x):
+        """Calculates the derivatives of the response surface with respect
+        to the inputs.
+
+        Args
+        ----
+        x : array-like
+            Point at which the surrogate is evaluated, or a 2D array with
+            one point per row.
 
-        new_x = matrix(new_x)
+        Returns
+        -------
+        ndarray
+            Array of shape (number of points, number of inputs) containing
+            the gradient at each point.
+        """
+        x = atleast_2d(asarray(x, dtype=float))
+        return self.betas[1:self.n+1] + dot(x, self._hessian)
 
-        # Modify new_x to include constant, squared terms and cross terms
-        new_x = concatenate((matrix(ones((1,1))),new_x),1)
-        for i in range(1,self.n+1):
-            new_x = concatenate((new_x,power(new_x[:,i],2)),1)
-        for i in range(1,self.n):
-            for j in range(i+1,self.n+1):
-                new_x = concatenate((new_x,multiply(new_x[:,i],new_x[:,j])),1)
 
-        # Predict new_y using new_x and betas
-        new_y = new_x*self.betas
-        return new_y[0,0]
+def _qr_reduce(X, Y):
+    """ Returns R and Q'Y from the QR factorization of X, which have the
+    same least squares solution as X and Y, with at most as many rows as X
+    has columns. """
+    Q, R = qr(X)
+    return R, dot(Q.T, Y)
 
 
 if __name__ == "__main__":
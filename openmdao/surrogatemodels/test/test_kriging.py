@@ -4,11 +4,12 @@
 import unittest
 import random
 
-from numpy import array, linspace, sin, cos, pi
+from numpy import array, linspace, sin, cos, pi, zeros, log10
 from scipy.optimize import minimize
 
-from openmdao.surrogatemodels.kriging import KrigingSurrogate
+from openmdao.surrogatemodels.kriging import KrigingSurrogate, _log_likelihood
 from openmdao.surrogatemodels.uncertain_distributions import NormalDistribution
+from openmdao.test.testutil import assert_rel_error
 
 
 class TestKrigingSurrogate(unittest.TestCase):
@@ -66,8 +67,82 @@ class TestKrigingSurrogate(unittest.TestCase):
 
         pred = krig1.predict([5., 5.])
 
-        self.assertAlmostEqual(5.79, pred.sigma, places=0)
-        self.assertAlmostEqual(25.34, pred.mu, places=1)
+        self.assertAlmostEqual(14.513, pred.sigma, places=2)
+        self.assertAlmostEqual(18.760, pred.mu, places=2)
+
+        # the bounds apply to every theta
+        self.assertTrue(all(krig1.thetas >= -2.))
+        self.assertTrue(all(krig1.thetas <= log10(3.)))
+
+    def _bran_kriging(self):
+        def bran(x):
+            y = (x[1]-(5.1/(4.*pi**2.))*x[0]**2.+5.*x[0]/pi-6.)**2.+10.*(1.-1./(8.*pi))*cos(x[0])+10.
+            return y
+
+        x = array([[-2., 0.], [-0.5, 1.5], [1., 3.], [8.5, 4.5], [-3.5, 6.], [4., 7.5], [-5., 9.], [5.5, 10.5],
+                   [10., 12.], [7., 13.5], [2.5, 15.]])
+        y = array([bran(case) for case in x])
+
+        krig1 = KrigingSurrogate()
+        krig1.train(x, y)
+        return krig1
+
+    def test_2d_kriging_batch(self):
+        krig1 = self._bran_kriging()
+
+        new_x = array([[5., 5.], [-2., 0.], [1.5, 11.], [0.3, -1.2]])
+        pred = krig1.predict(new_x)
+
+        self.assertEqual(pred.mu.shape, (4,))
+        self.assertEqual(pred.sigma.shape, (4,))
+        for i, point in enumerate(new_x):
+            single = krig1.predict(point)
+            self.assertAlmostEqual(single.mu, pred.mu[i], places=10)
+            self.assertAlmostEqual(single.sigma, pred.sigma[i], places=10)
+
+    def test_2d_kriging_linearize(self):
+        krig1 = self._bran_kriging()
+
+        new_x = array([[5., 5.], [1.5, 11.], [0.3, -1.2]])
+        jac = krig1.linearize(new_x)
+        self.assertEqual(jac.shape, (3, 2))
+
+        # compare to central difference
+        step = 1e-6
+        fd = zeros((3, 2))
+        for j in range(2):
+            dx = zeros(2)
+            dx[j] = step
+            fd[:, j] = (krig1.predict(new_x + dx).mu - krig1.predict(new_x - dx).mu)/(2*step)
+
+        assert_rel_error(self, jac, fd, 1e-6)
+        assert_rel_error(self, krig1.linearize(new_x[0]), fd[:1], 1e-6)
+
+    def test_log_likelihood_gradient(self):
+        krig1 = self._bran_kriging()
+
+        log10t = array([-1.2, -0.3])
+        ll, grad = _log_likelihood(log10t, krig1._dist, krig1.Y, krig1.nugget,
+                                   grad=True)[:2]
+
+        step = 1e-6
+        fd = zeros(2)
+        for j in range(2):
+            dt = zeros(2)
+            dt[j] = step
+            fd[j] = (_log_likelihood(log10t + dt, krig1._dist, krig1.Y, krig1.nugget)[0] -
+                     _log_likelihood(log10t - dt, krig1._dist, krig1.Y, krig1.nugget)[0])/(2*step)
+
+        assert_rel_error(self, grad, fd, 1e-6)
+
+    def test_multi_start(self):
+        krig1 = self._bran_kriging()
+
+        x, y = krig1.X, krig1.Y
+        for num_workers in (1, 2):
+            krig2 = KrigingSurrogate(n_start=4, num_workers=num_workers)
+            krig2.train(x, y)
+            self.assertTrue(krig2.log_likelihood >= krig1.log_likelihood - 1e-8)
 
     def test_get_uncertain_value(self):
         x = array([[0.05], [.25], [0.61], [0.95]])
@@ -36,5 +36,57 @@ class TestResponseSurface(unittest.TestCase):
         self.assertTrue(residual<1e-5)
 
 
+    def test_batch_predict(self):
+        lr = ResponseSurface(self.X_train, self.Y_train)
+
+        pred = lr.predict(self.X_train[:5])
+        self.assertEqual(pred.shape, (5,))
+        for i, x in enumerate(self.X_train[:5]):
+            self.assertAlmostEqual(lr.predict(x), pred[i], places=10)
+
+    def test_linearize(self):
+        x = np.random.random((30, 3))
+        y = 1. + 2.*x[:, 0] - x[:, 1]**2 + 3.*x[:, 0]*x[:, 2] + .5*x[:, 1]*x[:, 2]
+        lr = ResponseSurface(x, y)
+
+        new_x = np.array([[.2, .3, .4], [.6, .1, .9]])
+        jac = lr.linearize(new_x)
+
+        expected = np.array([[2. + 3.*.4, -2.*.3 + .5*.4, 3.*.2 + .5*.3],
+                             [2. + 3.*.9, -2.*.1 + .5*.9, 3.*.6 + .5*.1]])
+        np.testing.assert_allclose(jac, expected, rtol=1e-8)
+        np.testing.assert_allclose(lr.linearize(new_x[1]), expected[1:], rtol=1e-8)
+
+    def test_update(self):
+        x = np.random.random((40, 3))
+        y = np.sin(x[:, 0]) + x[:, 1]*x[:, 2]
+
+        full = ResponseSurface(x, y)
+
+        lr = ResponseSurface(x[:25], y[:25])
+        lr.update(x[25:], y[25:])
+
+        self.assertEqual(lr.m, 40)
+        np.testing.assert_allclose(lr.betas, full.betas, rtol=1e-6)
+
+    def test_update_badly_scaled(self):
+        # one input is thousands of times larger than the rest, which is
+        # too badly conditioned for the normal equations
+        x = np.random.random((200, 5))
+        x[:, 0] = 3000. + 250.*x[:, 0]
+        x[:, 1:] *= np.array([10., 3., 3., 10.])
+        y = 2.*x[:, 0] + 1e-3*x[:, 0]**2 - 5.*x[:, 1]*x[:, 2] + \
+            np.sin(x[:, 3]) + x[:, 4]**3
+
+        full = ResponseSurface(x, y)
+
+        lr = ResponseSurface(x[:100], y[:100])
+        lr.update(x[100:150], y[100:150])
+        lr.update(x[150:], y[150:])
+
+        np.testing.assert_allclose(lr.betas, full.betas, rtol=1e-7)
+        new_x = np.array([3125., 7.0, 2.1, 2.5, 7.0])
+        self.assertAlmostEqual(lr.predict(new_x), full.predict(new_x), places=6)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,82 @@
+""" Utilities for running work in a pool of forked processes. """
+
+import os
+import multiprocessing
+
+# The function being mapped and its items are set just before a pool of
+# processes is forked, so each one inherits them without pickling.
+_fork_func = None
+
+
+def _fork_context():
+    """
+    Returns
+    -------
+    object or None
+        Something with a `Pool` that forks its processes, or None if
+        processes can't be forked here.
+    """
+    get_context = getattr(multiprocessing, 'get_context', None)
+    if get_context is None:
+        # python 2 always forks where it can
+        return multiprocessing if hasattr(os, 'fork') else None
+    try:
+        return get_context('fork')
+    except ValueError:
+        return None
+
+
+def fork_available():
+    """
+    Returns
+    -------
+    bool
+        True if `fork_map` can run in forked processes here.
+    """
+    return _fork_context() is not None
+
+
+def _fork_worker(item):
+    """ Runs the inherited function on one item in a forked process."""
+    return _fork_func(item)
+
+
+def fork_map(func, items, nworkers):
+    """
+    Applies `func` to each of `items` in a pool of forked processes. The
+    processes inherit `func`, along with anything it refers to, so it
+    doesn't need to be picklable, but the items and the results do. If
+    processes can't be forked here, or `nworkers` is less than 2, the items
+    are run one at a time in this process instead.
+
+    Args
+    ----
+    func : callable
+        Function of one item.
+
+    items : list
+        Items to apply `func` to.
+
+    nworkers : int
+        Number of processes.
+
+    Returns
+    -------
+    list
+        The results of `func` for each of `items`, in order.
+    """
+    context = _fork_context()
+    if context is None or nworkers < 2:
+        return [func(item) for item in items]
+
+    global _fork_func
+    _fork_func = func
+    try:
+        pool = context.Pool(nworkers)
+        try:
+            return pool.map(_fork_worker, items)
+        finally:
+            pool.close()
+            pool.join()
+    finally:
+        _fork_func = None
@@ -0,0 +1,44 @@
+"""
+Test Process Utility Functions.
+"""
+
+import os
+import unittest
+
+from openmdao.util import procutil
+from openmdao.util.procutil import fork_available, fork_map
+
+
+class TestForkMap(unittest.TestCase):
+
+    def test_fork_map(self):
+        if not fork_available():
+            raise unittest.SkipTest("Processes can't be forked here.")
+
+        # the lambda isn't picklable, so the workers must inherit it
+        offset = 10
+        results = fork_map(lambda i: (i + offset, os.getpid()), list(range(6)), 3)
+
+        self.assertEqual([r[0] for r in results], list(range(10, 16)))
+        self.assertTrue(os.getpid() not in [r[1] for r in results])
+        self.assertEqual(procutil._fork_func, None)
+
+    def test_serial(self):
+        results = fork_map(lambda i: (i, os.getpid()), list(range(3)), 1)
+        self.assertEqual(results, [(i, os.getpid()) for i in range(3)])
+
+    def test_no_fork(self):
+        # e.g. a platform that only spawns processes
+        context = procutil._fork_context
+        procutil._fork_context = lambda: None
+        try:
+            self.assertFalse(fork_available())
+            results = fork_map(lambda i: (i, os.getpid()), list(range(3)), 3)
+        finally:
+            procutil._fork_context = context
+
+        self.assertEqual(results, [(i, os.getpid()) for i in range(3)])
+
+
+if __name__ == '__main__':
+    unittest.main()